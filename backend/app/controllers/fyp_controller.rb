@@ -1,6 +1,7 @@
 class FypController < ApplicationController
   def index
-    @posts = MlApiService.get_friends_posts(username: current_user['username'], offset: 0, page_size: 20)
+    @posts = MlApiService.get_friends_posts(username: current_user['username'], page_size: 20)
+    @next_cursor = @posts['next_cursor'] if @posts
     if @posts && @posts['posts'].is_a?(Array)
       @posts = @posts['posts']
     else
@@ -12,8 +13,10 @@ class FypController < ApplicationController
   def profile
     @user = current_user
     if @user && @user['username']
-      @followers_count = MlApiService.get_user_followers_count(username: @user['username']) || 0
-      @following_count = MlApiService.get_user_following_count(username: @user['username']) || 0
+      # One count-only request for both numbers
+      counts = MlApiService.get_user_follow_counts(username: @user['username'])
+      @followers_count = (counts && counts['followers']) || 0
+      @following_count = (counts && counts['following']) || 0
 
       # Fetch user's own posts
       result = MlApiService.get_user_posts(username: @user['username'])
@@ -134,12 +137,15 @@ class FypController < ApplicationController
     end
   end
 
+  # Next page of the friends feed; pass the previous page's next_cursor as cursor.
   def friends_posts
-    @posts = MlApiService.get_friends_posts(username: current_user['username'], offset: params[:offset], page_size: params[:page_size])
-    if @posts && @posts['posts'].is_a?(Array)
-      @posts = @posts['posts']
+    result = MlApiService.get_friends_posts(username: current_user['username'], cursor: params[:cursor], page_size: params[:page_size])
+    @posts = result && result['posts'].is_a?(Array) ? result['posts'] : []
+    @next_cursor = result && result['next_cursor']
+    respond_to do |format|
+      format.html
+      format.json { render json: { posts: @posts, next_cursor: @next_cursor } }
     end
-    @posts = @posts || []
   end
 
   def like_post
@@ -225,6 +231,10 @@ class FypController < ApplicationController
     result = MlApiService.get_user(username: @username)
     if result['user']
       @user = result['user']
+
+      counts = MlApiService.get_user_follow_counts(username: @user['username'])
+      @followers_count = (counts && counts['followers']) || 0
+      @following_count = (counts && counts['following']) || 0
       
       # Check if current user is following this user
       @is_following = false
@@ -129,13 +129,18 @@ class MlApiService
       handle_response(response)
     end
 
+    def get_user_follow_counts(username:)
+      uri = URI("#{BASE_URL}/users/follow-counts")
+      uri.query = URI.encode_www_form(username: username)
+      http = Net::HTTP.new(uri.host, uri.port)
+      request = Net::HTTP::Get.new(uri.path + '?' + uri.query, 'Content-Type' => 'application/json')
+      response = http.request(request)
+      handle_response(response)
+    end
+
     def get_user_followers_count(username:)
-      result = get_user_followers(username: username)
-      if result && result['followers'].is_a?(Array)
-        result['followers'].length
-      else
-        0
-      end
+      result = get_user_follow_counts(username: username)
+      result && result['followers'].is_a?(Integer) ? result['followers'] : 0
     end
 
     def get_user_following(username:)
@@ -148,12 +153,8 @@ class MlApiService
     end
 
     def get_user_following_count(username:)
-      result = get_user_following(username: username)
-      if result && result['following'].is_a?(Array)
-        result['following'].length
-      else
-        0
-      end
+      result = get_user_follow_counts(username: username)
+      result && result['following'].is_a?(Integer) ? result['following'] : 0
     end
 
     def get_follow_requests(username:)
@@ -285,10 +286,11 @@ class MlApiService
       handle_response(response)
     end
 
-    def get_friends_posts(username:, offset:, page_size:)
+    # Pass the next_cursor of the previous page as cursor; offset is only for older callers.
+    def get_friends_posts(username:, cursor: nil, page_size: nil, offset: nil)
       uri = URI("#{BASE_URL}/posts/friends-posts")
       http = Net::HTTP.new(uri.host, uri.port)
-      body = { username: username, offset: offset, page_size: page_size }.to_json
+      body = { username: username, cursor: cursor.presence, page_size: page_size.presence, offset: offset.presence }.compact.to_json
       request = Net::HTTP::Post.new(uri.request_uri)
       request['Content-Type'] = 'application/json'
       request['Content-Length'] = body.bytesize.to_s
@@ -1,5 +1,6 @@
 from .connector import Connector
 from .methods import User, Sport, Field
+from .schema import ensure_schema
 from . import rag
 
-__all__ = ["Connector", "User", "Sport", "Field", "rag"]
\ No newline at end of file
+__all__ = ["Connector", "User", "Sport", "Field", "ensure_schema", "rag"]
\ No newline at end of file
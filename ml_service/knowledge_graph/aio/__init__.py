@@ -0,0 +1,7 @@
+from .connector import AsyncConnector
+from .user import AsyncUser
+from .sport import AsyncSport
+from .field import AsyncField
+from .event import AsyncEvent
+from .post import AsyncPost
+__all__ = ["AsyncConnector", "AsyncUser", "AsyncSport", "AsyncField", "AsyncEvent", "AsyncPost"]
\ No newline at end of file
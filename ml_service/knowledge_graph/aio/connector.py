@@ -0,0 +1,87 @@
+import asyncio
+import logging
+from neo4j import AsyncGraphDatabase
+
+from ..connector import Connector
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class AsyncConnector(Connector):
+    """Async counterpart of Connector: one pooled AsyncDriver per event loop.
+
+    A driver's connections belong to the loop it was created on, so each loop gets
+    its own driver instead of replacing (and leaking) another loop's.
+    Reads the same NEO4J_* env vars (including the pool settings) as Connector.
+    """
+    _drivers = {}  # event loop -> AsyncDriver
+    _locks = {}  # event loop -> asyncio.Lock guarding driver creation on that loop
+
+    async def connect(self):
+        """Return the running loop's shared async driver, creating it on first use.
+
+        Callers must not close the returned driver; call AsyncConnector.close() at shutdown.
+        """
+        loop = asyncio.get_running_loop()
+        driver = AsyncConnector._drivers.get(loop)
+        if driver is not None:
+            return driver
+        AsyncConnector._prune()
+        # asyncio.Lock is bound to the loop that first awaits it
+        lock = AsyncConnector._locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            driver = AsyncConnector._drivers.get(loop)
+            if driver is not None:
+                return driver
+            try:
+                auth = (self.user, self.password)
+                driver = AsyncGraphDatabase.driver(
+                    self.url,
+                    auth=auth,
+                    max_connection_pool_size=self.max_pool_size,
+                    max_connection_lifetime=self.max_connection_lifetime,
+                    connection_acquisition_timeout=self.connection_acquisition_timeout,
+                )
+                await driver.verify_connectivity()
+                AsyncConnector._drivers[loop] = driver
+                logger.info(
+                    f"<async_connector> Neo4j DB async connection pool established "
+                    f"(max_pool_size={self.max_pool_size})."
+                )
+                return driver
+            except Exception as e:
+                logger.error(f"<async_connector> Neo4j DB async connection failed: {e}")
+                raise e
+
+    @classmethod
+    def _prune(cls):
+        """Forget the drivers of closed loops; they can no longer be closed on their loop, and
+        dropping them lets their transports be garbage-collected."""
+        for loop in [loop for loop in cls._drivers if loop.is_closed()]:
+            cls._drivers.pop(loop, None)
+            cls._locks.pop(loop, None)
+            logger.warning("<async_connector> Dropped the async driver of a closed event loop.")
+
+    @classmethod
+    async def close(cls):
+        """Close the running loop's async driver, and those of loops still running in other threads.
+        Call from the ASGI lifespan shutdown."""
+        loop = asyncio.get_running_loop()
+        for driver_loop, driver in list(cls._drivers.items()):
+            cls._drivers.pop(driver_loop, None)
+            cls._locks.pop(driver_loop, None)
+            try:
+                if driver_loop is loop:
+                    await driver.close()
+                elif driver_loop.is_running():
+                    await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(driver.close(), driver_loop))
+                else:
+                    logger.warning("<async_connector> Dropped the async driver of a stopped event loop.")
+                    continue
+                logger.info("<async_connector> Neo4j DB async connection pool closed.")
+            except Exception as e:
+                logger.error(f"<async_connector> Error closing Neo4j DB async connection pool: {e}")
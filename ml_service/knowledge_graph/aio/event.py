@@ -0,0 +1,410 @@
+from .connector import AsyncConnector
+from ..methods.event import Event
+from ..methods.search import fulltext_query, is_missing_index_error, EVENT_SEARCH_INDEX, SEARCH_LIMIT
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class AsyncEvent:
+    """Async mirror of knowledge_graph.methods.Event on the neo4j async driver."""
+
+    def __init__(self):
+        self.connector = AsyncConnector()
+
+    async def create_event(self, event_name: str, username: str, description: str, date_time: str, max_players: int, current_players: int = 0):
+        """Create a new event in Neo4j database. Returns event data. date_time stored as string."""
+        try:
+            driver = await self.connector.connect()
+            # Keep date_time as string for storage and JSON
+            date_time_str = str(date_time) if date_time is not None else None
+
+            query = """
+            CREATE(e:Event{
+                event_name: $event_name,
+                host: $username,
+                description: $description,
+                date_time: $date_time,
+                max_players: $max_players,
+                current_players: $current_players
+            })
+            with e
+            MATCH(u:User {username: $username})
+            CREATE(e)-[:HOSTED_BY]->(u)
+            RETURN e
+            """
+            params = {
+                "event_name": event_name,
+                "username": username,
+                "description": description,
+                "date_time": date_time_str,
+                "max_players": max_players,
+                "current_players": current_players
+            }
+
+            logger.info(f"<event> Adding event to Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            if result:
+                event_data = dict(result[0]['e'])
+                logger.info(f"<event> Event added to Neo4j DB: {event_data}")
+                return self._serialize_event(event_data)
+            return None
+        except Exception as e:
+            logger.error(f"<event> Error adding event to Neo4j DB: {e}")
+            raise e
+
+    async def get_event(self, event_name: str):
+        """Get an event by name. Returns event data dict or None."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(e:Event{event_name: $event_name})
+            RETURN e
+            """
+            params = {
+                "event_name": event_name
+            }
+
+            logger.info(f"<event> Searching for event in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            if result:
+                event_data = dict(result[0]['e'])
+                logger.info(f"<event> Event found in Neo4j DB: {event_data}")
+                return self._serialize_event(event_data)
+            logger.info(f"<event> Event not found in Neo4j DB: {event_name}")
+            return None
+        except Exception as e:
+            logger.error(f"<event> Error searching for event in Neo4j DB: {e}")
+            raise e
+
+    async def search_events(self, query: str):
+        """Search for events by name (full-text, relevance ranked, prefix match). Returns list of event dicts."""
+        try:
+            driver = await self.connector.connect()
+
+            search = fulltext_query(query)
+            if not search:
+                return []
+
+            query_cypher = """
+            CALL db.index.fulltext.queryNodes($index, $search, {limit: $limit}) YIELD node AS e, score
+            RETURN e
+            ORDER BY score DESC, e.event_name
+            """
+            params = {"index": EVENT_SEARCH_INDEX, "search": search, "limit": SEARCH_LIMIT}
+
+            logger.info(f"<event> Searching for events in Neo4j DB: {params}")
+
+            try:
+                result, summary, keys = await driver.execute_query(query_cypher, params)
+            except Exception as e:
+                if not is_missing_index_error(e, EVENT_SEARCH_INDEX):
+                    raise e
+                # Index not created yet (NEO4J_ENSURE_SCHEMA off): fall back to a substring scan
+                logger.warning(f"<event> Full-text index {EVENT_SEARCH_INDEX} unavailable, scanning: {e}")
+                query_cypher = """
+                MATCH(e:Event)
+                WHERE toLower(e.event_name) CONTAINS toLower($query)
+                RETURN e
+                ORDER BY e.event_name
+                LIMIT $limit
+                """
+                result, summary, keys = await driver.execute_query(query_cypher, {"query": query, "limit": SEARCH_LIMIT})
+
+            events = [self._serialize_event(dict(record['e'])) for record in result]
+            logger.info(f"<event> Found {len(events)} events matching query in Neo4j DB: {query}")
+            return events
+        except Exception as e:
+            logger.error(f"<event> Error searching for events in Neo4j DB: {e}")
+            raise e
+    
+    async def get_all_attendees(self, event_name: str, exclude_username: str = None):
+        """Get all attendees of an event. Returns list of user dicts."""
+        try:
+            driver = await self.connector.connect()
+
+            # HOSTED_BY: (Event)-[:HOSTED_BY]->(User)
+            # JOINED: (User)-[:JOINED]->(Event)
+            # Use UNION to handle both directions
+            if exclude_username is not None:
+                query = """
+                MATCH (e:Event {event_name: $event_name})-[:HOSTED_BY]->(u:User)
+                WHERE u.username <> $exclude_username
+                RETURN u
+                UNION
+                MATCH (u:User)-[:JOINED]->(e:Event {event_name: $event_name})
+                WHERE u.username <> $exclude_username
+                RETURN u
+                """
+                params = {
+                    "event_name": event_name,
+                    "exclude_username": exclude_username
+                }
+            else:
+                query = """
+                MATCH (e:Event {event_name: $event_name})-[:HOSTED_BY]->(u:User)
+                RETURN u
+                UNION
+                MATCH (u:User)-[:JOINED]->(e:Event {event_name: $event_name})
+                RETURN u
+                """
+                params = {
+                    "event_name": event_name
+                }
+
+            logger.info(f"<event> Getting all attendees of event: {event_name} from Neo4j DB")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            attendees = [self._serialize_event(dict(record['u'])) for record in result]
+            logger.info(f"<event> Found {len(attendees)} attendees of event: {event_name} in Neo4j DB")
+            return attendees
+        except Exception as e:
+            logger.error(f"<event> Error getting all attendees of event: {event_name} from Neo4j DB: {e}")
+            raise e
+    
+    async def get_all_events_joined_by_user(self, username: str):
+        """Get all events joined by user. Returns list of event dicts."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH (u:User {username: $username})-[:JOINED]->(e:Event)
+            RETURN e
+            """
+            params = {
+                "username": username
+            }
+
+            logger.info(f"<event> Getting all events joined by user: {username} from Neo4j DB")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            events = [self._serialize_event(dict(record['e'])) for record in result]
+            logger.info(f"<event> Found {len(events)} events joined by user: {username} in Neo4j DB")
+            return events
+        except Exception as e:
+            logger.error(f"<event> Error getting all events joined by user: {username} from Neo4j DB: {e}")
+            raise e
+    
+    async def get_all_events_hosted_by_user(self, username: str):
+        """Get all events hosted by user. Returns list of event dicts."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH (e:Event)-[:HOSTED_BY]->(u:User {username: $username})
+            RETURN e
+            """
+            params = {
+                "username": username
+            }
+
+            logger.info(f"<event> Getting all events hosted by user: {username} from Neo4j DB")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            events = [self._serialize_event(dict(record['e'])) for record in result]
+            logger.info(f"<event> Found {len(events)} events hosted by user: {username} in Neo4j DB")
+            return events
+        except Exception as e:
+            logger.error(f"<event> Error getting all events hosted by user: {username} from Neo4j DB: {e}")
+            raise e
+
+    async def update_event(self, event_name: str, description: str = None, date_time: str = None, 
+                     max_players: int = None, current_players: int = None):
+        """Update event information in Neo4j. Returns updated event data."""
+        try:
+            driver = await self.connector.connect()
+
+            updates = []
+            params = {"event_name": event_name}
+            
+            if description is not None:
+                updates.append("e.description = $description")
+                params["description"] = description
+            if date_time is not None:
+                updates.append("e.date_time = $date_time")
+                params["date_time"] = str(date_time)
+            if max_players is not None:
+                updates.append("e.max_players = $max_players")
+                params["max_players"] = max_players
+            if current_players is not None:
+                updates.append("e.current_players = $current_players")
+                params["current_players"] = current_players
+            
+            if len(updates) == 0:
+                return None
+
+            query = f"""
+            MATCH(e:Event {{event_name: $event_name}})
+            SET {', '.join(updates)}
+            RETURN e
+            """
+
+            logger.info(f"<event> Updating event in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            
+            if result:
+                event_data = dict(result[0]['e'])
+                logger.info(f"<event> Event updated in Neo4j DB: {event_data}")
+                return self._serialize_event(event_data)
+            return None
+        except Exception as e:
+            logger.error(f"<event> Error updating event in Neo4j DB: {e}")
+            raise e
+
+    async def delete_event(self, event_name: str):
+        """Delete an event from Neo4j. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(e:Event{event_name: $event_name})
+            DETACH DELETE e
+            RETURN e
+            """
+            params = {
+                "event_name": event_name
+            }
+
+            logger.info(f"<event> Deleting event from Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            success = summary.counters.nodes_deleted > 0
+            if success:
+                logger.info(f"<event> Event deleted from Neo4j DB: {event_name}")
+            else:
+                logger.info(f"<event> Event not found for deletion in Neo4j DB: {event_name}")
+            return success
+        except Exception as e:
+            logger.error(f"<event> Error deleting event from Neo4j DB: {e}")
+            raise e
+
+    async def hosted_at_field(self, event_name: str, field_name: str):
+        """Create a HOSTED_AT relationship between event and field. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(e:Event {event_name: $event_name})
+            MATCH(f:Field {field_name: $field_name})
+            CREATE(e)-[:HOSTED_AT]->(f)
+            RETURN e, f
+            """
+            params = {
+                "event_name": event_name,
+                "field_name": field_name
+            }
+
+            logger.info(f"<event> Adding HOSTED_AT relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<event> HOSTED_AT relationship added in Neo4j DB: {event_name} -> {field_name}")
+            return success
+        except Exception as e:
+            logger.error(f"<event> Error adding HOSTED_AT relationship in Neo4j DB: {e}")
+            raise e
+
+    async def for_sport(self, event_name: str, sport_name: str, min_skill_level: str):
+        """Create a FOR_SPORT relationship between event and sport. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(e:Event {event_name: $event_name})
+            MATCH(s:Sport {sport_name: $sport_name})
+            CREATE(e)-[:FOR_SPORT {min_skill_level: $min_skill_level}]->(s)
+            RETURN e, s
+            """
+            params = {
+                "event_name": event_name,
+                "sport_name": sport_name,
+                "min_skill_level": min_skill_level
+            }
+
+            logger.info(f"<event> Adding FOR_SPORT relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<event> FOR_SPORT relationship added in Neo4j DB: {event_name} -> {sport_name}")
+            return success
+        except Exception as e:
+            logger.error(f"<event> Error adding FOR_SPORT relationship in Neo4j DB: {e}")
+            raise e
+    
+    async def user_joined_event(self, event_name: str, username: str):
+        """Create a JOINED relationship between a user and an event. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH (e:Event {event_name: $event_name})
+            MATCH (u:User {username: $username})
+            CREATE (u)-[:JOINED]->(e)
+            RETURN e, u
+            """
+            params = {
+                "event_name": event_name,
+                "username": username,
+            }
+
+            logger.info(f"<event> Adding JOINED relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<event> JOINED relationship added in Neo4j DB: {username} -> {event_name}")
+            else:
+                logger.info(f"<event> Join failed (event or user not found): {username} -> {event_name}")
+            return success
+        except Exception as e:
+            logger.error(f"<event> Error adding JOINED relationship in Neo4j DB: {e}")
+            raise e
+
+    async def user_left_event(self, event_name: str, username: str):
+        """Remove JOINED relationship and decrement event current_players. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH (u:User {username: $username})-[r:JOINED]->(e:Event {event_name: $event_name})
+            DELETE r
+            WITH e
+            SET e.current_players = CASE WHEN e.current_players > 0 THEN e.current_players - 1 ELSE 0 END
+            RETURN e
+            """
+            params = {
+                "event_name": event_name,
+                "username": username,
+            }
+
+            logger.info(f"<event> Removing JOINED relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_deleted > 0
+            if success:
+                logger.info(f"<event> JOINED relationship removed: {username} -X-> {event_name}")
+            else:
+                logger.info(f"<event> Leave failed (relationship not found): {username} -> {event_name}")
+            return success
+        except Exception as e:
+            logger.error(f"<event> Error removing JOINED relationship in Neo4j DB: {e}")
+            raise e
+
+    # Same JSON conversion as the sync Event class.
+    _serialize_event = Event._serialize_event
@@ -0,0 +1,458 @@
+from .connector import AsyncConnector
+from ..methods.post import Post
+from ..timeline import HomeTimeline
+from datetime import datetime
+import asyncio
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+class AsyncPost:
+    """Async mirror of knowledge_graph.methods.Post on the neo4j async driver."""
+
+    def __init__(self):
+        self.connector = AsyncConnector()
+        self.timeline = HomeTimeline()
+    
+    async def create_post(self, title: str, content: str, event_name_mention: str, username: str):
+        """Create a new post in Neo4j database and tags attendees of the event. Returns post data (including post_id).
+
+        Everything (post node, ABOUT_* links, TAGGED attendees, MENTIONS_USER joiners) is written by one
+        Cypher statement, so the whole post costs a single round trip regardless of event size.
+        """
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH (author:User {username: $username})
+            MATCH (e:Event {event_name: $event_name_mention})
+            CREATE (p:Post {
+                title: $title,
+                content: $content,
+                username: $username,
+                created_at: $created_at,
+                event_name_mention: $event_name_mention
+            })
+            CREATE (author)-[:POSTED]->(p)
+            CREATE (p)-[:ABOUT_EVENT]->(e)
+            WITH p, e, author
+            OPTIONAL MATCH (e)-[:HOSTED_AT]->(f:Field)
+            OPTIONAL MATCH (e)-[:FOR_SPORT]->(s:Sport)
+            WITH p, e, author, head(collect(DISTINCT f)) AS field, head(collect(DISTINCT s)) AS sport
+            FOREACH (x IN CASE WHEN field IS NULL THEN [] ELSE [field] END | CREATE (p)-[:ABOUT_FIELD]->(x))
+            FOREACH (x IN CASE WHEN sport IS NULL THEN [] ELSE [sport] END | CREATE (p)-[:ABOUT_SPORT]->(x))
+            WITH p, e, author, field, sport
+            OPTIONAL MATCH (attendee:User)-[:JOINED|HOSTED_BY]-(e)
+            WHERE attendee <> author
+            WITH p, e, field, sport, collect(DISTINCT attendee) AS attendees
+            FOREACH (a IN attendees | CREATE (p)-[:TAGGED]->(a))
+            WITH p, e, field, sport, attendees
+            OPTIONAL MATCH (joined:User)-[:JOINED]->(e)
+            WITH p, field, sport, attendees, collect(DISTINCT joined) AS joined_users
+            FOREACH (u IN joined_users | CREATE (p)-[:MENTIONS_USER]->(u))
+            RETURN p, elementId(p) AS post_id,
+                   size(attendees) AS tagged_count,
+                   field.field_name AS field_name_mention,
+                   sport.sport_name AS sport_name_mention,
+                   [u IN joined_users | u.username] AS user_username_mentions
+            """
+
+            params = {
+                "title": title,
+                "content": content,
+                "username": username,
+                "created_at": datetime.now().isoformat(),
+                "event_name_mention": event_name_mention
+            }
+
+            logger.info(f"<post> Adding post to Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            if not result:
+                logger.error(f"<post> Failed to add post to Neo4j DB: {params}")
+                return None
+
+            record = result[0]
+            post_data = dict(record["p"])
+            post_data["post_id"] = record["post_id"]
+
+            logger.info(
+                f"<post> Post added to Neo4j DB: {post_data} "
+                f"(tagged={record['tagged_count']}, field={record['field_name_mention']}, "
+                f"sport={record['sport_name_mention']}, mentions={record['user_username_mentions']})"
+            )
+            await asyncio.to_thread(self.timeline.fan_out_post, username, post_data.get("created_at"), post_data["post_id"])
+            return post_data
+        except Exception as e:
+            logger.error(f"<post> Error adding post to Neo4j DB: {e}")
+            raise e
+    
+    async def delete_post(self, post_id: str) -> bool:
+        """Delete a post by Neo4j elementId. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH (p:Post)
+            WHERE elementId(p) = $post_id
+            DETACH DELETE p
+            """
+            params = {"post_id": post_id}
+
+            logger.info(f"<post> Deleting post from Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            success = summary.counters.nodes_deleted > 0
+            if success:
+                logger.info(f"<post> Post deleted from Neo4j DB: {post_id}")
+                await asyncio.to_thread(self.timeline.on_delete_post, post_id)
+            else:
+                logger.info(f"<post> Post not found for deletion in Neo4j DB: {post_id}")
+            return success
+        except Exception as e:
+            logger.error(f"<post> Error deleting post from Neo4j DB: {e}")
+            raise e
+
+    async def get_post(self, post_id: str):
+        """Get a post by Neo4j elementId. Returns post data dict (including post_id) or None."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH (p:Post)
+            WHERE elementId(p) = $post_id
+            RETURN p, elementId(p) AS post_id
+            """
+            params = {"post_id": post_id}
+
+            logger.info(f"<post> Getting post from Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            if result:
+                record = result[0]
+                post_data = dict(record["p"])
+                post_data["post_id"] = record["post_id"]
+                logger.info(f"<post> Post found in Neo4j DB: {post_data}")
+                return post_data
+            logger.info(f"<post> Post not found in Neo4j DB: {post_id}")
+            return None
+        except Exception as e:
+            logger.error(f"<post> Error getting post from Neo4j DB: {e}")
+            raise e
+
+    async def get_user_posts(self, username: str):
+        """Get posts for a user. Returns list of post data dicts (including post_id) or None."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH (u:User {username: $username})-[:POSTED]->(p:Post)
+            RETURN p, elementId(p) AS post_id
+            """
+            params = {"username": username}
+
+            logger.info(f"<post> Getting posts for user from Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            if result:
+                posts = [{**dict(record["p"]), "post_id": record["post_id"]} for record in result]
+                logger.info(f"<post> Posts found in Neo4j DB: {posts}")
+                return posts
+            logger.info(f"<post> No posts found in Neo4j DB for user: {username}")
+            return []
+        except Exception as e:
+            logger.error(f"<post> Error getting posts for user from Neo4j DB: {e}")
+            raise e
+
+    async def get_tagged_posts(self, username: str):
+        """Get posts where user is tagged (MENTIONS_USER). Returns list of post dicts."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH (p:Post)-[:MENTIONS_USER]->(u:User {username: $username})
+            OPTIONAL MATCH (author:User)-[:POSTED]->(p)
+            RETURN p, elementId(p) AS post_id, author.username AS author_username
+            ORDER BY p.created_at DESC
+            """
+            params = {"username": username}
+
+            logger.info(f"<post> Getting tagged posts for user from Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            if result:
+                posts = []
+                for record in result:
+                    post_data = {**dict(record["p"]), "post_id": record["post_id"]}
+                    if record["author_username"]:
+                        post_data["author_username"] = record["author_username"]
+                    posts.append(post_data)
+                logger.info(f"<post> Tagged posts found in Neo4j DB: {posts}")
+                return posts
+            logger.info(f"<post> No tagged posts found in Neo4j DB for user: {username}")
+            return []
+        except Exception as e:
+            logger.error(f"<post> Error getting tagged posts for user from Neo4j DB: {e}")
+            raise e
+
+    async def update_post(self, post_id: str, title: str = None, content: str = None):
+        """Update post title/content. Returns updated post data dict or None."""
+        try:
+            driver = await self.connector.connect()
+
+            updates = []
+            params = {"post_id": post_id}
+
+            if title is not None:
+                updates.append("p.title = $title")
+                params["title"] = title
+            if content is not None:
+                updates.append("p.content = $content")
+                params["content"] = content
+
+            if len(updates) == 0:
+                return None
+
+            query = f"""
+            MATCH (p:Post)
+            WHERE elementId(p) = $post_id
+            SET {', '.join(updates)}
+            RETURN p, elementId(p) AS post_id
+            """
+
+            logger.info(f"<post> Updating post in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            if result:
+                record = result[0]
+                post_data = dict(record["p"])
+                post_data["post_id"] = record["post_id"]
+                logger.info(f"<post> Post updated in Neo4j DB: {post_data}")
+                return post_data
+            return None
+        except Exception as e:
+            logger.error(f"<post> Error updating post in Neo4j DB: {e}")
+            raise e
+    
+    async def like_post(self, username: str, post_id: str) -> bool:
+        """Create a LIKED relationship between user and post. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH (u:User {username: $username})
+            MATCH (p:Post)
+            WHERE elementId(p) = $post_id
+            CREATE (u)-[:LIKED]->(p)
+            RETURN u, p
+            """
+            params = {"username": username, "post_id": post_id}
+
+            logger.info(f"<post> Adding LIKED relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<post> LIKED relationship added in Neo4j DB: {username} -> {post_id}")
+            else:
+                logger.info(f"<post> Failed to add LIKED relationship in Neo4j DB: {username} -> {post_id}")
+            return success
+        except Exception as e:
+            logger.error(f"<post> Error adding LIKED relationship in Neo4j DB: {e}")
+            raise e
+
+    async def unlike_post(self, username: str, post_id: str) -> bool:
+        """Delete a LIKED relationship between user and post. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH (u:User {username: $username})-[r:LIKED]->(p:Post)
+            WHERE elementId(p) = $post_id
+            DELETE r
+            """
+            params = {"username": username, "post_id": post_id}
+
+            logger.info(f"<post> Removing LIKED relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_deleted > 0
+            if success:
+                logger.info(f"<post> LIKED relationship removed from Neo4j DB: {username} -X-> {post_id}")
+            else:
+                logger.info(f"<post> LIKED relationship not found in Neo4j DB: {username} -> {post_id}")
+            return success
+        except Exception as e:
+            logger.error(f"<post> Error removing LIKED relationship in Neo4j DB: {e}")
+            raise e
+
+    async def comment_on_post(self, username: str, post_id: int, comment: str) -> bool:
+        """Create a COMMENTED relationship between user and post. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH (u:User {username: $username})
+            MATCH (p:Post)
+            WHERE elementId(p) = $post_id
+            CREATE (u)-[:COMMENTED {
+                content: $comment,
+                created_at: $created_at
+            }]->(p)
+            RETURN u, p
+            """
+            params = {
+                "username": username,
+                "post_id": post_id,
+                "comment": comment,
+                "created_at": datetime.now().isoformat()
+            }
+
+            logger.info(f"<post> Adding COMMENTED relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<post> COMMENTED relationship added in Neo4j DB: {username} -> {post_id}")
+            else:
+                logger.info(f"<post> Failed to add COMMENTED relationship in Neo4j DB: {username} -> {post_id}")
+            return success
+        except Exception as e:
+            logger.error(f"<post> Error adding COMMENTED relationship in Neo4j DB: {e}")
+            raise e
+
+    async def get_post_comments(self, post_id: str):
+        """Get all comments for a post. Returns list of { username, content, created_at }."""
+        try:
+            driver = await self.connector.connect()
+            query = """
+            MATCH (u:User)-[r:COMMENTED]->(p:Post)
+            WHERE elementId(p) = $post_id
+            RETURN u.username AS username, r.content AS content, r.created_at AS created_at
+            ORDER BY r.created_at
+            """
+            params = {"post_id": post_id}
+            result, summary, keys = await driver.execute_query(query, params)
+            comments = []
+            for record in result:
+                created_at = record["created_at"]
+                if hasattr(created_at, "iso_format"):
+                    created_at = created_at.iso_format()
+                elif hasattr(created_at, "isoformat") and callable(getattr(created_at, "isoformat")):
+                    created_at = created_at.isoformat()
+                comments.append({
+                    "username": record["username"],
+                    "content": record["content"],
+                    "created_at": created_at,
+                })
+            return comments
+        except Exception as e:
+            logger.error(f"<post> Error getting post comments: {e}")
+            raise e
+    
+
+    async def get_friends_posts(self, username: str, offset: int = 0, page_size: int = 20):
+        """Get posts from users that the current user follows. Returns list of post dicts with post_id and author_username."""
+        try:
+            if self.timeline.enabled:
+                return await asyncio.to_thread(self.timeline.read, username, None, offset, page_size)
+
+            driver = await self.connector.connect()
+            query = """
+            MATCH (me:User {username: $username})-[:FOLLOWS]->(friend:User)-[:POSTED]->(post:Post)
+            RETURN post, elementId(post) AS post_id, friend.username AS author_username
+            ORDER BY post.created_at DESC
+            SKIP $offset LIMIT $page_size
+            """
+            params = {"username": username, "offset": offset, "page_size": page_size}
+            logger.info(f"<post> Getting friends posts for user: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            if result:
+                posts = []
+                for record in result:
+                    post_data = {**dict(record["post"]), "post_id": record["post_id"]}
+                    if record.get("author_username"):
+                        post_data["author_username"] = record["author_username"]
+                    posts.append(post_data)
+                logger.info(f"<post> Friends posts found in Neo4j DB: {len(posts)} posts")
+                return posts
+            logger.info(f"<post> No friends posts found in Neo4j DB for user: {username}")
+            return []
+        except Exception as e:
+            logger.error(f"<post> Error getting friends posts for user from Neo4j DB: {e}")
+            raise e
+
+    async def get_friends_posts_page(self, username: str, cursor: str = None, page_size: int = 20):
+        """Keyset-paginated friends feed, newest first. Returns {posts, next_cursor}; next_cursor is None on the last page.
+
+        The cursor encodes the (created_at, post_id) of the last post returned, so every page is a
+        bounded top-k read instead of re-sorting and skipping all earlier pages.
+        Raises ValueError for a malformed cursor.
+        """
+        try:
+            after_created_at, after_post_id = self._decode_cursor(cursor) if cursor else (None, None)
+            if self.timeline.enabled:
+                after = (after_created_at, after_post_id) if cursor else None
+                # One extra row tells us whether another page exists
+                result = await asyncio.to_thread(self.timeline.read, username, after, 0, page_size + 1)
+                posts = result[:page_size]
+            else:
+                driver = await self.connector.connect()
+
+                query = """
+                MATCH (me:User {username: $username})-[:FOLLOWS]->(friend:User)-[:POSTED]->(post:Post)
+                WITH post, elementId(post) AS post_id, coalesce(post.created_at, '') AS created_at, friend
+                WHERE $after_post_id IS NULL
+                    OR created_at < $after_created_at
+                    OR (created_at = $after_created_at AND post_id < $after_post_id)
+                RETURN post, post_id, friend.username AS author_username
+                ORDER BY created_at DESC, post_id DESC
+                LIMIT $limit
+                """
+                # One extra row tells us whether another page exists
+                params = {
+                    "username": username,
+                    "after_created_at": after_created_at,
+                    "after_post_id": after_post_id,
+                    "limit": page_size + 1
+                }
+                logger.info(f"<post> Getting friends posts page for user: {params}")
+
+                result, summary, keys = await driver.execute_query(query, params)
+
+                posts = []
+                for record in result[:page_size]:
+                    post_data = {**dict(record["post"]), "post_id": record["post_id"]}
+                    if record.get("author_username"):
+                        post_data["author_username"] = record["author_username"]
+                    posts.append(post_data)
+
+            next_cursor = None
+            if len(result) > page_size and posts:
+                next_cursor = self._encode_cursor(posts[-1].get("created_at") or "", posts[-1]["post_id"])
+
+            logger.info(f"<post> Friends posts page found in Neo4j DB: {len(posts)} posts (more={next_cursor is not None})")
+            return {"posts": posts, "next_cursor": next_cursor}
+        except ValueError as e:
+            logger.error(f"<post> Invalid friends feed cursor: {e}")
+            raise e
+        except Exception as e:
+            logger.error(f"<post> Error getting friends posts page for user from Neo4j DB: {e}")
+            raise e
+
+    # Same cursor format as the sync Post class.
+    _encode_cursor = staticmethod(Post._encode_cursor)
+    _decode_cursor = staticmethod(Post._decode_cursor)
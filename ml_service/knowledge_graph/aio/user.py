@@ -0,0 +1,716 @@
+from .connector import AsyncConnector
+from ..methods.user import User
+from ..timeline import HomeTimeline
+from ..degrees import FollowCounts
+# Absolute on purpose: rec_system reads the log as ml_service.knowledge_graph.profile_events, and a
+# relative import from the app's knowledge_graph package would be a second module with its own log
+from ml_service.knowledge_graph.profile_events import ProfileEvents
+from ..methods.search import fulltext_query, is_missing_index_error, USER_SEARCH_INDEX, SEARCH_LIMIT
+from datetime import datetime
+import asyncio
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+class AsyncUser:
+    """Async mirror of knowledge_graph.methods.User on the neo4j async driver."""
+
+    def __init__(self):
+        self.connector = AsyncConnector()
+        self.timeline = HomeTimeline()
+        self.follow_counts = FollowCounts()
+        self.profile_events = ProfileEvents()
+
+    async def user_signup(self, username: str, email: str, password: str):
+        """Create a new user in Neo4j database. Returns user data."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            CREATE(u:User {
+                username: $username, 
+                email: $email,
+                password: $password,
+                created_at: $created_at,
+                updated_at: $updated_at
+            })
+            RETURN u
+            """
+            now = datetime.now().isoformat()
+            params = {
+                "username": username,
+                "email": email,
+                "password": password,
+                "created_at": now,
+                "updated_at": now
+            }
+
+            logger.info(f"<user> Adding user to Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            if result:
+                user_data = dict(result[0]['u'])
+                logger.info(f"<user> User added to Neo4j DB: {user_data}")
+                await asyncio.to_thread(self.profile_events.on_upsert, [user_data])
+                return user_data
+            return None
+        except Exception as e:
+            logger.error(f"<user> Error adding user to Neo4j DB: {e}")
+            raise e
+
+    async def user_login(self, username: str, password: str):
+        """Find a user by username. Returns user data dict or None."""
+        try:
+            driver = await self.connector.connect()
+
+            # check if user exists and password is correct
+            query = """
+            MATCH(u:User {username: $username, password: $password})
+            RETURN u
+            """
+            params = {"username": username, "password": password}
+
+            logger.info(f"<user> Searching for user in Neo4j DB and checking password: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+
+            if result:
+                # check if password is correct
+                if result[0]['u']['password'] == password:
+                    user_data = dict(result[0]['u'])
+                    logger.info(f"<user> User found in Neo4j DB and password is correct: {user_data}")
+                    return user_data
+                else:
+                    logger.info(f"<user> User found in Neo4j DB but password is incorrect: {username}")
+                    return None
+        except Exception as e:
+            logger.error(f"<user> Error searching for user in Neo4j DB and checking password: {e}")
+            raise e
+
+    async def update_user(self, username: str, age: int = None, city: str = None, 
+                    state: str = None, favorite_sport: str = None, competitive_level: str = None, 
+                    bio: str = None, email: str = None, phone_no: str = None):
+        """Update user information in Neo4j. Returns updated user data."""
+        try:
+            driver = await self.connector.connect()
+
+            updates = []
+            params = {"username": username, "updated_at": datetime.now().isoformat()}
+            
+            if age is not None:
+                updates.append("u.age = $age")
+                params["age"] = age
+            if city is not None:
+                updates.append("u.city = $city")
+                params["city"] = city
+            if state is not None:
+                updates.append("u.state = $state")
+                params["state"] = state
+            if city is not None and state is not None:
+                lat, lon = await asyncio.to_thread(User.get_location_coordinates, city, state)
+                if lat is not None and lon is not None:
+                    updates.append("u.latitude = $latitude")
+                    updates.append("u.longitude = $longitude")
+                    params["latitude"] = lat
+                    params["longitude"] = lon
+            if favorite_sport is not None:
+                updates.append("u.favorite_sport = $favorite_sport")
+                params["favorite_sport"] = favorite_sport
+            if competitive_level is not None:
+                updates.append("u.competitive_level = $competitive_level")
+                params["competitive_level"] = competitive_level
+            if bio is not None:
+                updates.append("u.bio = $bio")
+                params["bio"] = bio
+            if email is not None:
+                updates.append("u.email = $email")
+                params["email"] = email
+            if phone_no is not None:
+                updates.append("u.phone_no = $phone_no")
+                params["phone_no"] = phone_no
+            
+            updates.append("u.updated_at = $updated_at")
+            
+            if len(updates) == 1:  # Only updated_at
+                return None
+
+            query = f"""
+            MATCH(u:User {{username: $username}})
+            SET {', '.join(updates)}
+            RETURN u
+            """
+
+            logger.info(f"<user> Updating user in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            
+            if result:
+                user_data = dict(result[0]['u'])
+                logger.info(f"<user> User updated in Neo4j DB: {user_data}")
+                await asyncio.to_thread(self.profile_events.on_upsert, [user_data])
+                return user_data
+            return None
+        except Exception as e:
+            logger.error(f"<user> Error updating user in Neo4j DB: {e}")
+            raise e
+
+    async def delete_user(self, username: str):
+        """Delete a user from Neo4j. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User {username: $username})
+            DETACH DELETE u
+            RETURN count(u) as deleted_count
+            """
+            params = {"username": username}
+
+            logger.info(f"<user> Deleting user from Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            
+            success = summary.counters.nodes_deleted > 0
+            if success:
+                logger.info(f"<user> User deleted from Neo4j DB: {username}")
+                await asyncio.to_thread(self.timeline.on_delete_user, username)
+                self.follow_counts.invalidate([username])
+                await asyncio.to_thread(self.profile_events.on_delete, [username])
+            else:
+                logger.info(f"<user> User not found for deletion in Neo4j DB: {username}")
+            return success
+        except Exception as e:
+            logger.error(f"<user> Error deleting user from Neo4j DB: {e}")
+            raise e
+
+    async def add_friend(self, user_username: str, friend_username: str):
+        """Add a friend relationship. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(a:User {username: $user_username})
+            MATCH(b:User {username: $friend_username})
+            CREATE(a)-[:FRIEND]->(b)
+            RETURN a, b
+            """
+            params = {
+                "user_username": user_username,
+                "friend_username": friend_username
+            }
+
+            logger.info(f"<user> Adding friend relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<user> Friend relationship added in Neo4j DB: {user_username} -> {friend_username}")
+                await self.add_follower(user_username, friend_username)
+            return success
+        except Exception as e:
+            logger.error(f"<user> Error adding friend relationship in Neo4j DB: {e}")
+            raise e
+    
+    async def add_follower(self, user_username: str, follower_username: str):
+        """Add a follower relationship. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+            
+            query = """
+            MATCH(a:User {username: $user_username})
+            MATCH(b:User {username: $follower_username})
+            CREATE(a)-[:FOLLOWS]->(b)
+            RETURN a, b
+            """
+            params = {
+                "user_username": user_username,
+                "follower_username": follower_username
+            }
+
+            logger.info(f"<user> Adding follower relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<user> Follower relationship added in Neo4j DB: {user_username} -> {follower_username}")
+                self.follow_counts.invalidate([user_username, follower_username])
+            return success
+        except Exception as e:
+            logger.error(f"<user> Error adding follower relationship in Neo4j DB: {e}")
+            raise e
+
+    async def remove_friend(self, user_username: str, friend_username: str):
+        """Remove a friend relationship. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(a:User {username: $user_username})-[r:FRIEND]->(b:User {username: $friend_username})
+            DELETE r
+            RETURN a, b
+            """
+            params = {
+                "user_username": user_username,
+                "friend_username": friend_username
+            }
+
+            logger.info(f"<user> Removing friend relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_deleted > 0
+            if success:
+                logger.info(f"<user> Friend relationship removed from Neo4j DB: {user_username} -X-> {friend_username}")
+            else:
+                logger.info(f"<user> Friend relationship not found in Neo4j DB: {user_username} -> {friend_username}")
+            return success
+        except Exception as e:
+            logger.error(f"<user> Error removing friend relationship in Neo4j DB: {e}")
+            raise e
+
+    async def get_friends(self, username: str):
+        """Get all friends of a user. Returns list of friend usernames."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User {username: $username})-[:FRIEND]->(f:User)
+            RETURN f.username as friend_username
+            """
+            params = {"username": username}
+
+            logger.info(f"<user> Getting friends for user in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            
+            friends = [record['friend_username'] for record in result]
+            logger.info(f"<user> Found {len(friends)} friends for user in Neo4j DB: {username}")
+            return friends
+        except Exception as e:
+            logger.error(f"<user> Error getting friends for user in Neo4j DB: {e}")
+            raise e
+
+    async def get_all_users(self):
+        """Get all users. Returns list of user dicts."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User)
+            RETURN u
+            ORDER BY u.created_at DESC
+            """
+
+            logger.info("<user> Getting all users from Neo4j DB")
+
+            result, summary, keys = await driver.execute_query(query)
+            
+            users = [dict(record['u']) for record in result]
+            logger.info(f"<user> Found {len(users)} users in Neo4j DB")
+            return users
+        except Exception as e:
+            logger.error(f"<user> Error getting all users from Neo4j DB: {e}")
+            raise e
+
+    # Get user follow requests route.
+    async def get_user_follow_requests(self, username: str):
+        """Get all follow requests for a user (users who follow this user but this user doesn't follow back). 
+        Returns list of follow request usernames."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User {username: $username})<-[:FOLLOWS]-(f:User)
+            WHERE NOT (u)-[:FOLLOWS]->(f)
+            RETURN f.username as request_username
+            """
+            params = {"username": username}
+
+            logger.info(f"<user> Getting follow requests for user in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            
+            follow_requests = [record['request_username'] for record in result]
+            logger.info(f"<user> Found {len(follow_requests)} follow requests for user in Neo4j DB: {username}")
+            return follow_requests
+        except Exception as e:
+            logger.error(f"<user> Error getting follow requests for user in Neo4j DB: {e}")
+            raise e
+
+
+    # Get user followers route.
+    async def get_user_followers(self, username: str):
+        """Get all followers of a user. Returns list of follower usernames."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User {username: $username})<-[:FOLLOWS]-(f:User)
+            RETURN f.username as follower_username
+            """
+            params = {"username": username}
+
+            logger.info(f"<user> Getting followers for user in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            
+            followers = [record['follower_username'] for record in result]
+            logger.info(f"<user> Found {len(followers)} followers for user in Neo4j DB: {username}")
+            return followers
+        except Exception as e:
+            logger.error(f"<user> Error getting followers for user in Neo4j DB: {e}")
+            raise e
+    
+    async def get_user_following(self, username: str):
+        """Get all following of a user. Returns list of following usernames."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User {username: $username})-[:FOLLOWS]->(f:User)
+            RETURN f.username as following_username
+        """
+            params = {"username": username}
+
+            logger.info(f"<user> Getting following for user in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            
+            following = [record['following_username'] for record in result]
+            logger.info(f"<user> Found {len(following)} following for user in Neo4j DB: {username}")
+            return following
+        except Exception as e:
+            logger.error(f"<user> Error getting following for user in Neo4j DB: {e}")
+            raise e
+    
+    async def get_follow_counts(self, username: str):
+        """Get follower and following counts of a user (count-only query, TTL cached).
+        Returns {"followers": int, "following": int}; 0/0 for unknown users."""
+        try:
+            followers, following = await asyncio.to_thread(self.follow_counts.get, username)
+            return {"followers": followers, "following": following}
+        except Exception as e:
+            logger.error(f"<user> Error getting follow counts for user in Neo4j DB: {e}")
+            raise e
+
+    async def get_number_of_followers(self, username: str):
+        """Get the number of followers of a user. Returns the number of followers."""
+        try:
+            return (await self.get_follow_counts(username))["followers"]
+        except Exception as e:
+            logger.error(f"<user> Error getting number of followers for user in Neo4j DB: {e}")
+            raise e
+    
+    async def get_number_of_following(self, username: str):
+        """Get the number of following of a user. Returns the number of following."""
+        try:
+            return (await self.get_follow_counts(username))["following"]
+        except Exception as e:
+            logger.error(f"<user> Error getting number of following for user in Neo4j DB: {e}")
+            raise e
+    
+    async def get_user(self, username: str):
+        """Get a user by username. Returns user data dict or None."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User {username: $username})
+            RETURN u
+            """
+            params = {"username": username}
+
+            logger.info(f"<user> Getting user from Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            
+            if result:
+                user_data = dict(result[0]['u'])
+                logger.info(f"<user> User found in Neo4j DB: {user_data}")
+                return user_data
+            else:
+                logger.info(f"<user> User not found in Neo4j DB: {username}")
+                return None
+        except Exception as e:
+            logger.error(f"<user> Error getting user from Neo4j DB: {e}")
+            raise e
+
+    async def search_users(self, query: str):
+        """Search for users by username (full-text, relevance ranked, prefix match). Returns list of user dicts."""
+        try:
+            driver = await self.connector.connect()
+
+            search = fulltext_query(query)
+            if not search:
+                return []
+
+            query_cypher = """
+            CALL db.index.fulltext.queryNodes($index, $search, {limit: $limit}) YIELD node AS u, score
+            RETURN u
+            ORDER BY score DESC, u.username
+            """
+            params = {"index": USER_SEARCH_INDEX, "search": search, "limit": SEARCH_LIMIT}
+
+            logger.info(f"<user> Searching for users in Neo4j DB: {params}")
+
+            try:
+                result, summary, keys = await driver.execute_query(query_cypher, params)
+            except Exception as e:
+                if not is_missing_index_error(e, USER_SEARCH_INDEX):
+                    raise e
+                # Index not created yet (NEO4J_ENSURE_SCHEMA off): fall back to a substring scan
+                logger.warning(f"<user> Full-text index {USER_SEARCH_INDEX} unavailable, scanning: {e}")
+                query_cypher = """
+                MATCH(u:User)
+                WHERE toLower(u.username) CONTAINS toLower($query)
+                RETURN u
+                ORDER BY u.username
+                LIMIT $limit
+                """
+                result, summary, keys = await driver.execute_query(query_cypher, {"query": query, "limit": SEARCH_LIMIT})
+
+            users = [dict(record['u']) for record in result]
+            logger.info(f"<user> Found {len(users)} users matching query in Neo4j DB: {query}")
+            return users
+        except Exception as e:
+            logger.error(f"<user> Error searching for users in Neo4j DB: {e}")
+            raise e
+
+    async def follow_user(self, user_username: str, follow_username: str):
+        """Create a FOLLOWS relationship between users. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(a:User {username: $user_username})
+            MATCH(b:User {username: $follow_username})
+            CREATE(a)-[:FOLLOWS]->(b)
+            RETURN a, b
+            """
+            params = {
+                "user_username": user_username,
+                "follow_username": follow_username
+            }
+
+            logger.info(f"<user> Adding FOLLOWS relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<user> FOLLOWS relationship added in Neo4j DB: {user_username} -> {follow_username}")
+                await asyncio.to_thread(self.timeline.on_follow, user_username, follow_username)
+                self.follow_counts.invalidate([user_username, follow_username])
+            return success
+        except Exception as e:
+            logger.error(f"<user> Error adding FOLLOWS relationship in Neo4j DB: {e}")
+            raise e
+
+    async def unfollow_user(self, user_username: str, unfollow_username: str):
+        """Delete a FOLLOWS relationship between users. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(a:User {username: $user_username})-[r:FOLLOWS]->(b:User {username: $unfollow_username})
+            DELETE r
+            RETURN a, b
+            """
+            params = {
+                "user_username": user_username,
+                "unfollow_username": unfollow_username
+            }
+
+            logger.info(f"<user> Removing FOLLOWS relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_deleted > 0
+            if success:
+                logger.info(f"<user> FOLLOWS relationship removed from Neo4j DB: {user_username} -X-> {unfollow_username}")
+                await asyncio.to_thread(self.timeline.on_unfollow, user_username, unfollow_username)
+                self.follow_counts.invalidate([user_username, unfollow_username])
+            else:
+                logger.info(f"<user> FOLLOWS relationship not found in Neo4j DB: {user_username} -> {unfollow_username}")
+            return success
+        except Exception as e:
+            logger.error(f"<user> Error removing FOLLOWS relationship in Neo4j DB: {e}")
+            raise e
+
+    async def play_sport(self, username: str, sport_name: str, skill_level: str, years_experience: int):
+        """Create a PLAYS relationship between user and sport. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User {username: $username})
+            MATCH(s:Sport {sport_name: $sport_name})
+            CREATE(u)-[:PLAYS {
+                skill_level: $skill_level,
+                years_experience: $years_experience,
+                added_at: $added_at
+            }]->(s)
+            RETURN u, s
+            """
+            params = {
+                "username": username,
+                "sport_name": sport_name,
+                "skill_level": skill_level,
+                "years_experience": years_experience,
+                "added_at": datetime.now().isoformat()
+            }
+
+            logger.info(f"<user> Adding PLAYS relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<user> PLAYS relationship added in Neo4j DB: {username} -> {sport_name}")
+            return success
+        except Exception as e:
+            logger.error(f"<user> Error adding PLAYS relationship in Neo4j DB: {e}")
+            raise e
+
+    async def interested_in_sport(self, username: str, sport_name: str):
+        """Create an INTERESTED_IN relationship between user and sport. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User {username: $username})
+            MATCH(s:Sport {sport_name: $sport_name})
+            CREATE(u)-[:INTERESTED_IN]->(s)
+            RETURN u, s
+            """
+            params = {
+                "username": username,
+                "sport_name": sport_name
+            }
+
+            logger.info(f"<user> Adding INTERESTED_IN relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<user> INTERESTED_IN relationship added in Neo4j DB: {username} -> {sport_name}")
+            return success
+        except Exception as e:
+            logger.error(f"<user> Error adding INTERESTED_IN relationship in Neo4j DB: {e}")
+            raise e
+
+    async def organize_event(self, username: str, event_name: str):
+        """Create an ORGANIZES relationship between user and event. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User {username: $username})
+            MATCH(e:Event {event_name: $event_name})
+            CREATE(u)-[:ORGANIZES]->(e)
+            RETURN u, e
+            """
+            params = {
+                "username": username,
+                "event_name": event_name
+            }
+
+            logger.info(f"<user> Adding ORGANIZES relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<user> ORGANIZES relationship added in Neo4j DB: {username} -> {event_name}")
+            return success
+        except Exception as e:
+            logger.error(f"<user> Error adding ORGANIZES relationship in Neo4j DB: {e}")
+            raise e
+
+    async def attend_event(self, username: str, event_name: str, status: str):
+        """Create an ATTENDING relationship between user and event. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User {username: $username})
+            MATCH(e:Event {event_name: $event_name})
+            CREATE(u)-[:ATTENDING {status: $status}]->(e)
+            RETURN u, e
+            """
+            params = {
+                "username": username,
+                "event_name": event_name,
+                "status": status
+            }
+
+            logger.info(f"<user> Adding ATTENDING relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<user> ATTENDING relationship added in Neo4j DB: {username} -> {event_name}")
+            return success
+        except Exception as e:
+            logger.error(f"<user> Error adding ATTENDING relationship in Neo4j DB: {e}")
+            raise e
+
+    async def invite_to_event(self, username: str, event_name: str, invited_by: str, status: str = "pending"):
+        """Create an INVITED_TO relationship between user and event. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User {username: $username})
+            MATCH(e:Event {event_name: $event_name})
+            CREATE(u)-[:INVITED_TO {
+                invited_by: $invited_by,
+                status: $status
+            }]->(e)
+            RETURN u, e
+            """
+            params = {
+                "username": username,
+                "event_name": event_name,
+                "invited_by": invited_by,
+                "status": status
+            }
+
+            logger.info(f"<user> Adding INVITED_TO relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<user> INVITED_TO relationship added in Neo4j DB: {username} -> {event_name}")
+            return success
+        except Exception as e:
+            logger.error(f"<user> Error adding INVITED_TO relationship in Neo4j DB: {e}")
+            raise e
+
+    async def favorite_field(self, username: str, field_name: str):
+        """Create a FAVORITED relationship between user and field. Returns True if successful."""
+        try:
+            driver = await self.connector.connect()
+
+            query = """
+            MATCH(u:User {username: $username})
+            MATCH(f:Field {field_name: $field_name})
+            CREATE(u)-[:FAVORITED]->(f)
+            RETURN u, f
+            """
+            params = {
+                "username": username,
+                "field_name": field_name
+            }
+
+            logger.info(f"<user> Adding FAVORITED relationship in Neo4j DB: {params}")
+
+            result, summary, keys = await driver.execute_query(query, params)
+            success = summary.counters.relationships_created > 0
+            if success:
+                logger.info(f"<user> FAVORITED relationship added in Neo4j DB: {username} -> {field_name}")
+            return success
+        except Exception as e:
+            logger.error(f"<user> Error adding FAVORITED relationship in Neo4j DB: {e}")
+            raise e
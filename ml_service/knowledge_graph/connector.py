@@ -1,5 +1,7 @@
 from dotenv import load_dotenv
+import atexit
 import os
+import threading
 from neo4j import GraphDatabase
 import logging
 
@@ -9,21 +11,87 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Env keys (with defaults) for driver connection pool tuning
+ENV_MAX_POOL_SIZE = "NEO4J_MAX_POOL_SIZE"
+ENV_MAX_CONNECTION_LIFETIME = "NEO4J_MAX_CONNECTION_LIFETIME"
+ENV_CONNECTION_ACQUISITION_TIMEOUT = "NEO4J_CONNECTION_ACQUISITION_TIMEOUT"
+
+_DEFAULT_MAX_POOL_SIZE = 100
+_DEFAULT_MAX_CONNECTION_LIFETIME = 3600.0
+_DEFAULT_CONNECTION_ACQUISITION_TIMEOUT = 60.0
+
+
+def _number_env(key: str, default, cast=float):
+    """Parse a number from env var with fallback."""
+    raw = os.getenv(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        logger.warning(f"<connector> Invalid value for {key}='{raw}', using default {default}")
+        return default
+
+
 class Connector:
+    # Process-wide driver shared by every Connector instance. The neo4j driver
+    # is thread-safe and owns its own connection pool, so one per process is enough.
+    _driver = None
+    _lock = threading.Lock()
+
     def __init__(self):
         load_dotenv()
         self.url = os.getenv("NEO4J_URI")
         self.user = os.getenv("NEO4J_USERNAME")
         self.password = os.getenv("NEO4J_PASSWORD")
         self.database = os.getenv("NEO4J_DATABASE")
-    
+        self.max_pool_size = _number_env(ENV_MAX_POOL_SIZE, _DEFAULT_MAX_POOL_SIZE, int)
+        self.max_connection_lifetime = _number_env(
+            ENV_MAX_CONNECTION_LIFETIME, _DEFAULT_MAX_CONNECTION_LIFETIME
+        )
+        self.connection_acquisition_timeout = _number_env(
+            ENV_CONNECTION_ACQUISITION_TIMEOUT, _DEFAULT_CONNECTION_ACQUISITION_TIMEOUT
+        )
+
     def connect(self):
-        try:
-            auth = (self.user, self.password)
-            driver = GraphDatabase.driver(self.url, auth=auth)
-            driver.verify_connectivity()
-            logger.info("<connector> Neo4j DB connection established.")
+        """Return the shared pooled driver, creating it on first use.
+
+        Callers must not close the returned driver; it lives until process exit.
+        """
+        driver = Connector._driver
+        if driver is not None:
             return driver
-        except Exception as e:
-            logger.error(f"<connector> Neo4j DB connection failed: {e}")
-            raise e
\ No newline at end of file
+        with Connector._lock:
+            if Connector._driver is not None:
+                return Connector._driver
+            try:
+                auth = (self.user, self.password)
+                driver = GraphDatabase.driver(
+                    self.url,
+                    auth=auth,
+                    max_connection_pool_size=self.max_pool_size,
+                    max_connection_lifetime=self.max_connection_lifetime,
+                    connection_acquisition_timeout=self.connection_acquisition_timeout,
+                )
+                driver.verify_connectivity()
+                Connector._driver = driver
+                logger.info(
+                    f"<connector> Neo4j DB connection pool established "
+                    f"(max_pool_size={self.max_pool_size})."
+                )
+                return driver
+            except Exception as e:
+                logger.error(f"<connector> Neo4j DB connection failed: {e}")
+                raise e
+
+    @classmethod
+    def close(cls):
+        """Close the shared driver. Registered to run at process shutdown."""
+        with cls._lock:
+            if cls._driver is not None:
+                cls._driver.close()
+                cls._driver = None
+                logger.info("<connector> Neo4j DB connection pool closed.")
+
+
+atexit.register(Connector.close)
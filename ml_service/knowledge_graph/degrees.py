@@ -0,0 +1,163 @@
+"""
+Follower / following counts with a per-process TTL cache.
+
+Counts come from a count-only query (COUNT { } subqueries over FOLLOWS with an
+unlabelled far end, which Neo4j answers from the node's relationship degree
+instead of expanding the relationships), so no follower usernames are shipped
+over the wire just to take len().
+
+Results are cached per username for DEGREE_CACHE_TTL seconds. follow/unfollow,
+the batch follow and user deletion invalidate both ends locally; writes made by
+other workers show up once the entry expires. DEGREE_CACHE_TTL=0 disables the
+cache and every read goes to the graph.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from .connector import Connector
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ENV_DEGREE_CACHE_TTL = "DEGREE_CACHE_TTL"
+ENV_DEGREE_CACHE_MAX_ENTRIES = "DEGREE_CACHE_MAX_ENTRIES"
+
+_DEFAULT_TTL = 60
+_DEFAULT_MAX_ENTRIES = 100000
+
+# (followers, following)
+Counts = Tuple[int, int]
+
+
+def _int_env(key: str, default: int) -> int:
+    """Parse int from env var with fallback."""
+    raw = os.getenv(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning(f"<degrees> Invalid value for {key}='{raw}', using default {default}")
+        return default
+
+
+class DegreeCache:
+    """Thread-safe username -> (followers, following) map; entries expire after ttl seconds,
+    and the least recently used entry is evicted past max_entries."""
+
+    def __init__(self, ttl: float = _DEFAULT_TTL, max_entries: int = _DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # username -> (counts, expires_at)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, username: str) -> Optional[Counts]:
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                return None
+            counts, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[username]
+                return None
+            self._entries.move_to_end(username)
+            return counts
+
+    def put(self, username: str, counts: Counts):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[username] = (counts, time.monotonic() + self.ttl)
+            self._entries.move_to_end(username)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, usernames: Iterable[str]):
+        with self._lock:
+            for username in usernames:
+                self._entries.pop(username, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: Optional[DegreeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> DegreeCache:
+    """Process-wide degree cache configured from DEGREE_CACHE_TTL / DEGREE_CACHE_MAX_ENTRIES."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DegreeCache(
+                    ttl=_int_env(ENV_DEGREE_CACHE_TTL, _DEFAULT_TTL),
+                    max_entries=_int_env(ENV_DEGREE_CACHE_MAX_ENTRIES, _DEFAULT_MAX_ENTRIES),
+                )
+    return _cache
+
+
+class FollowCounts:
+    """Serves follower / following counts from the cache, querying the graph only for misses."""
+
+    COUNT_QUERY = """
+    UNWIND $usernames AS username
+    OPTIONAL MATCH (u:User {username: username})
+    RETURN username,
+        u IS NOT NULL AS found,
+        CASE WHEN u IS NULL THEN 0 ELSE COUNT { (u)<-[:FOLLOWS]-() } END AS followers,
+        CASE WHEN u IS NULL THEN 0 ELSE COUNT { (u)-[:FOLLOWS]->() } END AS following
+    """
+
+    def __init__(self):
+        self.connector = Connector()
+
+    @property
+    def cache(self) -> DegreeCache:
+        return get_cache()
+
+    def get(self, username: str) -> Counts:
+        """(followers, following) for one user; (0, 0) if the user does not exist."""
+        return self.get_many([username])[username]
+
+    def get_many(self, usernames: Iterable[str]) -> Dict[str, Counts]:
+        """{username: (followers, following)} for many users in at most one query."""
+        cache = self.cache
+        counts = {}
+        missing = []
+        for username in dict.fromkeys(usernames):
+            cached = cache.get(username)
+            if cached is None:
+                missing.append(username)
+            else:
+                counts[username] = cached
+        if not missing:
+            return counts
+
+        driver = self.connector.connect()
+        result, summary, keys = driver.execute_query(self.COUNT_QUERY, {"usernames": missing})
+        for record in result:
+            value = (record["followers"], record["following"])
+            counts[record["username"]] = value
+            # Unknown users are not cached, so a signup is visible straight away
+            if record["found"]:
+                cache.put(record["username"], value)
+        return counts
+
+    def invalidate(self, usernames: Iterable[str]):
+        """Drop cached counts after a FOLLOWS write touching these users."""
+        self.cache.invalidate(usernames)
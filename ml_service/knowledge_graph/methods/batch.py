@@ -0,0 +1,59 @@
+import logging
+import os
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ENV_BATCH_CHUNK_SIZE = "NEO4J_BATCH_CHUNK_SIZE"
+_DEFAULT_BATCH_CHUNK_SIZE = 1000
+
+
+def _chunk_size() -> int:
+    raw = os.getenv(ENV_BATCH_CHUNK_SIZE)
+    try:
+        return max(1, int(raw)) if raw else _DEFAULT_BATCH_CHUNK_SIZE
+    except ValueError:
+        logger.warning(f"<batch> Invalid value for {ENV_BATCH_CHUNK_SIZE}='{raw}', using default")
+        return _DEFAULT_BATCH_CHUNK_SIZE
+
+
+def run_batch(driver, query: str, rows: list, chunk_size: int = None) -> list:
+    """
+    Run an `UNWIND $rows AS row` write query in chunks, one transaction per chunk.
+
+    The query must return one record per input row with `idx` (row.idx), `success` and `error`.
+    A chunk whose transaction fails marks all of its rows as failed; later chunks still run.
+    Returns a list of {index, success, error?} dicts in input order.
+    """
+    chunk_size = chunk_size or _chunk_size()
+    results = [None] * len(rows)
+    indexed = [{**row, "idx": i} for i, row in enumerate(rows)]
+
+    for start in range(0, len(indexed), chunk_size):
+        chunk = indexed[start:start + chunk_size]
+        try:
+            records, summary, keys = driver.execute_query(query, {"rows": chunk})
+            for record in records:
+                idx = record["idx"]
+                # duplicate node matches yield several records per row; any success counts
+                if results[idx] is None or record["success"]:
+                    results[idx] = {"index": idx, "success": bool(record["success"])}
+                    if not record["success"]:
+                        results[idx]["error"] = record["error"]
+            logger.info(
+                f"<batch> Chunk {start}-{start + len(chunk) - 1} committed: "
+                f"{summary.counters.relationships_created} relationships created"
+            )
+        except Exception as e:
+            logger.error(f"<batch> Chunk {start}-{start + len(chunk) - 1} failed: {e}")
+            for row in chunk:
+                results[row["idx"]] = {"index": row["idx"], "success": False, "error": str(e)}
+
+    return [
+        result if result is not None else {"index": i, "success": False, "error": "No result returned"}
+        for i, result in enumerate(results)
+    ]
+
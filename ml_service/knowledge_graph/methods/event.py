@@ -1,4 +1,6 @@
 from ..connector import Connector
+from .batch import run_batch
+from .search import fulltext_query, is_missing_index_error, EVENT_SEARCH_INDEX, SEARCH_LIMIT
 from datetime import datetime
 import logging
 
@@ -15,7 +17,6 @@ class Event:
 
     def create_event(self, event_name: str, username: str, description: str, date_time: str, max_players: int, current_players: int = 0):
         """Create a new event in Neo4j database. Returns event data. date_time stored as string."""
-        driver = None
         try:
             driver = self.connector.connect()
             # Keep date_time as string for storage and JSON
@@ -56,13 +57,9 @@ class Event:
         except Exception as e:
             logger.error(f"<event> Error adding event to Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def get_event(self, event_name: str):
         """Get an event by name. Returns event data dict or None."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -87,28 +84,40 @@ class Event:
         except Exception as e:
             logger.error(f"<event> Error searching for event in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def search_events(self, query: str):
-        """Search for events by name. Returns list of event dicts."""
-        driver = None
+        """Search for events by name (full-text, relevance ranked, prefix match). Returns list of event dicts."""
         try:
             driver = self.connector.connect()
 
+            search = fulltext_query(query)
+            if not search:
+                return []
+
             query_cypher = """
-            MATCH(e:Event)
-            WHERE toLower(e.event_name) CONTAINS toLower($query)
+            CALL db.index.fulltext.queryNodes($index, $search, {limit: $limit}) YIELD node AS e, score
             RETURN e
-            ORDER BY e.event_name
-            LIMIT 50
+            ORDER BY score DESC, e.event_name
             """
-            params = {"query": query}
+            params = {"index": EVENT_SEARCH_INDEX, "search": search, "limit": SEARCH_LIMIT}
 
             logger.info(f"<event> Searching for events in Neo4j DB: {params}")
 
-            result, summary, keys = driver.execute_query(query_cypher, params)
+            try:
+                result, summary, keys = driver.execute_query(query_cypher, params)
+            except Exception as e:
+                if not is_missing_index_error(e, EVENT_SEARCH_INDEX):
+                    raise e
+                # Index not created yet (NEO4J_ENSURE_SCHEMA off): fall back to a substring scan
+                logger.warning(f"<event> Full-text index {EVENT_SEARCH_INDEX} unavailable, scanning: {e}")
+                query_cypher = """
+                MATCH(e:Event)
+                WHERE toLower(e.event_name) CONTAINS toLower($query)
+                RETURN e
+                ORDER BY e.event_name
+                LIMIT $limit
+                """
+                result, summary, keys = driver.execute_query(query_cypher, {"query": query, "limit": SEARCH_LIMIT})
 
             events = [self._serialize_event(dict(record['e'])) for record in result]
             logger.info(f"<event> Found {len(events)} events matching query in Neo4j DB: {query}")
@@ -116,13 +125,9 @@ class Event:
         except Exception as e:
             logger.error(f"<event> Error searching for events in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
     
     def get_all_attendees(self, event_name: str, exclude_username: str = None):
         """Get all attendees of an event. Returns list of user dicts."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -165,13 +170,9 @@ class Event:
         except Exception as e:
             logger.error(f"<event> Error getting all attendees of event: {event_name} from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
     
     def get_all_events_joined_by_user(self, username: str):
         """Get all events joined by user. Returns list of event dicts."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -193,13 +194,9 @@ class Event:
         except Exception as e:
             logger.error(f"<event> Error getting all events joined by user: {username} from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
     
     def get_all_events_hosted_by_user(self, username: str):
         """Get all events hosted by user. Returns list of event dicts."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -221,14 +218,10 @@ class Event:
         except Exception as e:
             logger.error(f"<event> Error getting all events hosted by user: {username} from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def update_event(self, event_name: str, description: str = None, date_time: str = None, 
                      max_players: int = None, current_players: int = None):
         """Update event information in Neo4j. Returns updated event data."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -269,13 +262,9 @@ class Event:
         except Exception as e:
             logger.error(f"<event> Error updating event in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def delete_event(self, event_name: str):
         """Delete an event from Neo4j. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -301,13 +290,9 @@ class Event:
         except Exception as e:
             logger.error(f"<event> Error deleting event from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def hosted_at_field(self, event_name: str, field_name: str):
         """Create a HOSTED_AT relationship between event and field. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -332,13 +317,9 @@ class Event:
         except Exception as e:
             logger.error(f"<event> Error adding HOSTED_AT relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def for_sport(self, event_name: str, sport_name: str, min_skill_level: str):
         """Create a FOR_SPORT relationship between event and sport. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -364,13 +345,9 @@ class Event:
         except Exception as e:
             logger.error(f"<event> Error adding FOR_SPORT relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
     
     def user_joined_event(self, event_name: str, username: str):
         """Create a JOINED relationship between a user and an event. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -397,13 +374,45 @@ class Event:
         except Exception as e:
             logger.error(f"<event> Error adding JOINED relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
+
+    def users_joined_event_batch(self, pairs: list):
+        """Create JOINED relationships for many (event_name, username) pairs and bump current_players.
+        pairs: list of {event_name, username}. Full events are skipped. Returns per-item status list."""
+        try:
+            driver = self.connector.connect()
+
+            # CALL subquery runs per row so capacity checks see joins made earlier in the chunk
+            query = """
+            UNWIND $rows AS row
+            CALL {
+                WITH row
+                OPTIONAL MATCH (e:Event {event_name: row.event_name})
+                OPTIONAL MATCH (u:User {username: row.username})
+                WITH e, u,
+                    CASE WHEN e IS NULL THEN 'Event not found: ' + row.event_name
+                         WHEN u IS NULL THEN 'User not found: ' + row.username
+                         WHEN e.max_players IS NOT NULL AND coalesce(e.current_players, 0) >= e.max_players
+                            THEN 'Event is full: ' + row.event_name
+                    END AS error
+                FOREACH (_ IN CASE WHEN error IS NULL THEN [1] ELSE [] END |
+                    CREATE (u)-[:JOINED]->(e)
+                    SET e.current_players = coalesce(e.current_players, 0) + 1
+                )
+                RETURN error
+            }
+            RETURN row.idx AS idx, error IS NULL AS success, error
+            """
+            rows = [{"event_name": p["event_name"], "username": p["username"]} for p in pairs]
+
+            logger.info(f"<event> Adding {len(rows)} JOINED relationships in Neo4j DB (batch)")
+
+            return run_batch(driver, query, rows)
+        except Exception as e:
+            logger.error(f"<event> Error adding JOINED relationships in Neo4j DB (batch): {e}")
+            raise e
 
     def user_left_event(self, event_name: str, username: str):
         """Remove JOINED relationship and decrement event current_players. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -431,9 +440,6 @@ class Event:
         except Exception as e:
             logger.error(f"<event> Error removing JOINED relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def _serialize_event(self, d):
         """Convert event dict to JSON-serializable form (datetime/Neo4j temporal -> string)."""
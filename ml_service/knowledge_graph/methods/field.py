@@ -13,7 +13,6 @@ class Field:
 
     def create_field(self, field_name: str, address: str):
         """Create a new field in Neo4j database. Returns field data."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -38,13 +37,9 @@ class Field:
         except Exception as e:
             logger.error(f"<field> Error adding field to Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def get_field(self, field_name: str):
         """Get a field by name. Returns field data dict or None."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -69,13 +64,9 @@ class Field:
         except Exception as e:
             logger.error(f"field:Error searching for field in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def get_field_by_address(self, address: str):
         """Get a field by address. Returns field data dict or None."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -100,13 +91,9 @@ class Field:
         except Exception as e:
             logger.error(f"<field> Error searching for field by address in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def get_all_fields(self):
         """Get all fields. Returns list of field dicts."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -126,13 +113,9 @@ class Field:
         except Exception as e:
             logger.error(f"<field> Error getting all fields from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def update_field(self, field_name: str, address: str = None, new_field_name: str = None):
         """Update field information in Neo4j. Returns updated field data."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -167,13 +150,9 @@ class Field:
         except Exception as e:
             logger.error(f"<field> Error updating field in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def delete_field(self, field_name: str, address: str):
         """Delete a field from Neo4j. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -200,13 +179,9 @@ class Field:
         except Exception as e:
             logger.error(f"<field> Error deleting field from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def supports_sport(self, field_name: str, sport_name: str):
         """Create a SUPPORTS relationship between field and sport. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -231,9 +206,6 @@ class Field:
         except Exception as e:
             logger.error(f"<field> Error adding SUPPORTS relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
 if __name__ == "__main__":
     queries = Field()
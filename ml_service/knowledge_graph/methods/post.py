@@ -1,5 +1,9 @@
 from ..connector import Connector
+from .batch import run_batch
+from ..timeline import HomeTimeline
 from datetime import datetime
+import base64
+import json
 import logging
 
 logging.basicConfig(
@@ -12,19 +16,14 @@ logger = logging.getLogger(__name__)
 class Post:
     def __init__(self):
         self.connector = Connector()
+        self.timeline = HomeTimeline()
     
     def create_post(self, title: str, content: str, event_name_mention: str, username: str):
-        """Create a new post in Neo4j database and tags attendees of the event. Returns post data (including post_id)."""
-        # grab list of username(s) from event.
-        user_username_mentions = self._get_user_username_mentions(event_name_mention)
+        """Create a new post in Neo4j database and tags attendees of the event. Returns post data (including post_id).
 
-        # grab field_name from event.
-        field_name_mention = self._get_field_name_mention(event_name_mention)    
-
-        # grab sport_name from event.
-        sport_name_mention = self._get_sport_name_mention(event_name_mention)
-
-        driver = None
+        Everything (post node, ABOUT_* links, TAGGED attendees, MENTIONS_USER joiners) is written by one
+        Cypher statement, so the whole post costs a single round trip regardless of event size.
+        """
         try:
             driver = self.connector.connect()
 
@@ -39,11 +38,27 @@ class Post:
                 event_name_mention: $event_name_mention
             })
             CREATE (author)-[:POSTED]->(p)
+            CREATE (p)-[:ABOUT_EVENT]->(e)
             WITH p, e, author
-            MATCH (attendee:User)-[:JOINED|HOSTED_BY]-(e)
+            OPTIONAL MATCH (e)-[:HOSTED_AT]->(f:Field)
+            OPTIONAL MATCH (e)-[:FOR_SPORT]->(s:Sport)
+            WITH p, e, author, head(collect(DISTINCT f)) AS field, head(collect(DISTINCT s)) AS sport
+            FOREACH (x IN CASE WHEN field IS NULL THEN [] ELSE [field] END | CREATE (p)-[:ABOUT_FIELD]->(x))
+            FOREACH (x IN CASE WHEN sport IS NULL THEN [] ELSE [sport] END | CREATE (p)-[:ABOUT_SPORT]->(x))
+            WITH p, e, author, field, sport
+            OPTIONAL MATCH (attendee:User)-[:JOINED|HOSTED_BY]-(e)
             WHERE attendee <> author
-            CREATE (p)-[:TAGGED]->(attendee)
-            RETURN p, elementId(p) AS post_id, count(attendee) as tagged_count
+            WITH p, e, field, sport, collect(DISTINCT attendee) AS attendees
+            FOREACH (a IN attendees | CREATE (p)-[:TAGGED]->(a))
+            WITH p, e, field, sport, attendees
+            OPTIONAL MATCH (joined:User)-[:JOINED]->(e)
+            WITH p, field, sport, attendees, collect(DISTINCT joined) AS joined_users
+            FOREACH (u IN joined_users | CREATE (p)-[:MENTIONS_USER]->(u))
+            RETURN p, elementId(p) AS post_id,
+                   size(attendees) AS tagged_count,
+                   field.field_name AS field_name_mention,
+                   sport.sport_name AS sport_name_mention,
+                   [u IN joined_users | u.username] AS user_username_mentions
             """
 
             params = {
@@ -63,31 +78,22 @@ class Post:
                 return None
 
             record = result[0]
-            post_id = record["post_id"]
             post_data = dict(record["p"])
-            post_data["post_id"] = post_id
-
-            # create relationships (tags).
-            self._create_about_event(post_id, event_name_mention)
-            if field_name_mention:
-                self._create_about_field(post_id, field_name_mention)
-            if sport_name_mention:
-                self._create_about_sport(post_id, sport_name_mention)
-            for username in (user_username_mentions or []):
-                self._create_mentions_user(post_id, username)
-
-            logger.info(f"<post> Post added to Neo4j DB: {post_data}")
+            post_data["post_id"] = record["post_id"]
+
+            logger.info(
+                f"<post> Post added to Neo4j DB: {post_data} "
+                f"(tagged={record['tagged_count']}, field={record['field_name_mention']}, "
+                f"sport={record['sport_name_mention']}, mentions={record['user_username_mentions']})"
+            )
+            self.timeline.fan_out_post(username, post_data.get("created_at"), post_data["post_id"])
             return post_data
         except Exception as e:
             logger.error(f"<post> Error adding post to Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
     
     def delete_post(self, post_id: str) -> bool:
         """Delete a post by Neo4j elementId. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -105,19 +111,16 @@ class Post:
             success = summary.counters.nodes_deleted > 0
             if success:
                 logger.info(f"<post> Post deleted from Neo4j DB: {post_id}")
+                self.timeline.on_delete_post(post_id)
             else:
                 logger.info(f"<post> Post not found for deletion in Neo4j DB: {post_id}")
             return success
         except Exception as e:
             logger.error(f"<post> Error deleting post from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def get_post(self, post_id: str):
         """Get a post by Neo4j elementId. Returns post data dict (including post_id) or None."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -143,13 +146,9 @@ class Post:
         except Exception as e:
             logger.error(f"<post> Error getting post from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def get_user_posts(self, username: str):
         """Get posts for a user. Returns list of post data dicts (including post_id) or None."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -172,13 +171,9 @@ class Post:
         except Exception as e:
             logger.error(f"<post> Error getting posts for user from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def get_tagged_posts(self, username: str):
         """Get posts where user is tagged (MENTIONS_USER). Returns list of post dicts."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -208,13 +203,9 @@ class Post:
         except Exception as e:
             logger.error(f"<post> Error getting tagged posts for user from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def update_post(self, post_id: str, title: str = None, content: str = None):
         """Update post title/content. Returns updated post data dict or None."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -252,13 +243,9 @@ class Post:
         except Exception as e:
             logger.error(f"<post> Error updating post in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
     
     def like_post(self, username: str, post_id: str) -> bool:
         """Create a LIKED relationship between user and post. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -283,13 +270,35 @@ class Post:
         except Exception as e:
             logger.error(f"<post> Error adding LIKED relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
+
+    def like_posts_batch(self, pairs: list):
+        """Create LIKED relationships for many (username, post_id) pairs.
+        pairs: list of {username, post_id}. Returns per-item status list."""
+        try:
+            driver = self.connector.connect()
+
+            query = """
+            UNWIND $rows AS row
+            OPTIONAL MATCH (u:User {username: row.username})
+            OPTIONAL MATCH (p:Post)
+            WHERE elementId(p) = row.post_id
+            WITH row, u, p, (u IS NOT NULL AND p IS NOT NULL) AS ok
+            FOREACH (_ IN CASE WHEN ok THEN [1] ELSE [] END | CREATE (u)-[:LIKED]->(p))
+            RETURN row.idx AS idx, ok AS success,
+                CASE WHEN u IS NULL THEN 'User not found: ' + row.username
+                     WHEN p IS NULL THEN 'Post not found: ' + row.post_id END AS error
+            """
+            rows = [{"username": p["username"], "post_id": p["post_id"]} for p in pairs]
+
+            logger.info(f"<post> Adding {len(rows)} LIKED relationships in Neo4j DB (batch)")
+
+            return run_batch(driver, query, rows)
+        except Exception as e:
+            logger.error(f"<post> Error adding LIKED relationships in Neo4j DB (batch): {e}")
+            raise e
 
     def unlike_post(self, username: str, post_id: str) -> bool:
         """Delete a LIKED relationship between user and post. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -312,13 +321,9 @@ class Post:
         except Exception as e:
             logger.error(f"<post> Error removing LIKED relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def comment_on_post(self, username: str, post_id: int, comment: str) -> bool:
         """Create a COMMENTED relationship between user and post. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -351,13 +356,9 @@ class Post:
         except Exception as e:
             logger.error(f"<post> Error adding COMMENTED relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def get_post_comments(self, post_id: str):
         """Get all comments for a post. Returns list of { username, content, created_at }."""
-        driver = None
         try:
             driver = self.connector.connect()
             query = """
@@ -384,15 +385,14 @@ class Post:
         except Exception as e:
             logger.error(f"<post> Error getting post comments: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
     
 
     def get_friends_posts(self, username: str, offset: int = 0, page_size: int = 20):
         """Get posts from users that the current user follows. Returns list of post dicts with post_id and author_username."""
-        driver = None
         try:
+            if self.timeline.enabled:
+                return self.timeline.read(username, None, offset, page_size)
+
             driver = self.connector.connect()
             query = """
             MATCH (me:User {username: $username})-[:FOLLOWS]->(friend:User)-[:POSTED]->(post:Post)
@@ -419,183 +419,80 @@ class Post:
         except Exception as e:
             logger.error(f"<post> Error getting friends posts for user from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
-
-    def _get_user_username_mentions(self, event_name_mention: str):
-        """Get list of username(s) linked to event via JOINED"""
-        driver = None
-        try:
-            driver = self.connector.connect()
-
-            # Users can be linked via JOINED (event join)
-            query = """
-            MATCH (u:User)-[:JOINED]->(e:Event {event_name: $event_name})
-            RETURN collect(DISTINCT u.username) AS user_username_mentions
-            """
-            params = {"event_name": event_name_mention}
-
-            logger.info(f"<post> Getting user username mentions from event: {params}")
-
-            result, summary, keys = driver.execute_query(query, params)
-
-            if result:
-                user_username_mentions = result[0]["user_username_mentions"]
-                logger.info(f"<post> User username mentions found in event: {user_username_mentions}")
-                return user_username_mentions if user_username_mentions else []
-            return []
-        except Exception as e:
-            logger.error(f"<post> Error getting user username mentions from event: {e}")
-            raise e
-        finally:
-            if driver:
-                driver.close()
-    
-    def _get_field_name_mention(self, event_name_mention:str):
-        """Get field_name from event."""
-        driver = None
-        try:
-            driver = self.connector.connect()
-
-            query = """
-            MATCH(e:Event {event_name: $event_name})-[:HOSTED_AT]->(f:Field)
-            RETURN f.field_name AS field_name_mention
-            """
-            params = {"event_name": event_name_mention}
-            logger.info(f"<post> Getting field name mentions from event: {params}")
 
-            result, summary, keys = driver.execute_query(query, params)
+    def get_friends_posts_page(self, username: str, cursor: str = None, page_size: int = 20):
+        """Keyset-paginated friends feed, newest first. Returns {posts, next_cursor}; next_cursor is None on the last page.
 
-            if result:
-                field_name_mention = result[0]['field_name_mention']
-                logger.info(f"<post> Field name mentions found in event: {field_name_mention}")
-                return field_name_mention
-        except Exception as e:
-            logger.error(f"<post> Error getting field name mentions from event: {e}")
-            raise e
-        finally:
-            if driver:
-                driver.close()
-    
-    def _get_sport_name_mention(self, event_name_mention:str):
-        """Get sport_name from event."""
-        driver = None
+        The cursor encodes the (created_at, post_id) of the last post returned, so every page is a
+        bounded top-k read instead of re-sorting and skipping all earlier pages. Posts without a
+        created_at sort as '' (after every dated post), so the cursor never loops back to page 1.
+        Raises ValueError for a malformed cursor.
+        """
         try:
-            driver = self.connector.connect()
-
-            query = """
-            MATCH(e:Event {event_name: $event_name})-[:FOR_SPORT]->(s:Sport)
-            RETURN s.sport_name AS sport_name_mention
-            """
-            params = {"event_name": event_name_mention}
-            logger.info(f"<post> Getting sport name mentions from event: {params}")
+            after_created_at, after_post_id = self._decode_cursor(cursor) if cursor else (None, None)
+            if self.timeline.enabled:
+                after = (after_created_at, after_post_id) if cursor else None
+                # One extra row tells us whether another page exists
+                result = self.timeline.read(username, after, 0, page_size + 1)
+                posts = result[:page_size]
+            else:
+                driver = self.connector.connect()
+
+                query = """
+                MATCH (me:User {username: $username})-[:FOLLOWS]->(friend:User)-[:POSTED]->(post:Post)
+                WITH post, elementId(post) AS post_id, coalesce(post.created_at, '') AS created_at, friend
+                WHERE $after_post_id IS NULL
+                    OR created_at < $after_created_at
+                    OR (created_at = $after_created_at AND post_id < $after_post_id)
+                RETURN post, post_id, friend.username AS author_username
+                ORDER BY created_at DESC, post_id DESC
+                LIMIT $limit
+                """
+                # One extra row tells us whether another page exists
+                params = {
+                    "username": username,
+                    "after_created_at": after_created_at,
+                    "after_post_id": after_post_id,
+                    "limit": page_size + 1
+                }
+                logger.info(f"<post> Getting friends posts page for user: {params}")
+
+                result, summary, keys = driver.execute_query(query, params)
 
-            result, summary, keys = driver.execute_query(query, params)
+                posts = []
+                for record in result[:page_size]:
+                    post_data = {**dict(record["post"]), "post_id": record["post_id"]}
+                    if record.get("author_username"):
+                        post_data["author_username"] = record["author_username"]
+                    posts.append(post_data)
 
-            if result:
-                sport_name_mention = result[0]["sport_name_mention"]
-                logger.info(f"<post> Sport name mentions found in event: {sport_name_mention}")
-                return sport_name_mention
-        except Exception as e:
-            logger.error(f"<post> Error getting sport name mentions from event: {e}")
-            raise e
-        finally:
-            if driver:
-                driver.close()
+            next_cursor = None
+            if len(result) > page_size and posts:
+                next_cursor = self._encode_cursor(posts[-1].get("created_at") or "", posts[-1]["post_id"])
 
-    def _create_about_event(self, post_id: str, event_name: str) -> bool:
-        """Create (Post)-[:ABOUT]->(Event). Returns True if successful."""
-        driver = None
-        try:
-            driver = self.connector.connect()
-            query = """
-            MATCH (p:Post)
-            WHERE elementId(p) = $post_id
-            MATCH (e:Event {event_name: $event_name})
-            CREATE (p)-[:ABOUT_EVENT]->(e)
-            RETURN p, e
-            """
-            result, summary, _ = driver.execute_query(query, {"post_id": post_id, "event_name": event_name})
-            success = summary.counters.relationships_created > 0
-            if success:
-                logger.info(f"<post> ABOUT_EVENT relationship created: post -> {event_name}")
-            return success
-        except Exception as e:
-            logger.error(f"<post> Error creating ABOUT_EVENT relationship: {e}")
+            logger.info(f"<post> Friends posts page found in Neo4j DB: {len(posts)} posts (more={next_cursor is not None})")
+            return {"posts": posts, "next_cursor": next_cursor}
+        except ValueError as e:
+            logger.error(f"<post> Invalid friends feed cursor: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
-
-    def _create_about_field(self, post_id: str, field_name: str) -> bool:
-        """Create (Post)-[:ABOUT]->(Field). Returns True if successful."""
-        driver = None
-        try:
-            driver = self.connector.connect()
-            query = """
-            MATCH (p:Post)
-            WHERE elementId(p) = $post_id
-            MATCH (f:Field {field_name: $field_name})
-            CREATE (p)-[:ABOUT_FIELD]->(f)
-            RETURN p, f
-            """
-            result, summary, _ = driver.execute_query(query, {"post_id": post_id, "field_name": field_name})
-            success = summary.counters.relationships_created > 0
-            if success:
-                logger.info(f"<post> ABOUT_FIELD relationship created: post -> {field_name}")
-            return success
         except Exception as e:
-            logger.error(f"<post> Error creating ABOUT_FIELD relationship: {e}")
+            logger.error(f"<post> Error getting friends posts page for user from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
-    def _create_about_sport(self, post_id: str, sport_name: str) -> bool:
-        """Create (Post)-[:ABOUT]->(Sport). Returns True if successful."""
-        driver = None
-        try:
-            driver = self.connector.connect()
-            query = """
-            MATCH (p:Post)
-            WHERE elementId(p) = $post_id
-            MATCH (s:Sport {sport_name: $sport_name})
-            CREATE (p)-[:ABOUT_SPORT]->(s)
-            RETURN p, s
-            """
-            result, summary, _ = driver.execute_query(query, {"post_id": post_id, "sport_name": sport_name})
-            success = summary.counters.relationships_created > 0
-            if success:
-                logger.info(f"<post> ABOUT_SPORT relationship created: post -> {sport_name}")
-            return success
-        except Exception as e:
-            logger.error(f"<post> Error creating ABOUT_SPORT relationship: {e}")
-            raise e
-        finally:
-            if driver:
-                driver.close()
+    @staticmethod
+    def _encode_cursor(created_at, post_id: str) -> str:
+        """Opaque feed cursor: urlsafe base64 of the (created_at, post_id) sort key."""
+        raw = json.dumps([created_at, post_id], default=str).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
 
-    def _create_mentions_user(self, post_id: str, username: str) -> bool:
-        """Create (Post)-[:MENTIONS_USER]->(User). Returns True if successful."""
-        driver = None
+    @staticmethod
+    def _decode_cursor(cursor: str):
+        """Inverse of _encode_cursor. Raises ValueError if the cursor was not produced by it."""
         try:
-            driver = self.connector.connect()
-            query = """
-            MATCH (p:Post)
-            WHERE elementId(p) = $post_id
-            MATCH (u:User {username: $username})
-            CREATE (p)-[:MENTIONS_USER]->(u)
-            RETURN p, u
-            """
-            result, summary, _ = driver.execute_query(query, {"post_id": post_id, "username": username})
-            success = summary.counters.relationships_created > 0
-            if success:
-                logger.info(f"<post> MENTIONS_USER relationship created: post -> {username}")
-            return success
-        except Exception as e:
-            logger.error(f"<post> Error creating MENTIONS_USER relationship: {e}")
-            raise e
-        finally:
-            if driver:
-                driver.close()
\ No newline at end of file
+            created_at, post_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except Exception:
+            raise ValueError("Invalid cursor")
+        if not isinstance(post_id, str):
+            raise ValueError("Invalid cursor")
+        # Cursors written before undated posts sorted as '' carry null
+        return created_at or "", post_id
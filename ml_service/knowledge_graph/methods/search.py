@@ -0,0 +1,43 @@
+import re
+
+from neo4j.exceptions import ClientError
+
+# Full-text index names; created by knowledge_graph.schema.ensure_schema()
+USER_SEARCH_INDEX = "user_username_fulltext"
+EVENT_SEARCH_INDEX = "event_event_name_fulltext"
+
+SEARCH_LIMIT = 50
+
+_LUCENE_SPECIAL = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def fulltext_query(text: str) -> str:
+    """
+    Build a Lucene query for search-as-you-type: every term must match, either
+    exactly (boosted) or as a prefix. Returns "" when there is nothing to search.
+
+    "john sm" -> '(john^2 OR john*) AND (sm^2 OR sm*)'
+    """
+    terms = [_LUCENE_SPECIAL.sub(r'\\\1', term) for term in text.lower().split()]
+    return " AND ".join(f"({term}^2 OR {term}*)" for term in terms)
+
+
+# Neo4j's message when db.index.fulltext.queryNodes names an index that does not exist
+_MISSING_INDEX_MESSAGE = "no such fulltext schema index"
+
+
+def is_missing_index_error(e: Exception, index: str = None) -> bool:
+    """
+    True if a full-text procedure call failed because the index does not exist (yet).
+
+    Other procedure failures (e.g. a query Lucene cannot parse) are not, so they
+    surface instead of silently falling back to an unindexed scan.
+
+    Args:
+        e: Exception raised by the procedure call.
+        index: Index name the call used; if given, the message must name it.
+    """
+    if not isinstance(e, ClientError) or e.code != "Neo.ClientError.Procedure.ProcedureCallFailed":
+        return False
+    message = (e.message or str(e)).lower()
+    return _MISSING_INDEX_MESSAGE in message and (index is None or index.lower() in message)
@@ -13,7 +13,6 @@ class Sport:
 
     def create_sport(self, sport_name: str):
         """Create a new sport in Neo4j database. Returns sport data."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -37,13 +36,9 @@ class Sport:
         except Exception as e:
             logger.error(f"<sport> Error adding sport to Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def get_sport(self, sport_name: str):
         """Get a sport by name. Returns sport data dict or None."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -68,13 +63,9 @@ class Sport:
         except Exception as e:
             logger.error(f"<sport> Error searching for sport in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def get_all_sports(self):
         """Get all sports. Returns list of sport dicts."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -94,13 +85,9 @@ class Sport:
         except Exception as e:
             logger.error(f"<sport> Error getting all sports from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def update_sport(self, old_sport_name: str, new_sport_name: str):
         """Update sport name in Neo4j. Returns updated sport data."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -126,13 +113,9 @@ class Sport:
         except Exception as e:
             logger.error(f"<sport> Error updating sport in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def delete_sport(self, sport_name: str):
         """Delete a sport from Neo4j. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -158,9 +141,6 @@ class Sport:
         except Exception as e:
             logger.error(f"<sport> Error deleting sport from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
 if __name__ == "__main__":
     queries = Sport()
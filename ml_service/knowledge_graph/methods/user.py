@@ -1,4 +1,11 @@
 from ..connector import Connector
+from ..timeline import HomeTimeline
+from ..degrees import FollowCounts
+# Absolute on purpose: rec_system reads the log as ml_service.knowledge_graph.profile_events, and a
+# relative import from the app's knowledge_graph package would be a second module with its own log
+from ml_service.knowledge_graph.profile_events import ProfileEvents
+from .batch import run_batch
+from .search import fulltext_query, is_missing_index_error, USER_SEARCH_INDEX, SEARCH_LIMIT
 from datetime import datetime
 import logging
 import os
@@ -15,10 +22,12 @@ logger = logging.getLogger(__name__)
 class User:
     def __init__(self):
         self.connector = Connector()
+        self.timeline = HomeTimeline()
+        self.follow_counts = FollowCounts()
+        self.profile_events = ProfileEvents()
 
     def user_signup(self, username: str, email: str, password: str):
         """Create a new user in Neo4j database. Returns user data."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -48,18 +57,15 @@ class User:
             if result:
                 user_data = dict(result[0]['u'])
                 logger.info(f"<user> User added to Neo4j DB: {user_data}")
+                self.profile_events.on_upsert([user_data])
                 return user_data
             return None
         except Exception as e:
             logger.error(f"<user> Error adding user to Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def user_login(self, username: str, password: str):
         """Find a user by username. Returns user data dict or None."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -86,15 +92,11 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error searching for user in Neo4j DB and checking password: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def update_user(self, username: str, age: int = None, city: str = None, 
                     state: str = None, favorite_sport: str = None, competitive_level: str = None, 
                     bio: str = None, email: str = None, phone_no: str = None):
         """Update user information in Neo4j. Returns updated user data."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -151,18 +153,15 @@ class User:
             if result:
                 user_data = dict(result[0]['u'])
                 logger.info(f"<user> User updated in Neo4j DB: {user_data}")
+                self.profile_events.on_upsert([user_data])
                 return user_data
             return None
         except Exception as e:
             logger.error(f"<user> Error updating user in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def delete_user(self, username: str):
         """Delete a user from Neo4j. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -180,19 +179,18 @@ class User:
             success = summary.counters.nodes_deleted > 0
             if success:
                 logger.info(f"<user> User deleted from Neo4j DB: {username}")
+                self.timeline.on_delete_user(username)
+                self.follow_counts.invalidate([username])
+                self.profile_events.on_delete([username])
             else:
                 logger.info(f"<user> User not found for deletion in Neo4j DB: {username}")
             return success
         except Exception as e:
             logger.error(f"<user> Error deleting user from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def add_friend(self, user_username: str, friend_username: str):
         """Add a friend relationship. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -218,13 +216,9 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error adding friend relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
     
     def add_follower(self, user_username: str, follower_username: str):
         """Add a follower relationship. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
             
@@ -245,17 +239,14 @@ class User:
             success = summary.counters.relationships_created > 0
             if success:
                 logger.info(f"<user> Follower relationship added in Neo4j DB: {user_username} -> {follower_username}")
+                self.follow_counts.invalidate([user_username, follower_username])
             return success
         except Exception as e:
             logger.error(f"<user> Error adding follower relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def remove_friend(self, user_username: str, friend_username: str):
         """Remove a friend relationship. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -281,13 +272,9 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error removing friend relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def get_friends(self, username: str):
         """Get all friends of a user. Returns list of friend usernames."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -307,13 +294,9 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error getting friends for user in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def get_all_users(self):
         """Get all users. Returns list of user dicts."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -333,15 +316,11 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error getting all users from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     # Get user follow requests route.
     def get_user_follow_requests(self, username: str):
         """Get all follow requests for a user (users who follow this user but this user doesn't follow back). 
         Returns list of follow request usernames."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -362,15 +341,11 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error getting follow requests for user in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
 
     # Get user followers route.
     def get_user_followers(self, username: str):
         """Get all followers of a user. Returns list of follower usernames."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -390,13 +365,9 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error getting followers for user in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
     
     def get_user_following(self, username: str):
         """Get all following of a user. Returns list of following usernames."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -416,39 +387,156 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error getting following for user in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
     
+    def get_follow_counts(self, username: str):
+        """Get follower and following counts of a user (count-only query, TTL cached).
+        Returns {"followers": int, "following": int}; 0/0 for unknown users."""
+        try:
+            followers, following = self.follow_counts.get(username)
+            return {"followers": followers, "following": following}
+        except Exception as e:
+            logger.error(f"<user> Error getting follow counts for user in Neo4j DB: {e}")
+            raise e
+
+    def get_follow_counts_batch(self, usernames: list):
+        """Get follower and following counts of several users in at most one query.
+        Returns {username: {"followers": int, "following": int}}."""
+        try:
+            counts = self.follow_counts.get_many(usernames)
+            return {
+                username: {"followers": followers, "following": following}
+                for username, (followers, following) in counts.items()
+            }
+        except Exception as e:
+            logger.error(f"<user> Error getting follow counts for users in Neo4j DB (batch): {e}")
+            raise e
+
     def get_number_of_followers(self, username: str):
         """Get the number of followers of a user. Returns the number of followers."""
-        driver = None
         try:
-            followers = self.get_user_followers(username=username)
-            return len(followers)
+            return self.follow_counts.get(username)[0]
         except Exception as e:
             logger.error(f"<user> Error getting number of followers for user in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
     
     def get_number_of_following(self, username: str):
         """Get the number of following of a user. Returns the number of following."""
-        driver = None
         try:
-            following = self.get_user_following(username=username)
-            return len(following)
+            return self.follow_counts.get(username)[1]
         except Exception as e:
             logger.error(f"<user> Error getting number of following for user in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
-    
+
+    def get_following_batch(self, usernames: list):
+        """Get who each of several users follows, in one query.
+        Returns {username: set of following usernames}; unknown users map to an empty set."""
+        try:
+            driver = self.connector.connect()
+
+            query = """
+            UNWIND $usernames AS username
+            OPTIONAL MATCH(u:User {username: username})-[:FOLLOWS]->(f:User)
+            RETURN username, collect(f.username) AS following
+            """
+            params = {"usernames": list(usernames)}
+
+            logger.info(f"<user> Getting following for {len(params['usernames'])} users in Neo4j DB")
+
+            result, summary, keys = driver.execute_query(query, params)
+
+            following = {username: set() for username in params["usernames"]}
+            for record in result:
+                following[record["username"]] = set(record["following"])
+            return following
+        except Exception as e:
+            logger.error(f"<user> Error getting following for users in Neo4j DB (batch): {e}")
+            raise e
+
+    def get_followers_batch(self, usernames: list):
+        """Get the followers of each of several users, in one query.
+        Returns {username: set of follower usernames}; unknown users map to an empty set."""
+        try:
+            driver = self.connector.connect()
+
+            query = """
+            UNWIND $usernames AS username
+            OPTIONAL MATCH(u:User {username: username})<-[:FOLLOWS]-(f:User)
+            RETURN username, collect(f.username) AS followers
+            """
+            params = {"usernames": list(usernames)}
+
+            logger.info(f"<user> Getting followers for {len(params['usernames'])} users in Neo4j DB")
+
+            result, summary, keys = driver.execute_query(query, params)
+
+            followers = {username: set() for username in params["usernames"]}
+            for record in result:
+                followers[record["username"]] = set(record["followers"])
+            return followers
+        except Exception as e:
+            logger.error(f"<user> Error getting followers for users in Neo4j DB (batch): {e}")
+            raise e
+
+    def get_friends_of_friends_batch(self, usernames: list, limit: int = 100):
+        """Get users followed by the people each user follows (not followed yet), in one query.
+        Returns {username: {candidate: number of mutual follows}}, at most limit candidates each."""
+        try:
+            driver = self.connector.connect()
+
+            query = """
+            UNWIND $usernames AS username
+            MATCH(u:User {username: username})-[:FOLLOWS]->(:User)-[:FOLLOWS]->(c:User)
+            WHERE c <> u AND NOT (u)-[:FOLLOWS]->(c)
+            WITH username, c.username AS candidate, count(*) AS mutual
+            ORDER BY mutual DESC
+            WITH username, collect([candidate, mutual])[..$limit] AS candidates
+            RETURN username, candidates
+            """
+            params = {"usernames": list(usernames), "limit": limit}
+
+            logger.info(f"<user> Getting friends of friends for {len(params['usernames'])} users in Neo4j DB")
+
+            result, summary, keys = driver.execute_query(query, params)
+
+            candidates = {username: {} for username in params["usernames"]}
+            for record in result:
+                candidates[record["username"]] = {candidate: mutual for candidate, mutual in record["candidates"]}
+            return candidates
+        except Exception as e:
+            logger.error(f"<user> Error getting friends of friends in Neo4j DB (batch): {e}")
+            raise e
+
+    def get_event_coattendees_batch(self, usernames: list, limit: int = 100):
+        """Get users who attended the same events as each user, in one query.
+        Returns {username: {candidate: number of shared events}}, at most limit candidates each."""
+        try:
+            driver = self.connector.connect()
+
+            query = """
+            UNWIND $usernames AS username
+            MATCH(u:User {username: username})-[:ATTENDING]->(e:Event)<-[:ATTENDING]-(c:User)
+            WHERE c <> u
+            WITH username, c.username AS candidate, count(DISTINCT e) AS shared
+            ORDER BY shared DESC
+            WITH username, collect([candidate, shared])[..$limit] AS candidates
+            RETURN username, candidates
+            """
+            params = {"usernames": list(usernames), "limit": limit}
+
+            logger.info(f"<user> Getting event co-attendees for {len(params['usernames'])} users in Neo4j DB")
+
+            result, summary, keys = driver.execute_query(query, params)
+
+            candidates = {username: {} for username in params["usernames"]}
+            for record in result:
+                candidates[record["username"]] = {candidate: shared for candidate, shared in record["candidates"]}
+            return candidates
+        except Exception as e:
+            logger.error(f"<user> Error getting event co-attendees in Neo4j DB (batch): {e}")
+            raise e
+
     def get_user(self, username: str):
         """Get a user by username. Returns user data dict or None."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -472,42 +560,50 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error getting user from Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def search_users(self, query: str):
-        """Search for users by username (case-insensitive partial match). Returns list of user dicts."""
-        driver = None
+        """Search for users by username (full-text, relevance ranked, prefix match). Returns list of user dicts."""
         try:
             driver = self.connector.connect()
 
+            search = fulltext_query(query)
+            if not search:
+                return []
+
             query_cypher = """
-            MATCH(u:User)
-            WHERE toLower(u.username) CONTAINS toLower($query)
+            CALL db.index.fulltext.queryNodes($index, $search, {limit: $limit}) YIELD node AS u, score
             RETURN u
-            ORDER BY u.username
-            LIMIT 50
+            ORDER BY score DESC, u.username
             """
-            params = {"query": query}
+            params = {"index": USER_SEARCH_INDEX, "search": search, "limit": SEARCH_LIMIT}
 
             logger.info(f"<user> Searching for users in Neo4j DB: {params}")
 
-            result, summary, keys = driver.execute_query(query_cypher, params)
-            
+            try:
+                result, summary, keys = driver.execute_query(query_cypher, params)
+            except Exception as e:
+                if not is_missing_index_error(e, USER_SEARCH_INDEX):
+                    raise e
+                # Index not created yet (NEO4J_ENSURE_SCHEMA off): fall back to a substring scan
+                logger.warning(f"<user> Full-text index {USER_SEARCH_INDEX} unavailable, scanning: {e}")
+                query_cypher = """
+                MATCH(u:User)
+                WHERE toLower(u.username) CONTAINS toLower($query)
+                RETURN u
+                ORDER BY u.username
+                LIMIT $limit
+                """
+                result, summary, keys = driver.execute_query(query_cypher, {"query": query, "limit": SEARCH_LIMIT})
+
             users = [dict(record['u']) for record in result]
             logger.info(f"<user> Found {len(users)} users matching query in Neo4j DB: {query}")
             return users
         except Exception as e:
             logger.error(f"<user> Error searching for users in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def follow_user(self, user_username: str, follow_username: str):
         """Create a FOLLOWS relationship between users. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -528,17 +624,15 @@ class User:
             success = summary.counters.relationships_created > 0
             if success:
                 logger.info(f"<user> FOLLOWS relationship added in Neo4j DB: {user_username} -> {follow_username}")
+                self.timeline.on_follow(user_username, follow_username)
+                self.follow_counts.invalidate([user_username, follow_username])
             return success
         except Exception as e:
             logger.error(f"<user> Error adding FOLLOWS relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def unfollow_user(self, user_username: str, unfollow_username: str):
         """Delete a FOLLOWS relationship between users. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -558,19 +652,17 @@ class User:
             success = summary.counters.relationships_deleted > 0
             if success:
                 logger.info(f"<user> FOLLOWS relationship removed from Neo4j DB: {user_username} -X-> {unfollow_username}")
+                self.timeline.on_unfollow(user_username, unfollow_username)
+                self.follow_counts.invalidate([user_username, unfollow_username])
             else:
                 logger.info(f"<user> FOLLOWS relationship not found in Neo4j DB: {user_username} -> {unfollow_username}")
             return success
         except Exception as e:
             logger.error(f"<user> Error removing FOLLOWS relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def play_sport(self, username: str, sport_name: str, skill_level: str, years_experience: int):
         """Create a PLAYS relationship between user and sport. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -602,13 +694,9 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error adding PLAYS relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def interested_in_sport(self, username: str, sport_name: str):
         """Create an INTERESTED_IN relationship between user and sport. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -633,13 +721,9 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error adding INTERESTED_IN relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def organize_event(self, username: str, event_name: str):
         """Create an ORGANIZES relationship between user and event. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -664,13 +748,9 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error adding ORGANIZES relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def attend_event(self, username: str, event_name: str, status: str):
         """Create an ATTENDING relationship between user and event. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -696,13 +776,9 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error adding ATTENDING relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def invite_to_event(self, username: str, event_name: str, invited_by: str, status: str = "pending"):
         """Create an INVITED_TO relationship between user and event. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -732,13 +808,9 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error adding INVITED_TO relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
 
     def favorite_field(self, username: str, field_name: str):
         """Create a FAVORITED relationship between user and field. Returns True if successful."""
-        driver = None
         try:
             driver = self.connector.connect()
 
@@ -763,9 +835,106 @@ class User:
         except Exception as e:
             logger.error(f"<user> Error adding FAVORITED relationship in Neo4j DB: {e}")
             raise e
-        finally:
-            if driver:
-                driver.close()
+
+    def follow_users_batch(self, pairs: list):
+        """Create FOLLOWS relationships for many (username, follow_username) pairs.
+        pairs: list of {username, follow_username}. Returns per-item status list."""
+        try:
+            driver = self.connector.connect()
+
+            query = """
+            UNWIND $rows AS row
+            OPTIONAL MATCH(a:User {username: row.username})
+            OPTIONAL MATCH(b:User {username: row.follow_username})
+            WITH row, a, b, (a IS NOT NULL AND b IS NOT NULL) AS ok
+            FOREACH (_ IN CASE WHEN ok THEN [1] ELSE [] END | CREATE(a)-[:FOLLOWS]->(b))
+            RETURN row.idx AS idx, ok AS success,
+                CASE WHEN a IS NULL THEN 'User not found: ' + row.username
+                     WHEN b IS NULL THEN 'User not found: ' + row.follow_username END AS error
+            """
+            rows = [
+                {"username": p["username"], "follow_username": p["follow_username"]}
+                for p in pairs
+            ]
+
+            logger.info(f"<user> Adding {len(rows)} FOLLOWS relationships in Neo4j DB (batch)")
+
+            results = run_batch(driver, query, rows)
+            # Rebuild affected timelines on next read rather than backfilling one pair at a time
+            self.timeline.invalidate({rows[r["index"]]["username"] for r in results if r["success"]})
+            self.follow_counts.invalidate(
+                {rows[r["index"]][key] for r in results if r["success"] for key in ("username", "follow_username")}
+            )
+            return results
+        except Exception as e:
+            logger.error(f"<user> Error adding FOLLOWS relationships in Neo4j DB (batch): {e}")
+            raise e
+
+    def play_sports_batch(self, items: list):
+        """Create PLAYS relationships for many users/sports.
+        items: list of {username, sport_name, skill_level, years_experience}. Returns per-item status list."""
+        try:
+            driver = self.connector.connect()
+
+            query = """
+            UNWIND $rows AS row
+            OPTIONAL MATCH(u:User {username: row.username})
+            OPTIONAL MATCH(s:Sport {sport_name: row.sport_name})
+            WITH row, u, s, (u IS NOT NULL AND s IS NOT NULL) AS ok
+            FOREACH (_ IN CASE WHEN ok THEN [1] ELSE [] END |
+                CREATE(u)-[:PLAYS {
+                    skill_level: row.skill_level,
+                    years_experience: row.years_experience,
+                    added_at: row.added_at
+                }]->(s)
+            )
+            RETURN row.idx AS idx, ok AS success,
+                CASE WHEN u IS NULL THEN 'User not found: ' + row.username
+                     WHEN s IS NULL THEN 'Sport not found: ' + row.sport_name END AS error
+            """
+            added_at = datetime.now().isoformat()
+            rows = [
+                {
+                    "username": i["username"],
+                    "sport_name": i["sport_name"],
+                    "skill_level": i["skill_level"],
+                    "years_experience": i["years_experience"],
+                    "added_at": added_at
+                }
+                for i in items
+            ]
+
+            logger.info(f"<user> Adding {len(rows)} PLAYS relationships in Neo4j DB (batch)")
+
+            return run_batch(driver, query, rows)
+        except Exception as e:
+            logger.error(f"<user> Error adding PLAYS relationships in Neo4j DB (batch): {e}")
+            raise e
+
+    def interested_in_sports_batch(self, pairs: list):
+        """Create INTERESTED_IN relationships for many (username, sport_name) pairs.
+        pairs: list of {username, sport_name}. Returns per-item status list."""
+        try:
+            driver = self.connector.connect()
+
+            query = """
+            UNWIND $rows AS row
+            OPTIONAL MATCH(u:User {username: row.username})
+            OPTIONAL MATCH(s:Sport {sport_name: row.sport_name})
+            WITH row, u, s, (u IS NOT NULL AND s IS NOT NULL) AS ok
+            FOREACH (_ IN CASE WHEN ok THEN [1] ELSE [] END | CREATE(u)-[:INTERESTED_IN]->(s))
+            RETURN row.idx AS idx, ok AS success,
+                CASE WHEN u IS NULL THEN 'User not found: ' + row.username
+                     WHEN s IS NULL THEN 'Sport not found: ' + row.sport_name END AS error
+            """
+            rows = [{"username": p["username"], "sport_name": p["sport_name"]} for p in pairs]
+
+            logger.info(f"<user> Adding {len(rows)} INTERESTED_IN relationships in Neo4j DB (batch)")
+
+            return run_batch(driver, query, rows)
+        except Exception as e:
+            logger.error(f"<user> Error adding INTERESTED_IN relationships in Neo4j DB (batch): {e}")
+            raise e
     
     @staticmethod
     def get_location_coordinates(city: str, state: str) -> tuple[float | None, float | None]:
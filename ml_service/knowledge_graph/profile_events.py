@@ -0,0 +1,240 @@
+"""
+Profile change events for incremental content-based (CB) updates.
+
+User.user_signup / update_user / delete_user append an event once the graph
+write has committed. CB recommenders read the events past the last sequence
+number they applied and upsert (or tombstone) rows of their feature store, so
+a new or edited profile is recommendable without a full CB retrain.
+
+An event is (seq, op, username, profile). op is "upsert" or "delete", and
+profile holds the attributes the CB features use (PROFILE_FIELDS, see profile_of).
+Events are idempotent and applied in order. A CB model records the log's last
+seq when it was trained (current_seq) and a reloaded model replays only the
+events after it.
+
+Logs:
+    PROFILE_EVENTS=memory  (default) per-process list; use with a single worker
+    PROFILE_EVENTS=disk    SQLite file at PROFILE_EVENTS_PATH, shared by workers on one host
+    PROFILE_EVENTS=off     no events; profile changes reach CB at the next retrain
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ENV_PROFILE_EVENTS = "PROFILE_EVENTS"
+ENV_PROFILE_EVENTS_PATH = "PROFILE_EVENTS_PATH"
+ENV_PROFILE_EVENTS_MAX = "PROFILE_EVENTS_MAX"
+
+_DEFAULT_EVENTS_PATH = Path(__file__).resolve().parent.parent / "data" / "profile_events.sqlite3"
+_DEFAULT_MAX_EVENTS = 100000
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# User node properties the CB features are built from
+PROFILE_FIELDS = ("age", "favorite_sport", "competitive_level", "latitude", "longitude")
+
+# RETURN items projecting a User node `u` onto its CB profile, shared by CB training and the
+# cold-user fetch so every row is keyed and featurized alike. Seed users store `sport`;
+# update_user writes `favorite_sport`.
+PROFILE_PROJECTION = """
+    u.username AS username,
+    u.age AS age,
+    coalesce(u.favorite_sport, u.sport) AS favorite_sport,
+    u.competitive_level AS competitive_level,
+    u.latitude AS latitude,
+    u.longitude AS longitude"""
+
+# (seq, op, username, profile)
+Event = Tuple[int, str, str, dict]
+
+
+def _int_env(key: str, default: int) -> int:
+    """Parse int from env var with fallback."""
+    raw = os.getenv(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning(f"<profile_events> Invalid value for {key}='{raw}', using default {default}")
+        return default
+
+
+def profile_of(user) -> dict:
+    """CB profile of a User node's properties or a PROFILE_PROJECTION record (PROFILE_FIELDS plus username)."""
+    profile = {"username": user.get("username")}
+    profile.update({field: user.get(field) for field in PROFILE_FIELDS})
+    if profile["favorite_sport"] is None:
+        profile["favorite_sport"] = user.get("sport")
+    return profile
+
+
+class MemoryProfileEventLog:
+    """In-process event list, trimmed to the newest max_events."""
+
+    def __init__(self, max_events: int = _DEFAULT_MAX_EVENTS):
+        self.max_events = max_events
+        self._events: List[Event] = []
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def append(self, events: Iterable[Tuple[str, str, dict]]) -> int:
+        with self._lock:
+            for op, username, profile in events:
+                self._seq += 1
+                self._events.append((self._seq, op, username, profile))
+            # Trim in amortized batches rather than on every append
+            if len(self._events) > self.max_events + max(1, self.max_events // 4):
+                del self._events[:len(self._events) - self.max_events]
+            return self._seq
+
+    def last_seq(self) -> int:
+        with self._lock:
+            return self._seq
+
+    def read(self, after_seq: int, limit: int = 10000) -> List[Event]:
+        """Events with seq > after_seq, oldest first."""
+        with self._lock:
+            if not self._events or self._events[-1][0] <= after_seq:
+                return []
+            start = max(0, after_seq - self._events[0][0] + 1)
+            return self._events[start:start + limit]
+
+
+class SqliteProfileEventLog:
+    """Events in a local SQLite file (WAL), so every worker process sees every profile change."""
+
+    def __init__(self, path, max_events: int = _DEFAULT_MAX_EVENTS):
+        self.max_events = max_events
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._appended = 0
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS profile_events (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "op TEXT NOT NULL, username TEXT NOT NULL, profile TEXT NOT NULL, created_at TEXT NOT NULL)"
+            )
+
+    def append(self, events: Iterable[Tuple[str, str, dict]]) -> int:
+        now = datetime.now().isoformat()
+        rows = [(op, username, json.dumps(profile), now) for op, username, profile in events]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO profile_events (op, username, profile, created_at) VALUES (?, ?, ?, ?)", rows
+            )
+            seq = self._db.execute("SELECT MAX(seq) FROM profile_events").fetchone()[0] or 0
+            self._appended += len(rows)
+            if self._appended > max(1, self.max_events // 4):
+                self._db.execute("DELETE FROM profile_events WHERE seq <= ?", (seq - self.max_events,))
+                self._appended = 0
+            return seq
+
+    def last_seq(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT MAX(seq) FROM profile_events").fetchone()[0] or 0
+
+    def read(self, after_seq: int, limit: int = 10000) -> List[Event]:
+        """Events with seq > after_seq, oldest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, op, username, profile FROM profile_events WHERE seq > ? ORDER BY seq LIMIT ?",
+                (after_seq, limit),
+            ).fetchall()
+        return [(seq, op, username, json.loads(profile)) for seq, op, username, profile in rows]
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_log():
+    """Process-wide event log selected by PROFILE_EVENTS, or None when disabled."""
+    global _log
+    kind = os.getenv(ENV_PROFILE_EVENTS, "memory").strip().lower()
+    if kind in ("off", "none", "0", "false"):
+        return None
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                max_events = _int_env(ENV_PROFILE_EVENTS_MAX, _DEFAULT_MAX_EVENTS)
+                if kind == "disk":
+                    path = os.getenv(ENV_PROFILE_EVENTS_PATH) or _DEFAULT_EVENTS_PATH
+                    _log = SqliteProfileEventLog(path, max_events=max_events)
+                    logger.info(f"<profile_events> Using SQLite profile event log at {path}")
+                else:
+                    if kind not in ("", "memory"):
+                        logger.warning(f"<profile_events> Unknown {ENV_PROFILE_EVENTS}='{kind}', using memory")
+                    _log = MemoryProfileEventLog(max_events=max_events)
+                    logger.info("<profile_events> Using in-process profile event log")
+    return _log
+
+
+class ProfileEvents:
+    """Emits profile change events from User writes.
+
+    The hooks run after the graph write has committed, so they log failures
+    instead of raising; a missed event is picked up by the next CB retrain.
+    """
+
+    @property
+    def log(self):
+        return get_log()
+
+    @property
+    def enabled(self) -> bool:
+        return self.log is not None
+
+    def on_upsert(self, users: Iterable[dict]):
+        """Record the current profile of created or updated users (dicts of User node properties)."""
+        log = self.log
+        if log is None:
+            return
+        try:
+            events = [
+                (UPSERT, user["username"], profile_of(user))
+                for user in users if user and user.get("username")
+            ]
+            if events:
+                log.append(events)
+        except Exception as e:
+            logger.error(f"<profile_events> Error recording profile change: {e}")
+
+    def on_delete(self, usernames: Iterable[str]):
+        """Record that users were deleted (their CB rows are tombstoned)."""
+        log = self.log
+        if log is None:
+            return
+        try:
+            log.append([(DELETE, username, {}) for username in usernames])
+        except Exception as e:
+            logger.error(f"<profile_events> Error recording profile deletion: {e}")
+
+
+def read_events(after_seq: int, limit: int = 10000, log=None) -> Optional[List[Event]]:
+    """Events past after_seq from the configured log, or None when events are disabled."""
+    log = log or get_log()
+    if log is None:
+        return None
+    return log.read(after_seq, limit)
+
+
+def current_seq(log=None) -> int:
+    """Seq of the newest event in the configured log (0 when events are disabled)."""
+    log = log or get_log()
+    return log.last_seq() if log is not None else 0
@@ -1 +1 @@
-__all__ = ["UserRoutes", "SportRoutes", "FieldRoutes", "EventRoutes", "PostRoutes", "RagRoutes"]
\ No newline at end of file
+__all__ = ["UserRoutes", "SportRoutes", "FieldRoutes", "EventRoutes", "PostRoutes", "RagRoutes", "RecommendationRoutes"]
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Async handlers for the blueprint routes, served by ml_service_asgi.
+
+Handlers are keyed by Flask endpoint name ("<blueprint>.<view>") so the ASGI app
+can match URLs with the Flask url_map and the routes stay identical to the WSGI app.
+Validation and responses come from the same knowledge_graph.routes.handlers the
+Flask views use; only the services differ (knowledge_graph.aio instead of
+knowledge_graph.methods). Each handler returns (payload, status). Endpoints
+without an async handler here (e.g. the RAG, recommendation and batch routes)
+are served by the Flask app through the WSGI fallback.
+"""
+
+import json
+import logging
+
+from knowledge_graph.aio import AsyncUser, AsyncSport, AsyncField, AsyncEvent, AsyncPost
+from knowledge_graph.routes import handlers
+from knowledge_graph.routes.handlers import run_async
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'
+)
+logger = logging.getLogger(__name__)
+
+user_service = AsyncUser()
+sport_service = AsyncSport()
+field_service = AsyncField()
+event_service = AsyncEvent()
+post_service = AsyncPost()
+
+# Flask endpoint name -> async handler
+async_routes = {}
+
+
+class AsyncRequest:
+    """Minimal request object passed to async handlers (JSON body + query args)."""
+
+    def __init__(self, body: bytes, args: dict):
+        self.body = body
+        self.args = args
+
+    def get_json(self):
+        """Parse the body as JSON. Returns None if the body is empty or not valid JSON."""
+        if not self.body:
+            return None
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return None
+
+
+def async_route(endpoint: str, fn, service):
+    """Serve a Flask endpoint name with a shared handler run against an async service."""
+    async def route(request, **view_args):
+        return await run_async(fn, service, request.get_json(), request.args, **view_args)
+    route.__name__ = fn.__name__
+    route.__doc__ = fn.__doc__
+    async_routes[endpoint] = route
+    return route
+
+
+# Utility routes.
+async_route('health_check', handlers.health_check, None)
+async_route('index', handlers.index, None)
+
+# User routes.
+async_route('users.signup_user', handlers.signup_user, user_service)
+async_route('users.login_user', handlers.login_user, user_service)
+async_route('users.update_user', handlers.update_user, user_service)
+async_route('update_user', handlers.update_user_profile, user_service)
+async_route('users.delete_user', handlers.delete_user, user_service)
+async_route('users.search_users', handlers.search_users, user_service)
+async_route('users.follow_user', handlers.follow_user, user_service)
+async_route('users.unfollow_user', handlers.unfollow_user, user_service)
+async_route('users.get_user_follow_requests', handlers.get_user_follow_requests, user_service)
+async_route('users.get_user_followers', handlers.get_user_followers, user_service)
+async_route('users.get_user_following', handlers.get_user_following, user_service)
+async_route('users.get_user_follow_counts', handlers.get_user_follow_counts, user_service)
+async_route('users.play_sport', handlers.play_sport, user_service)
+async_route('users.interested_in_sport', handlers.interested_in_sport, user_service)
+async_route('users.organize_event', handlers.organize_event, user_service)
+async_route('users.attend_event', handlers.attend_event, user_service)
+async_route('users.invite_to_event', handlers.invite_to_event, user_service)
+async_route('users.favorite_field', handlers.favorite_field, user_service)
+async_route('get_user_friends', handlers.get_user_friends, user_service)
+async_route('get_user', handlers.get_user, user_service)
+
+# Sport routes.
+async_route('sports.create_sport', handlers.create_sport, sport_service)
+async_route('sports.get_sport', handlers.get_sport, sport_service)
+async_route('sports.get_all_sports', handlers.get_all_sports, sport_service)
+async_route('sports.update_sport', handlers.update_sport, sport_service)
+async_route('sports.delete_sport', handlers.delete_sport, sport_service)
+
+# Field routes.
+async_route('fields.create_field', handlers.create_field, field_service)
+async_route('fields.get_field', handlers.get_field, field_service)
+async_route('fields.get_field_by_address', handlers.get_field_by_address, field_service)
+async_route('fields.get_all_fields', handlers.get_all_fields, field_service)
+async_route('fields.update_field', handlers.update_field, field_service)
+async_route('fields.delete_field', handlers.delete_field, field_service)
+async_route('fields.supports_sport', handlers.supports_sport, field_service)
+
+# Event routes.
+async_route('events.create_event', handlers.create_event, event_service)
+async_route('events.get_event', handlers.get_event, event_service)
+async_route('events.search_events', handlers.search_events, event_service)
+async_route('events.update_event', handlers.update_event, event_service)
+async_route('events.delete_event', handlers.delete_event, event_service)
+async_route('events.hosted_at_field', handlers.hosted_at_field, event_service)
+async_route('events.for_sport', handlers.for_sport, event_service)
+async_route('events.list_joined_by_user', handlers.list_joined_by_user, event_service)
+async_route('events.list_hosted_by_user', handlers.list_hosted_by_user, event_service)
+async_route('events.list_attendees', handlers.list_attendees, event_service)
+async_route('events.joined_by_user', handlers.joined_by_user, event_service)
+async_route('events.left_by_user', handlers.left_by_user, event_service)
+
+# Post routes.
+async_route('posts.create_post', handlers.create_post, post_service)
+async_route('posts.delete_post', handlers.delete_post, post_service)
+async_route('posts.update_post', handlers.update_post, post_service)
+async_route('posts.get_post', handlers.get_post, post_service)
+async_route('posts.get_user_posts', handlers.get_user_posts, post_service)
+async_route('posts.get_tagged_posts', handlers.get_tagged_posts, post_service)
+async_route('posts.get_friends_posts', handlers.get_friends_posts, post_service)
+async_route('posts.like_post', handlers.like_post, post_service)
+async_route('posts.unlike_post', handlers.unlike_post, post_service)
+async_route('posts.get_post_comments', handlers.get_post_comments, post_service)
+async_route('posts.comment_on_post', handlers.comment_on_post, post_service)
@@ -0,0 +1,1114 @@
+"""
+Request handling shared by the Flask blueprints and the ASGI app (async_routes).
+
+Each handler validates one request and builds its (payload, status) response.
+Handlers are generators: every service call is written as
+``result = yield service.method(...)``. The Flask layer (respond) runs them
+against the sync services in knowledge_graph.methods, where the call has
+already returned by the time it is yielded. The ASGI layer (run_async) runs
+them against the async services in knowledge_graph.aio, awaiting the yielded
+coroutine and sending back its result (or throwing its exception in). Both
+layers therefore validate and answer every route identically.
+
+Handler signature: handler(service, body, args, **view_args), where body is
+the parsed JSON body (None if missing or invalid) and args the query args.
+"""
+
+import inspect
+import logging
+
+from flask import jsonify, request
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'
+)
+logger = logging.getLogger(__name__)
+
+VALID_SKILL_LEVELS = ["Beginner", "Intermediate", "Advanced", "Competitive"]
+VALID_ATTEND_STATUSES = ["confirmed", "maybe", "declined"]
+VALID_INVITE_STATUSES = ["pending", "accepted", "declined"]
+
+
+def handler(action: str):
+    """Mark a function as a route handler; action names it in the error log ("Error <action>: ...")."""
+    def decorator(fn):
+        fn.action = action
+        return fn
+    return decorator
+
+
+def _error(message: str, status: int = 400):
+    return {"error": message}, status
+
+
+def _require(body, fields, message: str = None):
+    """
+    Validate that body is a JSON object with every required field.
+
+    Args:
+        body: Parsed JSON body.
+        fields: Required field names.
+        message: Error for a missing body or field; default names the missing field.
+
+    Returns:
+        (payload, 400) on failure, None if valid.
+    """
+    if not isinstance(body, dict):
+        return _error(message or "Request body must be JSON")
+    for field in fields:
+        if field not in body:
+            return _error(message or f"Missing required field: {field}")
+    return None
+
+
+def _require_items(body, fields):
+    """Validate a batch body {"items": [{...}, ...]}. Returns (payload, 400) on failure, None if valid."""
+    items = body.get('items') if isinstance(body, dict) else None
+    if not isinstance(items, list) or not items:
+        return _error("Missing required field: items (non-empty list)")
+    for i, item in enumerate(items):
+        for field in fields:
+            if not isinstance(item, dict) or field not in item:
+                return _error(f"Missing required field: {field} (item {i})")
+    return None
+
+
+def _batch_response(results):
+    succeeded = sum(1 for r in results if r['success'])
+    return {
+        "message": "Batch processed",
+        "results": results,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded
+    }, 200
+
+
+def _server_error(fn, e: Exception):
+    logger.error(f"<routes> Error {getattr(fn, 'action', fn.__name__)}: {str(e)}")
+    return _error(str(e), 500)
+
+
+def run(fn, service, body, args, **view_args):
+    """Run a handler against sync services. Returns (payload, status)."""
+    try:
+        steps = fn(service, body, args, **view_args)
+        if not inspect.isgenerator(steps):
+            return steps
+        try:
+            result = next(steps)
+            while True:
+                result = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+    except Exception as e:
+        return _server_error(fn, e)
+
+
+async def run_async(fn, service, body, args, **view_args):
+    """Run a handler against async services, awaiting each yielded call. Returns (payload, status)."""
+    try:
+        steps = fn(service, body, args, **view_args)
+        if not inspect.isgenerator(steps):
+            return steps
+        try:
+            call = next(steps)
+            while True:
+                try:
+                    result = await call
+                except Exception as e:
+                    call = steps.throw(e)
+                else:
+                    call = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+    except Exception as e:
+        return _server_error(fn, e)
+
+
+def respond(fn, service, **view_args):
+    """Run a handler for the current Flask request. Returns a Flask (response, status) tuple."""
+    payload, status = run(fn, service, request.get_json(force=True, silent=True), request.args, **view_args)
+    return jsonify(payload), status
+
+
+# Utility routes.
+@handler("getting health")
+def health_check(service, body, args):
+    """Health check endpoint"""
+    return {"status": "healthy", "service": "ml_service"}, 200
+
+
+@handler("getting API index")
+def index(service, body, args):
+    """API root endpoint"""
+    return {
+        "message": "JuegaLink ML Service API",
+        "endpoints": {
+            "users": "/users/*",
+            "sports": "/sports/*",
+            "events": "/events/*",
+            "fields": "/fields/*",
+            "recommendations": "/recommendations/*",
+            "health": "/health"
+        }
+    }, 200
+
+
+# User routes.
+@handler("creating user")
+def signup_user(service, body, args):
+    """Create a new user"""
+    invalid = _require(body, ['username', 'email', 'password'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating user: {body['username']}")
+    user = yield service.user_signup(
+        username=body['username'],
+        email=body['email'],
+        password=body['password']
+    )
+    logger.info(f"<routes> User created: {user}")
+    return {
+        "message": "User created successfully",
+        "user": {
+            "username": user['username'],
+            "email": user['email']
+        }
+    }, 201
+
+
+@handler("logging in user")
+def login_user(service, body, args):
+    """Login a user"""
+    invalid = _require(body, ['username', 'password'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Logging in user: {body['username']}")
+    user = yield service.user_login(
+        username=body['username'],
+        password=body['password']
+    )
+    if user:
+        return {"message": "User logged in successfully", "user": user}, 200
+    logger.info(f"<routes> Login failed for user: {body['username']}")
+    return _error("Invalid username or password", 401)
+
+
+@handler("updating user")
+def update_user(service, body, args):
+    """Update user information (PUT /users/update)"""
+    invalid = _require(body, ['username'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Updating user: {body['username']}")
+    user = yield service.update_user(
+        username=body['username'],
+        age=body.get('age'),
+        city=body.get('city'),
+        state=body.get('state'),
+        favorite_sport=body.get('favorite_sport'),
+        competitive_level=body.get('competitive_level'),
+        bio=body.get('bio'),
+        email=body.get('email'),
+        phone_no=body.get('phone_no')
+    )
+    if user:
+        logger.info(f"<routes> User updated: {user}")
+        return {"message": "User updated successfully", "user": user}, 200
+    return _error("User not found or no updates provided", 404)
+
+
+@handler("updating user profile")
+def update_user_profile(service, body, args):
+    """Update user profile (PATCH /users/update); contact and location fields only"""
+    invalid = _require(body, ['username'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Updating user profile: {body['username']}")
+    user = yield service.update_user(
+        username=body['username'],
+        age=body.get('age'),
+        city=body.get('city'),
+        state=body.get('state'),
+        bio=body.get('bio'),
+        email=body.get('email'),
+        phone_no=body.get('phone_no')
+    )
+    if user:
+        logger.info(f"<routes> User updated: {user}")
+        return {"message": "User updated successfully", "user": user}, 200
+    return _error("No fields to update or user not found")
+
+
+@handler("deleting user")
+def delete_user(service, body, args):
+    """Delete a user"""
+    invalid = _require(body, ['username'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Deleting user: {body['username']}")
+    success = yield service.delete_user(username=body['username'])
+    if success:
+        return {"message": "User deleted successfully"}, 200
+    return _error("User not found", 404)
+
+
+@handler("getting user")
+def get_user(service, body, args, username):
+    """Get a user by username"""
+    user = yield service.get_user(username)
+    if user:
+        return {"user": user}, 200
+    return _error("User not found", 404)
+
+
+@handler("getting friends")
+def get_user_friends(service, body, args, username):
+    """Get friends count for a user"""
+    friends = yield service.get_friends(username)
+    return {"friends": friends, "count": len(friends)}, 200
+
+
+@handler("searching users")
+def search_users(service, body, args):
+    """Search for users by username"""
+    query = args.get('q', '')
+    if not query:
+        return {"users": [], "count": 0}, 200
+    users = yield service.search_users(query)
+    return {"users": users, "count": len(users)}, 200
+
+
+@handler("creating follow relationship")
+def follow_user(service, body, args):
+    """Create a FOLLOWS relationship between users"""
+    invalid = _require(body, ['username', 'follow_username'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating FOLLOWS relationship: {body['username']} -> {body['follow_username']}")
+    success = yield service.follow_user(
+        user_username=body['username'],
+        follow_username=body['follow_username']
+    )
+    if success:
+        return {"message": "User follow relationship created successfully"}, 201
+    return _error("Failed to create follow relationship")
+
+
+@handler("creating FOLLOWS relationships (batch)")
+def follow_users_batch(service, body, args):
+    """Create FOLLOWS relationships for many user pairs in chunked transactions"""
+    invalid = _require_items(body, ['username', 'follow_username'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating {len(body['items'])} FOLLOWS relationships (batch)")
+    results = yield service.follow_users_batch(body['items'])
+    return _batch_response(results)
+
+
+@handler("deleting follow relationship")
+def unfollow_user(service, body, args):
+    """Delete a FOLLOWS relationship between users"""
+    invalid = _require(body, ['username', 'unfollow_username'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Deleting FOLLOWS relationship: {body['username']} -> {body['unfollow_username']}")
+    success = yield service.unfollow_user(
+        user_username=body['username'],
+        unfollow_username=body['unfollow_username']
+    )
+    if success:
+        return {"message": "User unfollow relationship deleted successfully"}, 200
+    return _error("Failed to delete follow relationship. Relationship may not exist.")
+
+
+@handler("getting user follow requests")
+def get_user_follow_requests(service, body, args):
+    """Get all follow requests for a user"""
+    username = args.get('username')
+    if not username:
+        return _error("Missing required field: username")
+    follow_requests = yield service.get_user_follow_requests(username=username)
+    return {
+        "message": "User follow requests retrieved successfully",
+        "follow_requests": follow_requests or []
+    }, 200
+
+
+@handler("getting user followers")
+def get_user_followers(service, body, args):
+    """Get all followers of a user"""
+    username = args.get('username')
+    if not username:
+        return _error("Missing required field: username")
+    followers = yield service.get_user_followers(username=username)
+    return {
+        "message": "User followers retrieved successfully",
+        "followers": followers or []
+    }, 200
+
+
+@handler("getting user following")
+def get_user_following(service, body, args):
+    """Get all following of a user"""
+    username = args.get('username')
+    if not username:
+        return _error("Missing required field: username")
+    following = yield service.get_user_following(username=username)
+    return {
+        "message": "User following retrieved successfully",
+        "following": following or []
+    }, 200
+
+
+@handler("getting user follow counts")
+def get_user_follow_counts(service, body, args):
+    """Get follower and following counts of a user (without fetching the lists)"""
+    username = args.get('username')
+    if not username:
+        return _error("Missing required field: username")
+    counts = yield service.get_follow_counts(username=username)
+    return {
+        "message": "User follow counts retrieved successfully",
+        "followers": counts["followers"],
+        "following": counts["following"]
+    }, 200
+
+
+@handler("creating play sport relationship")
+def play_sport(service, body, args):
+    """Create a PLAYS relationship between user and sport"""
+    invalid = _require(body, ['username', 'sport_name', 'skill_level', 'years_experience'])
+    if invalid:
+        return invalid
+    if body['skill_level'] not in VALID_SKILL_LEVELS:
+        return _error(f"Invalid skill_level. Must be one of: {', '.join(VALID_SKILL_LEVELS)}")
+
+    logger.info(f"<routes> Creating PLAYS relationship: {body['username']} -> {body['sport_name']}")
+    success = yield service.play_sport(
+        username=body['username'],
+        sport_name=body['sport_name'],
+        skill_level=body['skill_level'],
+        years_experience=body['years_experience']
+    )
+    if success:
+        return {"message": "User play sport relationship created successfully"}, 201
+    return _error("Failed to create play sport relationship")
+
+
+@handler("creating PLAYS relationships (batch)")
+def play_sports_batch(service, body, args):
+    """Create PLAYS relationships for many user/sport pairs in chunked transactions"""
+    invalid = _require_items(body, ['username', 'sport_name', 'skill_level', 'years_experience'])
+    if invalid:
+        return invalid
+    for i, item in enumerate(body['items']):
+        if item['skill_level'] not in VALID_SKILL_LEVELS:
+            return _error(f"Invalid skill_level (item {i}). Must be one of: {', '.join(VALID_SKILL_LEVELS)}")
+
+    logger.info(f"<routes> Creating {len(body['items'])} PLAYS relationships (batch)")
+    results = yield service.play_sports_batch(body['items'])
+    return _batch_response(results)
+
+
+@handler("creating interested in sport relationship")
+def interested_in_sport(service, body, args):
+    """Create an INTERESTED_IN relationship between user and sport"""
+    invalid = _require(body, ['username', 'sport_name'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating INTERESTED_IN relationship: {body['username']} -> {body['sport_name']}")
+    success = yield service.interested_in_sport(
+        username=body['username'],
+        sport_name=body['sport_name']
+    )
+    if success:
+        return {"message": "User interested in sport relationship created successfully"}, 201
+    return _error("Failed to create interested in sport relationship")
+
+
+@handler("creating INTERESTED_IN relationships (batch)")
+def interested_in_sports_batch(service, body, args):
+    """Create INTERESTED_IN relationships for many user/sport pairs in chunked transactions"""
+    invalid = _require_items(body, ['username', 'sport_name'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating {len(body['items'])} INTERESTED_IN relationships (batch)")
+    results = yield service.interested_in_sports_batch(body['items'])
+    return _batch_response(results)
+
+
+@handler("creating organize event relationship")
+def organize_event(service, body, args):
+    """Create an ORGANIZES relationship between user and event"""
+    invalid = _require(body, ['username', 'event_name'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating ORGANIZES relationship: {body['username']} -> {body['event_name']}")
+    success = yield service.organize_event(
+        username=body['username'],
+        event_name=body['event_name']
+    )
+    if success:
+        return {"message": "User organize event relationship created successfully"}, 201
+    return _error("Failed to create organize event relationship")
+
+
+@handler("creating attend event relationship")
+def attend_event(service, body, args):
+    """Create an ATTENDING relationship between user and event"""
+    invalid = _require(body, ['username', 'event_name', 'status'])
+    if invalid:
+        return invalid
+    if body['status'] not in VALID_ATTEND_STATUSES:
+        return _error(f"Invalid status. Must be one of: {', '.join(VALID_ATTEND_STATUSES)}")
+
+    logger.info(f"<routes> Creating ATTENDING relationship: {body['username']} -> {body['event_name']}")
+    success = yield service.attend_event(
+        username=body['username'],
+        event_name=body['event_name'],
+        status=body['status']
+    )
+    if success:
+        return {"message": "User attend event relationship created successfully"}, 201
+    return _error("Failed to create attend event relationship")
+
+
+@handler("creating invite to event relationship")
+def invite_to_event(service, body, args):
+    """Create an INVITED_TO relationship between user and event"""
+    invalid = _require(body, ['username', 'event_name', 'invited_by'])
+    if invalid:
+        return invalid
+    status = body.get('status', 'pending')
+    if status not in VALID_INVITE_STATUSES:
+        return _error(f"Invalid status. Must be one of: {', '.join(VALID_INVITE_STATUSES)}")
+
+    logger.info(f"<routes> Creating INVITED_TO relationship: {body['username']} -> {body['event_name']}")
+    success = yield service.invite_to_event(
+        username=body['username'],
+        event_name=body['event_name'],
+        invited_by=body['invited_by'],
+        status=status
+    )
+    if success:
+        return {"message": "User invite to event relationship created successfully"}, 201
+    return _error("Failed to create invite to event relationship")
+
+
+@handler("creating favorite field relationship")
+def favorite_field(service, body, args):
+    """Create a FAVORITED relationship between user and field"""
+    invalid = _require(body, ['username', 'field_name'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating FAVORITED relationship: {body['username']} -> {body['field_name']}")
+    success = yield service.favorite_field(
+        username=body['username'],
+        field_name=body['field_name']
+    )
+    if success:
+        return {"message": "User favorite field relationship created successfully"}, 201
+    return _error("Failed to create favorite field relationship")
+
+
+# Sport routes.
+@handler("creating sport")
+def create_sport(service, body, args):
+    """Create a new sport"""
+    invalid = _require(body, ['sport_name'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating sport: {body['sport_name']}")
+    sport = yield service.create_sport(sport_name=body['sport_name'])
+    if sport:
+        return {"message": "Sport created successfully", "sport": sport}, 201
+    return _error("Failed to create sport")
+
+
+@handler("getting sport")
+def get_sport(service, body, args):
+    """Get a sport by name"""
+    invalid = _require(body, ['sport_name'])
+    if invalid:
+        return invalid
+
+    sport = yield service.get_sport(sport_name=body['sport_name'])
+    if sport:
+        return {"message": "Sport found successfully", "sport": sport}, 200
+    return _error("Sport not found", 404)
+
+
+@handler("getting all sports")
+def get_all_sports(service, body, args):
+    """Get all sports"""
+    sports = yield service.get_all_sports()
+    return {
+        "message": "Sports retrieved successfully",
+        "sports": sports,
+        "count": len(sports)
+    }, 200
+
+
+@handler("updating sport")
+def update_sport(service, body, args):
+    """Update a sport"""
+    invalid = _require(body, ['old_sport_name', 'new_sport_name'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Updating sport: {body['old_sport_name']} -> {body['new_sport_name']}")
+    sport = yield service.update_sport(
+        old_sport_name=body['old_sport_name'],
+        new_sport_name=body['new_sport_name']
+    )
+    if sport:
+        return {"message": "Sport updated successfully", "sport": sport}, 200
+    return _error("Sport not found", 404)
+
+
+@handler("deleting sport")
+def delete_sport(service, body, args):
+    """Delete a sport"""
+    invalid = _require(body, ['sport_name'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Deleting sport: {body['sport_name']}")
+    success = yield service.delete_sport(sport_name=body['sport_name'])
+    if success:
+        return {"message": "Sport deleted successfully"}, 200
+    return _error("Sport not found", 404)
+
+
+# Field routes.
+@handler("creating field")
+def create_field(service, body, args):
+    """Create a new field"""
+    invalid = _require(body, ['field_name', 'address'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating field: {body['field_name']}")
+    field = yield service.create_field(
+        field_name=body['field_name'],
+        address=body['address']
+    )
+    if field:
+        return {"message": "Field created successfully", "field": field}, 201
+    return _error("Failed to create field")
+
+
+@handler("getting field")
+def get_field(service, body, args):
+    """Get a field by name"""
+    invalid = _require(body, ['field_name'])
+    if invalid:
+        return invalid
+
+    field = yield service.get_field(field_name=body['field_name'])
+    if field:
+        return {"message": "Field found successfully", "field": field}, 200
+    return _error("Field not found", 404)
+
+
+@handler("getting field by address")
+def get_field_by_address(service, body, args):
+    """Get a field by address"""
+    invalid = _require(body, ['address'])
+    if invalid:
+        return invalid
+
+    field = yield service.get_field_by_address(address=body['address'])
+    if field:
+        return {"message": "Field found successfully", "field": field}, 200
+    return _error("Field not found", 404)
+
+
+@handler("getting all fields")
+def get_all_fields(service, body, args):
+    """Get all fields"""
+    fields = yield service.get_all_fields()
+    return {
+        "message": "Fields retrieved successfully",
+        "fields": fields,
+        "count": len(fields)
+    }, 200
+
+
+@handler("updating field")
+def update_field(service, body, args):
+    """Update a field"""
+    invalid = _require(body, ['field_name'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Updating field: {body['field_name']}")
+    field = yield service.update_field(
+        field_name=body['field_name'],
+        address=body.get('address'),
+        new_field_name=body.get('new_field_name')
+    )
+    if field:
+        return {"message": "Field updated successfully", "field": field}, 200
+    return _error("Field not found or no updates provided", 404)
+
+
+@handler("deleting field")
+def delete_field(service, body, args):
+    """Delete a field"""
+    invalid = _require(body, ['field_name', 'address'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Deleting field: {body['field_name']} at {body['address']}")
+    success = yield service.delete_field(
+        field_name=body['field_name'],
+        address=body['address']
+    )
+    if success:
+        return {"message": "Field deleted successfully"}, 200
+    return _error("Field not found", 404)
+
+
+@handler("creating supports sport relationship")
+def supports_sport(service, body, args):
+    """Create a SUPPORTS relationship between field and sport"""
+    invalid = _require(body, ['field_name', 'sport_name'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating SUPPORTS relationship: {body['field_name']} -> {body['sport_name']}")
+    success = yield service.supports_sport(
+        field_name=body['field_name'],
+        sport_name=body['sport_name']
+    )
+    if success:
+        return {"message": "Field supports sport relationship created successfully"}, 201
+    return _error("Failed to create supports sport relationship")
+
+
+# Event routes.
+@handler("creating event")
+def create_event(service, body, args):
+    """Create a new event"""
+    invalid = _require(body, ['event_name', 'username', 'description', 'date_time', 'max_players'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating event: {body['event_name']}")
+    event = yield service.create_event(
+        event_name=body['event_name'],
+        username=body['username'],
+        description=body['description'],
+        date_time=body['date_time'],
+        max_players=body['max_players'],
+        current_players=body.get('current_players', 1)
+    )
+    if event:
+        return {"message": "Event created successfully", "event": event}, 201
+    return _error("Failed to create event")
+
+
+@handler("getting event")
+def get_event(service, body, args):
+    """Get an event by name"""
+    invalid = _require(body, ['event_name'])
+    if invalid:
+        return invalid
+
+    event = yield service.get_event(event_name=body['event_name'])
+    if event:
+        return {"message": "Event found successfully", "event": event}, 200
+    return _error("Event not found", 404)
+
+
+@handler("searching events")
+def search_events(service, body, args):
+    """Search for events by name"""
+    query = args.get('q', '')
+    if not query:
+        return {"events": [], "count": 0}, 200
+    events = yield service.search_events(query)
+    return {
+        "message": "Events searched successfully",
+        "events": events,
+        "count": len(events)
+    }, 200
+
+
+@handler("updating event")
+def update_event(service, body, args):
+    """Update an event"""
+    invalid = _require(body, ['event_name'])
+    if invalid:
+        return invalid
+
+    # Player count is updated via /events/joined-by-user when a user joins
+    logger.info(f"<routes> Updating event: {body['event_name']}")
+    event = yield service.update_event(
+        event_name=body['event_name'],
+        description=body.get('description'),
+        date_time=body.get('date_time'),
+        max_players=body.get('max_players'),
+        current_players=body.get('current_players')
+    )
+    if event:
+        return {"message": "Event updated successfully", "event": event}, 200
+    return _error("Event not found or no updates provided", 404)
+
+
+@handler("deleting event")
+def delete_event(service, body, args):
+    """Delete an event"""
+    invalid = _require(body, ['event_name'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Deleting event: {body['event_name']}")
+    success = yield service.delete_event(event_name=body['event_name'])
+    if success:
+        return {"message": "Event deleted successfully"}, 200
+    return _error("Event not found", 404)
+
+
+@handler("creating hosted at field relationship")
+def hosted_at_field(service, body, args):
+    """Create a HOSTED_AT relationship between event and field"""
+    invalid = _require(body, ['event_name', 'field_name'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating HOSTED_AT relationship: {body['event_name']} -> {body['field_name']}")
+    success = yield service.hosted_at_field(
+        event_name=body['event_name'],
+        field_name=body['field_name']
+    )
+    if success:
+        return {"message": "Event hosted at field relationship created successfully"}, 201
+    return _error("Failed to create hosted at field relationship")
+
+
+@handler("creating for sport relationship")
+def for_sport(service, body, args):
+    """Create a FOR_SPORT relationship between event and sport"""
+    invalid = _require(body, ['event_name', 'sport_name', 'min_skill_level'])
+    if invalid:
+        return invalid
+    if body['min_skill_level'] not in VALID_SKILL_LEVELS:
+        return _error(f"Invalid min_skill_level. Must be one of: {', '.join(VALID_SKILL_LEVELS)}")
+
+    logger.info(f"<routes> Creating FOR_SPORT relationship: {body['event_name']} -> {body['sport_name']}")
+    success = yield service.for_sport(
+        event_name=body['event_name'],
+        sport_name=body['sport_name'],
+        min_skill_level=body['min_skill_level']
+    )
+    if success:
+        return {"message": "Event for sport relationship created successfully"}, 201
+    return _error("Failed to create for sport relationship")
+
+
+@handler("listing events joined by user")
+def list_joined_by_user(service, body, args):
+    """Return all events the user has joined. Body: { username }."""
+    invalid = _require(body, ['username'], "Request body must be JSON with username")
+    if invalid:
+        return invalid
+    events = yield service.get_all_events_joined_by_user(username=body['username'])
+    return {"message": "Events joined by user", "events": events, "count": len(events)}, 200
+
+
+@handler("listing events hosted by user")
+def list_hosted_by_user(service, body, args):
+    """Return all events the user has hosted. Body: { username }."""
+    invalid = _require(body, ['username'], "Request body must be JSON with username")
+    if invalid:
+        return invalid
+    events = yield service.get_all_events_hosted_by_user(username=body['username'])
+    return {"message": "Events hosted by user", "events": events, "count": len(events)}, 200
+
+
+@handler("listing attendees of event")
+def list_attendees(service, body, args):
+    """Return all attendees of an event. Body: { event_name, exclude_username }."""
+    invalid = _require(body, ['event_name'], "Request body must be JSON with event_name")
+    if invalid:
+        return invalid
+    attendees = yield service.get_all_attendees(
+        event_name=body['event_name'],
+        exclude_username=body.get('exclude_username')
+    )
+    return {
+        "message": "Attendees of event listed successfully",
+        "attendees": attendees,
+        "count": len(attendees)
+    }, 200
+
+
+@handler("creating user joined event relationship")
+def joined_by_user(service, body, args):
+    """Create a JOINED relationship between an user and an event"""
+    if not body:
+        return _error("Request body must be JSON with event_name and username")
+    invalid = _require(body, ['event_name', 'username'])
+    if invalid:
+        return invalid
+    event_name = body['event_name']
+    username = body['username']
+
+    # Check event exists and is not full before joining
+    event = yield service.get_event(event_name=event_name)
+    if not event:
+        return _error("Event not found", 404)
+    current = event.get('current_players') if event.get('current_players') is not None else 0
+    max_players = event.get('max_players')
+    if max_players is not None and int(current) >= int(max_players):
+        return _error("Event is full")
+
+    logger.info(f"<routes> Creating JOINED relationship: {username} -> {event_name}")
+    success = yield service.user_joined_event(event_name=event_name, username=username)
+    if not success:
+        return _error("Failed to join event (event or user not found)")
+
+    yield service.update_event(event_name=event_name, current_players=current + 1)
+    return {"message": "User joined event successfully"}, 201
+
+
+@handler("creating JOINED relationships (batch)")
+def joined_by_users_batch(service, body, args):
+    """Create JOINED relationships for many event/user pairs and update player counts"""
+    invalid = _require_items(body, ['event_name', 'username'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating {len(body['items'])} JOINED relationships (batch)")
+    results = yield service.users_joined_event_batch(body['items'])
+    return _batch_response(results)
+
+
+@handler("removing user joined event relationship")
+def left_by_user(service, body, args):
+    """Remove JOINED relationship and decrement event current_players"""
+    if not body:
+        return _error("Request body must be JSON with event_name and username")
+    invalid = _require(body, ['event_name', 'username'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Removing JOINED relationship: {body['username']} -X-> {body['event_name']}")
+    success = yield service.user_left_event(event_name=body['event_name'], username=body['username'])
+    if success:
+        return {"message": "User left event successfully"}, 200
+    return _error("Failed to leave event (relationship may not exist)")
+
+
+# Post routes.
+@handler("creating post")
+def create_post(service, body, args):
+    """Create a new post"""
+    invalid = _require(body, ['title', 'content', 'event_name_mention', 'username'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating post: {body['title']}")
+    post = yield service.create_post(
+        title=body['title'],
+        content=body['content'],
+        event_name_mention=body['event_name_mention'],
+        username=body['username']
+    )
+    return {"message": "Post created successfully", "post": post}, 201
+
+
+@handler("deleting post")
+def delete_post(service, body, args):
+    """Delete a post"""
+    if not body:
+        return _error("Request body must be JSON with post_id")
+    invalid = _require(body, ['post_id'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Deleting post: {body['post_id']}")
+    success = yield service.delete_post(post_id=body['post_id'])
+    if success:
+        return {"message": "Post deleted successfully"}, 200
+    return _error("Post not found", 404)
+
+
+@handler("updating post")
+def update_post(service, body, args):
+    """Update a post"""
+    invalid = _require(body, ['post_id'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Updating post: {body['post_id']}")
+    post = yield service.update_post(
+        post_id=body['post_id'],
+        title=body.get('title'),
+        content=body.get('content')
+    )
+    if post:
+        return {"message": "Post updated successfully", "post": post}, 200
+    return _error("Post not found or no updates provided", 404)
+
+
+@handler("getting post")
+def get_post(service, body, args):
+    """Get a post by id"""
+    invalid = _require(body, ['post_id'])
+    if invalid:
+        return invalid
+
+    post = yield service.get_post(post_id=body['post_id'])
+    if post:
+        return {"message": "Post found successfully", "post": post}, 200
+    return _error("Post not found", 404)
+
+
+@handler("getting user posts")
+def get_user_posts(service, body, args):
+    """Get User's Posts"""
+    invalid = _require(body, ['username'])
+    if invalid:
+        return invalid
+
+    posts = yield service.get_user_posts(username=body['username'])
+    return {"message": "Posts found successfully", "posts": posts or []}, 200
+
+
+@handler("getting tagged posts")
+def get_tagged_posts(service, body, args):
+    """Get posts where user is tagged (MENTIONS_USER). Body: { username }."""
+    invalid = _require(body, ['username'], "Request body must be JSON with username")
+    if invalid:
+        return invalid
+
+    posts = yield service.get_tagged_posts(username=body['username'])
+    return {
+        "message": "Tagged posts found successfully",
+        "posts": posts or [],
+        "count": len(posts) if posts else 0
+    }, 200
+
+
+@handler("getting friends posts")
+def get_friends_posts(service, body, args):
+    """Get posts from users that the current user follows. Body: { username, cursor?, page_size?, offset? }.
+
+    Pass the returned next_cursor as cursor to fetch the next page. offset is still accepted
+    for older clients but re-scans every earlier page.
+    """
+    invalid = _require(body, ['username'], "Request body must be JSON with username")
+    if invalid:
+        return invalid
+
+    username = body['username']
+    cursor = body.get('cursor')
+    try:
+        offset = int(body.get('offset', 0))
+        page_size = int(body.get('page_size', 20))
+        # Negative values would reach Cypher as SKIP/LIMIT and fail there with a 500
+        if page_size < 1 or offset < 0:
+            return _error("page_size must be at least 1 and offset must not be negative")
+        if offset and not cursor:
+            logger.info(f"<routes> Getting friends posts for user: {username} (offset={offset}, page_size={page_size})")
+            posts = yield service.get_friends_posts(username=username, offset=offset, page_size=page_size)
+            next_cursor = None
+        else:
+            logger.info(f"<routes> Getting friends posts for user: {username} (cursor={cursor}, page_size={page_size})")
+            page = yield service.get_friends_posts_page(username=username, cursor=cursor, page_size=page_size)
+            posts, next_cursor = page["posts"], page["next_cursor"]
+    except ValueError:
+        return _error("offset and page_size must be integers and cursor must come from next_cursor")
+
+    return {
+        "message": "Friends posts found successfully",
+        "posts": posts or [],
+        "count": len(posts) if posts else 0,
+        "next_cursor": next_cursor
+    }, 200
+
+
+@handler("liking post")
+def like_post(service, body, args):
+    """Like a post"""
+    invalid = _require(body, ['username', 'post_id'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Liking post: {body}")
+    success = yield service.like_post(username=body['username'], post_id=body['post_id'])
+    if success:
+        return {"message": "Post liked successfully"}, 201
+    return _error("Failed to like post")
+
+
+@handler("creating LIKED relationships (batch)")
+def like_posts_batch(service, body, args):
+    """Like many posts in chunked transactions"""
+    invalid = _require_items(body, ['username', 'post_id'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Creating {len(body['items'])} LIKED relationships (batch)")
+    results = yield service.like_posts_batch(body['items'])
+    return _batch_response(results)
+
+
+@handler("unliking post")
+def unlike_post(service, body, args):
+    """Unlike a post"""
+    invalid = _require(body, ['username', 'post_id'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Unliking post: {body}")
+    success = yield service.unlike_post(username=body['username'], post_id=body['post_id'])
+    if success:
+        return {"message": "Post unliked successfully"}, 200
+    return _error("Failed to unlike post. Relationship may not exist.")
+
+
+@handler("getting post comments")
+def get_post_comments(service, body, args):
+    """Get all comments for a post. Body: { post_id }."""
+    invalid = _require(body, ['post_id'], "Request body must be JSON with post_id")
+    if invalid:
+        return invalid
+    comments = yield service.get_post_comments(post_id=body['post_id'])
+    return {"message": "Comments found", "comments": comments, "count": len(comments)}, 200
+
+
+@handler("commenting on post")
+def comment_on_post(service, body, args):
+    """Comment on a post"""
+    invalid = _require(body, ['username', 'post_id', 'comment'])
+    if invalid:
+        return invalid
+
+    logger.info(f"<routes> Commenting on post: {body}")
+    success = yield service.comment_on_post(
+        username=body['username'],
+        post_id=body['post_id'],
+        comment=body['comment']
+    )
+    if success:
+        return {"message": "Comment added to post successfully"}, 201
+    return _error("Failed to comment on post")
@@ -0,0 +1,185 @@
+from dotenv import load_dotenv
+from flask import Blueprint, request, jsonify
+import logging
+import threading
+
+from knowledge_graph.methods import User
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'
+)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+user_service = User()
+
+recommendation_bp = Blueprint('recommendations', __name__)
+
+STRATEGIES = ("weighted", "switched", "cf", "cb", "pipeline")
+DEFAULT_STRATEGY = "weighted"
+DEFAULT_K = 10
+MAX_K = 100
+MAX_BATCH_USERS = 500
+
+# Per-process model singletons, loaded on first use and shared by every request.
+# The recommenders hot-reload new model versions themselves (rec_system.index.registry).
+_models = {}
+_models_lock = threading.RLock()
+
+
+class ModelUnavailableError(Exception):
+    """A recommender needed for the requested strategy could not be loaded."""
+
+
+def _build_model(name: str):
+    if name == 'cf':
+        from ml_service.rec_system.cf.cf_recommender import CFRecommender
+        return CFRecommender()
+    if name == 'cb':
+        from ml_service.rec_system.cb.cb_recommender import CBRecommender
+        return CBRecommender()
+    if name == 'pipeline':
+        from ml_service.rec_system.ensemble.pipeline import RecommendationPipeline
+        from ml_service.rec_system.ensemble.signals import GraphSignals
+        return RecommendationPipeline(
+            cf_recommender=_load_model('cf'),
+            cb_recommender=_load_model('cb'),
+            signals=GraphSignals(user_service)
+        )
+    from ml_service.rec_system.ensemble.hybrid_recommender import HybridRecommender
+    return HybridRecommender(
+        cf_recommender=_load_model('cf'),
+        cb_recommender=_load_model('cb'),
+        user_methods=user_service
+    )
+
+
+def _load_model(name: str):
+    """Return the shared 'cf', 'cb', 'pipeline' or 'hybrid' recommender, loading it once per process.
+    A failed load is retried on the next request."""
+    model = _models.get(name)
+    if model is not None:
+        return model
+    with _models_lock:
+        if name not in _models:
+            try:
+                _models[name] = _build_model(name)
+            except ModelUnavailableError:
+                raise
+            except Exception as e:
+                logger.error(f"<ml_service_run> Error loading {name} recommender: {str(e)}")
+                raise ModelUnavailableError(f"{name} recommender unavailable: {str(e)}")
+            logger.info(f"<ml_service_run> Loaded {name} recommender")
+        return _models[name]
+
+
+def _recommender_for(strategy: str):
+    """The shared recommender that serves a strategy."""
+    return _load_model(strategy if strategy in ('cf', 'cb', 'pipeline') else 'hybrid')
+
+
+def _parse_options(source):
+    """Read k, min_similarity and strategy from query args or a JSON body. Raises ValueError."""
+    k = int(source.get('k', DEFAULT_K))
+    if not 1 <= k <= MAX_K:
+        raise ValueError(f"k must be between 1 and {MAX_K}")
+    min_similarity = float(source.get('min_similarity', 0.0))
+    strategy = source.get('strategy') or DEFAULT_STRATEGY
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of: {', '.join(STRATEGIES)}")
+    return k, min_similarity, strategy
+
+
+def _serialize(recommendations):
+    return [{"username": username, "score": round(float(score), 6)} for username, score in recommendations]
+
+
+def _recommend(recommender, strategy, usernames, k, min_similarity, already_following_dict):
+    """Run one strategy for many users; every strategy goes through a batched path."""
+    if strategy in ('cf', 'cb', 'pipeline'):
+        return recommender.batch_recommend(usernames, k, already_following_dict, min_similarity)
+    return recommender.batch_recommend(usernames, k, already_following_dict, min_similarity, strategy)
+
+
+# Per-stage latency and per-source candidate counts of the multi-stage pipeline.
+@recommendation_bp.route('/recommendations/pipeline/metrics', methods=['GET'])
+def pipeline_metrics():
+    """Pipeline stage metrics since process start (empty until the pipeline strategy is first used)"""
+    pipeline = _models.get('pipeline')
+    if pipeline is None:
+        return jsonify({"loaded": False, "metrics": {}}), 200
+    return jsonify({
+        "loaded": True,
+        "reranker": pipeline.reranker is not None,
+        "metrics": pipeline.metrics.snapshot()
+    }), 200
+
+# Recommendations for one user. Query args: k, min_similarity, strategy (weighted|switched|cf|cb|pipeline).
+@recommendation_bp.route('/recommendations/<username>', methods=['GET'])
+def get_recommendations(username):
+    """Recommend users to follow; users already followed are excluded"""
+    try:
+        try:
+            k, min_similarity, strategy = _parse_options(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        recommender = _recommender_for(strategy)
+        already_following = user_service.get_following_batch([username])
+
+        logger.info(f"<ml_service_run> Recommending {k} users for {username} ({strategy})")
+        if strategy in ('weighted', 'switched'):
+            # recommend() keeps the per-source CF/CB timeouts; batch_recommend would use the batch budget
+            results = {username: recommender.recommend(
+                username, k, already_following.get(username, set()), min_similarity, strategy
+            )}
+        else:
+            results = _recommend(recommender, strategy, [username], k, min_similarity, already_following)
+
+        return jsonify({
+            "username": username,
+            "strategy": strategy,
+            "recommendations": _serialize(results.get(username, []))
+        }), 200
+    except ModelUnavailableError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        logger.error(f"<ml_service_run> Error getting recommendations: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+# Recommendations for many users. Body: {"usernames": [...], "k", "min_similarity", "strategy"}
+@recommendation_bp.route('/recommendations/batch', methods=['POST'])
+def batch_recommendations():
+    """Recommend users to follow for many users; following lists are fetched in one query"""
+    try:
+        data = request.get_json()
+
+        # Validate usernames
+        usernames = data.get('usernames') if data else None
+        if not isinstance(usernames, list) or not usernames:
+            return jsonify({"error": "Missing required field: usernames (non-empty list)"}), 400
+        if len(usernames) > MAX_BATCH_USERS:
+            return jsonify({"error": f"At most {MAX_BATCH_USERS} usernames per request"}), 400
+        try:
+            k, min_similarity, strategy = _parse_options(data)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        recommender = _recommender_for(strategy)
+        usernames = list(dict.fromkeys(usernames))
+        already_following = user_service.get_following_batch(usernames)
+
+        logger.info(f"<ml_service_run> Recommending {k} users for {len(usernames)} users ({strategy}, batch)")
+        results = _recommend(recommender, strategy, usernames, k, min_similarity, already_following)
+
+        return jsonify({
+            "strategy": strategy,
+            "results": {username: _serialize(results.get(username, [])) for username in usernames}
+        }), 200
+    except ModelUnavailableError as e:
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        logger.error(f"<ml_service_run> Error getting batch recommendations: {str(e)}")
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,120 @@
+"""
+Schema bootstrap for the knowledge graph.
+
+Hot queries match on User {username}, Event {event_name}, Field {field_name} and
+Sport {sport_name}; feeds and listings order by created_at; /search/* runs on
+full-text indexes. ensure_schema() creates the backing uniqueness constraints,
+range and full-text indexes (idempotent, safe to run on every startup) and
+reports any that are still missing or not ONLINE.
+Posts are looked up by elementId(p), which needs no index.
+
+Run manually with:
+    python -m knowledge_graph.schema
+"""
+
+import logging
+import os
+
+from .connector import Connector
+from .methods.search import USER_SEARCH_INDEX, EVENT_SEARCH_INDEX
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ENV_ENSURE_SCHEMA = "NEO4J_ENSURE_SCHEMA"
+
+# (name, label, property)
+UNIQUE_CONSTRAINTS = [
+    ("user_username_unique", "User", "username"),
+    ("event_event_name_unique", "Event", "event_name"),
+    ("field_field_name_unique", "Field", "field_name"),
+    ("sport_sport_name_unique", "Sport", "sport_name"),
+]
+
+RANGE_INDEXES = [
+    ("user_created_at", "User", "created_at"),
+    ("post_created_at", "Post", "created_at"),
+]
+
+FULLTEXT_INDEXES = [
+    (USER_SEARCH_INDEX, "User", "username"),
+    (EVENT_SEARCH_INDEX, "Event", "event_name"),
+]
+
+
+def schema_enabled() -> bool:
+    """Whether ensure_schema() should run at startup (NEO4J_ENSURE_SCHEMA, default on)."""
+    return os.getenv(ENV_ENSURE_SCHEMA, "true").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _existing_indexes(driver) -> dict:
+    """Map (is_fulltext, label, property) -> state for every single-property node index (constraints included)."""
+    records, _, _ = driver.execute_query(
+        "SHOW INDEXES YIELD type, labelsOrTypes, properties, state, entityType "
+        "WHERE entityType = 'NODE' RETURN type, labelsOrTypes, properties, state"
+    )
+    existing = {}
+    for record in records:
+        labels, properties = record["labelsOrTypes"] or [], record["properties"] or []
+        if len(labels) == 1 and len(properties) == 1:
+            existing[(record["type"] == "FULLTEXT", labels[0], properties[0])] = record["state"]
+    return existing
+
+
+def missing_indexes(driver=None) -> list:
+    """Return the names of expected constraints/indexes that have no ONLINE index behind them."""
+    driver = driver or Connector().connect()
+    existing = _existing_indexes(driver)
+    expected = [(name, (False, label, prop)) for name, label, prop in UNIQUE_CONSTRAINTS + RANGE_INDEXES]
+    expected += [(name, (True, label, prop)) for name, label, prop in FULLTEXT_INDEXES]
+    return [name for name, key in expected if existing.get(key) != "ONLINE"]
+
+
+def ensure_schema(driver=None) -> dict:
+    """
+    Create the uniqueness constraints, range and full-text indexes if they do not exist.
+
+    Statements use IF NOT EXISTS, so re-running is a no-op. A statement that fails
+    (e.g. duplicate usernames blocking a constraint) is logged and reported; the
+    rest still run.
+
+    Returns:
+        {"created": [...names], "failed": {name: error}, "missing": [...names]}
+    """
+    driver = driver or Connector().connect()
+    statements = [
+        (name, f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE")
+        for name, label, prop in UNIQUE_CONSTRAINTS
+    ] + [
+        (name, f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})")
+        for name, label, prop in RANGE_INDEXES
+    ] + [
+        (name, f"CREATE FULLTEXT INDEX {name} IF NOT EXISTS FOR (n:{label}) ON EACH [n.{prop}]")
+        for name, label, prop in FULLTEXT_INDEXES
+    ]
+
+    report = {"created": [], "failed": {}, "missing": []}
+    for name, statement in statements:
+        try:
+            _, summary, _ = driver.execute_query(statement)
+            if summary.counters.constraints_added or summary.counters.indexes_added:
+                report["created"].append(name)
+                logger.info(f"<schema> Created {name}")
+        except Exception as e:
+            report["failed"][name] = str(e)
+            logger.error(f"<schema> Could not create {name}: {e}")
+
+    report["missing"] = missing_indexes(driver)
+    for name in report["missing"]:
+        logger.warning(f"<schema> {name} is missing or not ONLINE yet; queries relying on it will scan")
+    if not report["missing"]:
+        logger.info("<schema> All expected constraints and indexes are ONLINE")
+    return report
+
+
+if __name__ == "__main__":
+    result = ensure_schema()
+    print(f"created={result['created']} failed={list(result['failed'])} missing={result['missing']}")
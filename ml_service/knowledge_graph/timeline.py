@@ -0,0 +1,529 @@
+"""
+Materialized home timelines (fan-out-on-write) for the friends feed.
+
+Each user's timeline holds the ids of the most recent posts by the users they
+follow, newest first, so a feed page is a local lookup plus one id-based
+hydration query instead of the 2-hop FOLLOWS/POSTED traversal and sort.
+
+- Post.create_post pushes the new post onto every follower's timeline.
+- follow_user backfills the followee's recent posts; unfollow_user evicts them.
+- delete_post evicts the post everywhere; delete_user evicts the user's posts
+  everywhere and drops their own timeline.
+- Authors with more than TIMELINE_FANOUT_LIMIT followers are never pushed;
+  their posts are pulled at read time and merged in.
+
+A timeline is built lazily from the graph on the first read, and only already
+built timelines receive pushes. Timelines keep the newest TIMELINE_MAX_ITEMS
+posts; paging past the oldest stored post of a timeline that hit that cap
+continues from the graph. Stores:
+    TIMELINE_STORE=off     (default) feed is read straight from the graph
+    TIMELINE_STORE=memory  per-process dict; use with a single worker
+    TIMELINE_STORE=disk    SQLite file at TIMELINE_PATH, shared by workers on one host
+"""
+
+import bisect
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from .connector import Connector
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'
+)
+logger = logging.getLogger(__name__)
+
+ENV_TIMELINE_STORE = "TIMELINE_STORE"
+ENV_TIMELINE_PATH = "TIMELINE_PATH"
+ENV_TIMELINE_MAX_ITEMS = "TIMELINE_MAX_ITEMS"
+ENV_TIMELINE_FANOUT_LIMIT = "TIMELINE_FANOUT_LIMIT"
+
+_DEFAULT_TIMELINE_PATH = Path(__file__).resolve().parent.parent / "data" / "timelines.sqlite3"
+_DEFAULT_MAX_ITEMS = 800
+_DEFAULT_FANOUT_LIMIT = 5000
+
+# (created_at, post_id, author_username); ordered by (created_at, post_id) like the feed query,
+# with a missing created_at stored as '' (coalesce(post.created_at, '') in the queries)
+Entry = Tuple[str, str, str]
+
+
+def _int_env(key: str, default: int) -> int:
+    """Parse int from env var with fallback."""
+    raw = os.getenv(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning(f"<timeline> Invalid value for {key}='{raw}', using default {default}")
+        return default
+
+
+def _entry(created_at, post_id: str, author: str) -> Entry:
+    return (created_at or "", post_id, author)
+
+
+class MemoryTimelineStore:
+    """In-process timelines: per-user list sorted ascending by (created_at, post_id)."""
+
+    def __init__(self, max_items: int = _DEFAULT_MAX_ITEMS):
+        self.max_items = max_items
+        self._timelines = {}
+        self._post_index = {}  # post_id -> usernames whose timeline holds it
+        self._truncated = set()  # usernames whose timeline hit max_items, so older posts may be missing
+        self._lock = threading.Lock()
+
+    def has(self, username: str) -> bool:
+        return username in self._timelines
+
+    def truncated(self, username: str) -> bool:
+        return username in self._truncated
+
+    def _insert(self, username: str, entries: Iterable[Entry]):
+        timeline = self._timelines[username]
+        present = {entry[1] for entry in timeline}
+        for entry in entries:
+            if entry[1] not in present:
+                bisect.insort(timeline, entry)
+                present.add(entry[1])
+                self._post_index.setdefault(entry[1], set()).add(username)
+        overflow = len(timeline) - self.max_items
+        if overflow > 0:
+            self._truncated.add(username)
+            for entry in timeline[:overflow]:
+                self._discard_index(entry[1], username)
+            del timeline[:overflow]
+
+    def _discard_index(self, post_id: str, username: str):
+        holders = self._post_index.get(post_id)
+        if holders is not None:
+            holders.discard(username)
+            if not holders:
+                del self._post_index[post_id]
+
+    def replace(self, username: str, entries: List[Entry]):
+        with self._lock:
+            for entry in self._timelines.pop(username, []):
+                self._discard_index(entry[1], username)
+            self._timelines[username] = []
+            self._truncated.discard(username)
+            if len(entries) >= self.max_items:
+                self._truncated.add(username)
+            self._insert(username, entries)
+
+    def push(self, usernames: Iterable[str], entry: Entry) -> int:
+        with self._lock:
+            pushed = 0
+            for username in usernames:
+                if username in self._timelines:
+                    self._insert(username, [entry])
+                    pushed += 1
+            return pushed
+
+    def extend(self, username: str, entries: List[Entry]):
+        with self._lock:
+            if username in self._timelines:
+                if len(entries) >= self.max_items:
+                    self._truncated.add(username)
+                self._insert(username, entries)
+
+    def evict_author(self, username: str, author: str):
+        with self._lock:
+            timeline = self._timelines.get(username)
+            if timeline is None:
+                return
+            for entry in timeline:
+                if entry[2] == author:
+                    self._discard_index(entry[1], username)
+            timeline[:] = [entry for entry in timeline if entry[2] != author]
+
+    def evict_author_everywhere(self, author: str):
+        with self._lock:
+            for username, timeline in self._timelines.items():
+                for entry in timeline:
+                    if entry[2] == author:
+                        self._discard_index(entry[1], username)
+                timeline[:] = [entry for entry in timeline if entry[2] != author]
+
+    def evict_post(self, post_id: str):
+        with self._lock:
+            for username in self._post_index.pop(post_id, set()):
+                timeline = self._timelines.get(username)
+                if timeline is not None:
+                    timeline[:] = [entry for entry in timeline if entry[1] != post_id]
+
+    def drop(self, usernames: Iterable[str]):
+        with self._lock:
+            for username in usernames:
+                self._truncated.discard(username)
+                for entry in self._timelines.pop(username, []):
+                    self._discard_index(entry[1], username)
+
+    def page(self, username: str, after: Optional[Tuple[str, str]], limit: int) -> List[Entry]:
+        """Newest-first entries strictly older than `after` (created_at, post_id)."""
+        with self._lock:
+            timeline = self._timelines.get(username, [])
+            end = bisect.bisect_left(timeline, after) if after else len(timeline)
+            return timeline[max(0, end - limit):end][::-1]
+
+
+class SqliteTimelineStore:
+    """Timelines in a local SQLite file (WAL), so several worker processes see the same feeds."""
+
+    def __init__(self, path, max_items: int = _DEFAULT_MAX_ITEMS):
+        self.max_items = max_items
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            # truncated: the timeline hit max_items, so older posts may be missing from it
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS timeline_users (username TEXT PRIMARY KEY, pending INTEGER NOT NULL DEFAULT 0, "
+                "truncated INTEGER NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(timeline_users)")}
+            if "truncated" not in columns:
+                self._db.execute("ALTER TABLE timeline_users ADD COLUMN truncated INTEGER NOT NULL DEFAULT 0")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS timeline (username TEXT NOT NULL, created_at TEXT NOT NULL, "
+                "post_id TEXT NOT NULL, author TEXT NOT NULL, PRIMARY KEY (username, post_id))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS timeline_feed ON timeline (username, created_at, post_id)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS timeline_post ON timeline (post_id)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS timeline_author ON timeline (author)")
+
+    def has(self, username: str) -> bool:
+        with self._lock:
+            row = self._db.execute("SELECT 1 FROM timeline_users WHERE username = ?", (username,)).fetchone()
+            return row is not None
+
+    def truncated(self, username: str) -> bool:
+        with self._lock:
+            row = self._db.execute("SELECT truncated FROM timeline_users WHERE username = ?", (username,)).fetchone()
+            return bool(row and row[0])
+
+    def _trim(self, username: str):
+        trimmed = self._db.execute(
+            "DELETE FROM timeline WHERE username = ? AND post_id NOT IN ("
+            "SELECT post_id FROM timeline WHERE username = ? ORDER BY created_at DESC, post_id DESC LIMIT ?)",
+            (username, username, self.max_items),
+        ).rowcount
+        self._db.execute(
+            "UPDATE timeline_users SET pending = 0, truncated = truncated OR ? WHERE username = ?", (trimmed > 0, username)
+        )
+
+    def replace(self, username: str, entries: List[Entry]):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM timeline WHERE username = ?", (username,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO timeline_users (username, pending, truncated) VALUES (?, 0, ?)",
+                (username, len(entries) >= self.max_items),
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO timeline VALUES (?, ?, ?, ?)",
+                [(username, *entry) for entry in sorted(entries, reverse=True)[:self.max_items]],
+            )
+
+    def _built(self, usernames: List[str]) -> List[Tuple[str, int]]:
+        rows = []
+        for start in range(0, len(usernames), 500):
+            chunk = usernames[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            rows += self._db.execute(
+                f"SELECT username, pending FROM timeline_users WHERE username IN ({marks})", chunk
+            ).fetchall()
+        return rows
+
+    def push(self, usernames: Iterable[str], entry: Entry) -> int:
+        with self._lock, self._db:
+            built = self._built(list(usernames))
+            self._db.executemany("INSERT OR IGNORE INTO timeline VALUES (?, ?, ?, ?)", [(u, *entry) for u, _ in built])
+            self._db.executemany("UPDATE timeline_users SET pending = pending + 1 WHERE username = ?", [(u,) for u, _ in built])
+            # Trim in amortized batches rather than on every push
+            for username, pending in built:
+                if pending + 1 > max(1, self.max_items // 4):
+                    self._trim(username)
+            return len(built)
+
+    def extend(self, username: str, entries: List[Entry]):
+        with self._lock, self._db:
+            if self._db.execute("SELECT 1 FROM timeline_users WHERE username = ?", (username,)).fetchone():
+                self._db.executemany("INSERT OR IGNORE INTO timeline VALUES (?, ?, ?, ?)", [(username, *e) for e in entries])
+                if len(entries) >= self.max_items:
+                    self._db.execute("UPDATE timeline_users SET truncated = 1 WHERE username = ?", (username,))
+                self._trim(username)
+
+    def evict_author(self, username: str, author: str):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM timeline WHERE username = ? AND author = ?", (username, author))
+
+    def evict_author_everywhere(self, author: str):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM timeline WHERE author = ?", (author,))
+
+    def evict_post(self, post_id: str):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM timeline WHERE post_id = ?", (post_id,))
+
+    def drop(self, usernames: Iterable[str]):
+        with self._lock, self._db:
+            for username in usernames:
+                self._db.execute("DELETE FROM timeline WHERE username = ?", (username,))
+                self._db.execute("DELETE FROM timeline_users WHERE username = ?", (username,))
+
+    def page(self, username: str, after: Optional[Tuple[str, str]], limit: int) -> List[Entry]:
+        """Newest-first entries strictly older than `after` (created_at, post_id)."""
+        with self._lock:
+            if after:
+                rows = self._db.execute(
+                    "SELECT created_at, post_id, author FROM timeline WHERE username = ? "
+                    "AND (created_at < ? OR (created_at = ? AND post_id < ?)) "
+                    "ORDER BY created_at DESC, post_id DESC LIMIT ?",
+                    (username, after[0], after[0], after[1], limit),
+                )
+            else:
+                rows = self._db.execute(
+                    "SELECT created_at, post_id, author FROM timeline WHERE username = ? "
+                    "ORDER BY created_at DESC, post_id DESC LIMIT ?",
+                    (username, limit),
+                )
+            return [tuple(row) for row in rows]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide timeline store selected by TIMELINE_STORE, or None when disabled."""
+    global _store
+    kind = os.getenv(ENV_TIMELINE_STORE, "off").strip().lower()
+    if kind in ("", "off", "none", "0", "false"):
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                max_items = _int_env(ENV_TIMELINE_MAX_ITEMS, _DEFAULT_MAX_ITEMS)
+                if kind == "disk":
+                    path = os.getenv(ENV_TIMELINE_PATH) or _DEFAULT_TIMELINE_PATH
+                    _store = SqliteTimelineStore(path, max_items=max_items)
+                    logger.info(f"<timeline> Using SQLite timeline store at {path}")
+                else:
+                    if kind != "memory":
+                        logger.warning(f"<timeline> Unknown {ENV_TIMELINE_STORE}='{kind}', using memory")
+                    _store = MemoryTimelineStore(max_items=max_items)
+                    logger.info("<timeline> Using in-process timeline store")
+    return _store
+
+
+class HomeTimeline:
+    """Keeps the timeline store in step with graph writes and serves feed reads from it.
+
+    The write hooks run after the graph write has committed, so they log failures
+    instead of raising; a timeline that may have missed an update is dropped and
+    rebuilt on its next read.
+    """
+
+    def __init__(self):
+        self.connector = Connector()
+        self.fanout_limit = _int_env(ENV_TIMELINE_FANOUT_LIMIT, _DEFAULT_FANOUT_LIMIT)
+
+    @property
+    def store(self):
+        return get_store()
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    def fan_out_post(self, author: str, created_at, post_id: str) -> int:
+        """Push a new post to followers' timelines. Returns how many timelines were updated (0 for celebrities)."""
+        store = self.store
+        if store is None:
+            return 0
+        try:
+            driver = self.connector.connect()
+            query = """
+            MATCH (:User {username: $username})<-[:FOLLOWS]-(f:User)
+            RETURN f.username AS username
+            LIMIT $limit
+            """
+            params = {"username": author, "limit": self.fanout_limit + 1}
+            result, summary, keys = driver.execute_query(query, params)
+            if len(result) > self.fanout_limit:
+                logger.info(f"<timeline> {author} has > {self.fanout_limit} followers; post {post_id} is pulled on read")
+                return 0
+            pushed = store.push([record["username"] for record in result], _entry(created_at, post_id, author))
+            logger.info(f"<timeline> Post {post_id} pushed to {pushed} timelines")
+            return pushed
+        except Exception as e:
+            logger.error(f"<timeline> Error fanning out post {post_id}: {e}")
+            return 0
+
+    def on_follow(self, follower: str, followee: str):
+        """Backfill the followee's recent posts into the follower's timeline."""
+        store = self.store
+        if store is None or not store.has(follower):
+            return
+        try:
+            driver = self.connector.connect()
+            query = """
+            MATCH (f:User {username: $followee})
+            WHERE COUNT { (f)<-[:FOLLOWS]-() } <= $fanout_limit
+            MATCH (f)-[:POSTED]->(post:Post)
+            RETURN coalesce(post.created_at, '') AS created_at, elementId(post) AS post_id
+            ORDER BY created_at DESC, post_id DESC
+            LIMIT $limit
+            """
+            params = {"followee": followee, "fanout_limit": self.fanout_limit, "limit": store.max_items}
+            result, summary, keys = driver.execute_query(query, params)
+            store.extend(follower, [_entry(r["created_at"], r["post_id"], followee) for r in result])
+            logger.info(f"<timeline> Backfilled {len(result)} posts from {followee} into {follower}'s timeline")
+        except Exception as e:
+            logger.error(f"<timeline> Error backfilling {follower}'s timeline, dropping it: {e}")
+            store.drop([follower])
+
+    def on_unfollow(self, follower: str, followee: str):
+        store = self.store
+        if store is not None:
+            store.evict_author(follower, followee)
+
+    def on_delete_post(self, post_id: str):
+        store = self.store
+        if store is not None:
+            store.evict_post(post_id)
+
+    def on_delete_user(self, username: str):
+        """Evict a deleted user's posts from every timeline and drop their own."""
+        store = self.store
+        if store is not None:
+            store.evict_author_everywhere(username)
+            store.drop([username])
+
+    def invalidate(self, usernames: Iterable[str]):
+        """Drop timelines so they are rebuilt from the graph on next read."""
+        store = self.store
+        if store is not None:
+            store.drop(usernames)
+
+    def _build(self, driver, username: str):
+        query = """
+        MATCH (me:User {username: $username})-[:FOLLOWS]->(friend:User)
+        WHERE COUNT { (friend)<-[:FOLLOWS]-() } <= $fanout_limit
+        MATCH (friend)-[:POSTED]->(post:Post)
+        RETURN coalesce(post.created_at, '') AS created_at, elementId(post) AS post_id, friend.username AS author
+        ORDER BY created_at DESC, post_id DESC
+        LIMIT $limit
+        """
+        params = {"username": username, "fanout_limit": self.fanout_limit, "limit": self.store.max_items}
+        result, summary, keys = driver.execute_query(query, params)
+        self.store.replace(username, [_entry(r["created_at"], r["post_id"], r["author"]) for r in result])
+        logger.info(f"<timeline> Built timeline for {username}: {len(result)} posts")
+
+    def _pull_posts(self, driver, username: str, after, limit: int, celebrities: bool) -> List[Entry]:
+        """Feed entries straight from the graph, from celebrity or from pushed (non-celebrity) friends."""
+        query = """
+        MATCH (me:User {username: $username})-[:FOLLOWS]->(friend:User)
+        WHERE (COUNT { (friend)<-[:FOLLOWS]-() } > $fanout_limit) = $celebrities
+        MATCH (friend)-[:POSTED]->(post:Post)
+        WITH post, elementId(post) AS post_id, coalesce(post.created_at, '') AS created_at, friend
+        WHERE $after_post_id IS NULL
+            OR created_at < $after_created_at
+            OR (created_at = $after_created_at AND post_id < $after_post_id)
+        RETURN created_at, post_id, friend.username AS author
+        ORDER BY created_at DESC, post_id DESC
+        LIMIT $limit
+        """
+        params = {
+            "username": username,
+            "fanout_limit": self.fanout_limit,
+            "celebrities": celebrities,
+            "after_created_at": after[0] if after else None,
+            "after_post_id": after[1] if after else None,
+            "limit": limit
+        }
+        result, summary, keys = driver.execute_query(query, params)
+        return [_entry(r["created_at"], r["post_id"], r["author"]) for r in result]
+
+    def _entries(self, driver, username: str, after, limit: int) -> List[Entry]:
+        """Up to `limit` newest-first entries older than `after`, merged from all sources."""
+        entries = self.store.page(username, after, limit)
+        if len(entries) < limit and self.store.truncated(username):
+            # Past the oldest stored post of a timeline cut at max_items: continue from the graph
+            oldest = entries[-1][:2] if entries else after
+            entries += self._pull_posts(driver, username, oldest, limit - len(entries), celebrities=False)
+        entries += self._pull_posts(driver, username, after, limit, celebrities=True)
+        seen = set()
+        merged = []
+        for entry in sorted(entries, key=lambda e: (e[0], e[1]), reverse=True):
+            if entry[1] not in seen:
+                seen.add(entry[1])
+                merged.append(entry)
+        return merged[:limit]
+
+    def _hydrate(self, driver, entries: List[Entry]) -> List[dict]:
+        """Post dicts for `entries` in order, skipping posts (or authors) deleted outside the service."""
+        query = """
+        UNWIND $post_ids AS post_id
+        MATCH (post:Post)
+        WHERE elementId(post) = post_id
+        MATCH (author:User)-[:POSTED]->(post)
+        RETURN post, post_id, author.username AS author_username
+        """
+        result, summary, keys = driver.execute_query(query, {"post_ids": [e[1] for e in entries]})
+        by_id = {}
+        for record in result:
+            by_id[record["post_id"]] = {
+                **dict(record["post"]),
+                "post_id": record["post_id"],
+                "author_username": record["author_username"]
+            }
+        return [by_id[e[1]] for e in entries if e[1] in by_id]
+
+    def read(self, username: str, after: Optional[Tuple[str, str]] = None, offset: int = 0, limit: int = 20) -> List[dict]:
+        """
+        Feed page from the timeline merged with pulled celebrity posts, newest first.
+
+        Args:
+            username: Feed owner.
+            after: (created_at, post_id) keyset cursor; only older posts are returned.
+            offset: Posts to skip after the cursor (legacy offset paging).
+            limit: Max posts to return.
+
+        Returns:
+            Post dicts with post_id and author_username, like Post.get_friends_posts.
+            Posts deleted outside the service are skipped and replaced by older
+            ones, so a short page means the feed has ended.
+        """
+        try:
+            driver = self.connector.connect()
+            store = self.store
+            after = (after[0] or "", after[1]) if after else None
+            if not store.has(username):
+                self._build(driver, username)
+
+            wanted = offset + limit
+            posts = []
+            while len(posts) < wanted:
+                needed = wanted - len(posts)
+                entries = self._entries(driver, username, after, needed)
+                if not entries:
+                    break
+                posts += self._hydrate(driver, entries)
+                if len(entries) < needed:
+                    break
+                # Some entries were deleted posts; fetch older ones to fill the page
+                after = entries[-1][:2]
+
+            posts = posts[offset:wanted]
+            logger.info(f"<timeline> Served {len(posts)} feed posts for {username} from timeline")
+            return posts
+        except Exception as e:
+            logger.error(f"<timeline> Error reading timeline for {username}: {e}")
+            raise e
@@ -0,0 +1,104 @@
+"""
+ASGI entry point for the ML service.
+
+Serves the same routes as ml_service_run, but Neo4j-backed routes run as
+coroutines on the async driver so one process can hold many in-flight graph
+queries without a thread per request. URLs are matched against the Flask
+app's url_map; endpoints without an async handler fall back to the Flask app.
+
+Run with:
+    uvicorn ml_service_asgi:app --port 5000
+"""
+
+import json
+import logging
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+
+from ml_service_run import app as flask_app
+from knowledge_graph.aio import AsyncConnector
+from knowledge_graph.routes.async_routes import async_routes, AsyncRequest
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s'
+)
+logger = logging.getLogger(__name__)
+
+_wsgi_app = WsgiToAsgi(flask_app)
+
+
+def _match_endpoint(method: str, path: str):
+    """Resolve (endpoint, view_args) via the Flask url_map, or (None, None) if unmatched."""
+    adapter = flask_app.url_map.bind("localhost")
+    try:
+        return adapter.match(path, method=method)
+    except (HTTPException, RequestRedirect):
+        return None, None
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+async def _send_json(send, payload: dict, status: int):
+    body = json.dumps(payload, default=str).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"access-control-allow-origin", b"*"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await AsyncConnector.close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI application."""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+
+    if scope["type"] != "http":
+        return
+
+    endpoint, view_args = _match_endpoint(scope["method"], scope["path"])
+    handler = async_routes.get(endpoint)
+    if handler is None:
+        # OPTIONS preflight, RAG routes, 404/405 handling: let Flask answer
+        await _wsgi_app(scope, receive, send)
+        return
+
+    body = await _read_body(receive)
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    args = {key: values[0] for key, values in query.items()}
+
+    try:
+        payload, status = await handler(AsyncRequest(body, args), **view_args)
+    except Exception as e:
+        # Handlers answer their own errors; this only catches failures outside them
+        logger.error(f"<ml_service_asgi> Unhandled error for {endpoint}: {str(e)}")
+        payload, status = {"error": str(e)}, 500
+    await _send_json(send, payload, status)
@@ -1,5 +1,5 @@
 from dotenv import load_dotenv
-from flask import Flask, jsonify, request
+from flask import Flask
 from flask_cors import CORS
 import os
 import logging
@@ -11,7 +11,11 @@ from knowledge_graph.routes.event_route import event_bp
 from knowledge_graph.routes.field_route import field_bp
 from knowledge_graph.routes.post_route import post_bp
 from knowledge_graph.routes.rag_route import rag_bp
+from knowledge_graph.routes.recommendation_route import recommendation_bp
 from knowledge_graph.methods import User
+from knowledge_graph.routes import handlers
+from knowledge_graph.routes.handlers import respond
+from knowledge_graph.schema import ensure_schema, schema_enabled
 
 logging.basicConfig(
     level=logging.INFO,
@@ -35,92 +39,40 @@ app.register_blueprint(event_bp)
 app.register_blueprint(field_bp)
 app.register_blueprint(post_bp)
 app.register_blueprint(rag_bp)
+app.register_blueprint(recommendation_bp)
+
+# Create constraints/indexes before serving (idempotent; a DB outage must not block startup)
+if schema_enabled():
+    try:
+        ensure_schema()
+    except Exception as e:
+        logger.error(f"<ml_service_run> Schema bootstrap skipped: {str(e)}")
 
 # Health check endpoint
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy", "service": "ml_service"}), 200
+    return respond(handlers.health_check, None)
 
 @app.route('/', methods=['GET'])
 def index():
     """API root endpoint"""
-    return jsonify({
-        "message": "JuegaLink ML Service API",
-        "endpoints": {
-            "users": "/users/*",
-            "sports": "/sports/*",
-            "events": "/events/*",
-            "fields": "/fields/*",
-            "health": "/health"
-        }
-    }), 200
+    return respond(handlers.index, None)
 
 @app.route('/users/update', methods=['PUT', 'PATCH'])
 def update_user():
     """Update user profile"""
-    try:
-        data = request.get_json()
-        
-        # Validate required fields
-        if 'username' not in data:
-            return jsonify({"error": "Missing required field: username"}), 400
-        
-        # Update user
-        logger.info(f"<ml_service_run> Updating user: {data['username']}")
-        user = user_service.update_user(
-            username=data['username'],
-            age=data.get('age'),
-            city=data.get('city'),
-            state=data.get('state'),
-            bio=data.get('bio'),
-            email=data.get('email'),
-            phone_no=data.get('phone_no')
-        )
-        
-        if user:
-            logger.info(f"<ml_service_run> User updated: {user}")
-            return jsonify({
-                "message": "User updated successfully",
-                "user": user
-            }), 200
-        else:
-            return jsonify({
-                "error": "No fields to update or user not found"
-            }), 400
-    except Exception as e:
-        logger.error(f"<ml_service_run> Error updating user: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+    return respond(handlers.update_user_profile, user_service)
 
 @app.route('/users/<username>/friends', methods=['GET'])
 def get_user_friends(username):
     """Get friends count for a user"""
-    try:
-        friends = user_service.get_friends(username)
-        return jsonify({
-            "friends": friends,
-            "count": len(friends)
-        }), 200
-    except Exception as e:
-        logger.error(f"<ml_service_run> Error getting friends: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+    return respond(handlers.get_user_friends, user_service, username=username)
 
 @app.route('/users/<username>', methods=['GET'])
 def get_user(username):
     """Get a user by username"""
-    try:
-        user = user_service.get_user(username)
-        if user:
-            return jsonify({
-                "user": user
-            }), 200
-        else:
-            return jsonify({
-                "error": "User not found"
-            }), 404
-    except Exception as e:
-        logger.error(f"<ml_service_run> Error getting user: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+    return respond(handlers.get_user, user_service, username=username)
 
 if __name__ == '__main__':
     port = int(os.getenv('FLASK_PORT', 5000))
@@ -4,7 +4,8 @@ from . import config
 from . import data
 from . import ensemble
 from . import evaluation
+from . import index
 from . import scripts
 from . import tests
 
-__all__ = ['cb', 'cf', 'config', 'data', 'ensemble', 'evaluation', 'scripts', 'tests']
\ No newline at end of file
+__all__ = ['cb', 'cf', 'config', 'data', 'ensemble', 'evaluation', 'index', 'scripts', 'tests']
\ No newline at end of file
@@ -1,57 +1,294 @@
 """
 Content-based recommendation system.
 Uses trainined model to recommend users based on user features.
+
+The model is the versioned store written by CBModelTrainer (rec_system.index.store):
+unit-normalized feature rows, their norms and the sorted vocabulary, memory-mapped,
+and loaded on the first request rather than at construction.
 """
 
 import os
 import pickle
 import logging
+import threading
 from pathlib import Path
 from typing import List, Tuple, Optional, Set, Dict
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
 
+from ml_service.knowledge_graph.profile_events import DELETE, PROFILE_PROJECTION, current_seq, profile_of, read_events
+from ml_service.rec_system.cb.cold_cache import ColdUserCache
 from ml_service.rec_system.cb.feature_engineering import FeatureEngineer
+from ml_service.rec_system.cb.feature_store import CBFeatureStore
+from ml_service.rec_system.index.exact import ExactIndex, indices_of
+from ml_service.rec_system.index.geo import GeoConfig, build_geo_index, coordinates_from_features
+from ml_service.rec_system.index.neighbors import NeighborTable
+from ml_service.rec_system.index.registry import ModelRegistry, artifact_version
+from ml_service.rec_system.index.store import MatrixArtifact, artifact_from_arrays, load_matrix
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
 
+# Default path: ml_service/rec_system/data/models/cb (store root, see rec_system.index.store)
+_DEFAULT_MODEL_PATH = str(
+    Path(__file__).resolve().parent.parent / "data" / "models" / "cb"
+)
+# Pre-store format, still read when no store has been written yet
+_LEGACY_MODEL_PATH = str(
+    Path(__file__).resolve().parent.parent / "data" / "models" / "cb_model.pkl"
+)
+ENV_MODEL_PATH = "CB_MODEL_PATH"
+
+
+def resolve_model_path(model_path: Optional[str] = None) -> Path:
+    """
+    CB model location: the given path, else CB_MODEL_PATH env var or the default store root,
+    falling back to the legacy cb_model.pkl if no store exists.
+    """
+    if model_path is None:
+        model_path = os.getenv(ENV_MODEL_PATH) or _DEFAULT_MODEL_PATH
+        if not Path(model_path).exists() and Path(_LEGACY_MODEL_PATH).exists():
+            model_path = _LEGACY_MODEL_PATH
+    return Path(model_path)
+
+
+def _legacy_artifact(path: Path) -> MatrixArtifact:
+    """In-memory artifact from a legacy cb_model.pkl, its neighbour table remapped to the sorted row order."""
+    with open(path, 'rb') as f:
+        model_data = pickle.load(f)
+    usernames = list(model_data['usernames'])
+    meta = {"source": str(path), "feature_names": list(model_data['feature_names'])}
+    artifact = artifact_from_arrays(usernames, model_data['feature_matrix'], meta)
+    if 'neighbor_ids' in model_data:
+        # Rows are re-sorted by username; map old row ids to new ones (-1 padding stays -1)
+        order = np.fromiter((artifact.vocab.index[u] for u in usernames), dtype=np.int64, count=len(usernames))
+        ids = np.asarray(model_data['neighbor_ids'], dtype=np.int64)
+        new_ids = np.where(ids >= 0, order[np.maximum(ids, 0)], -1)
+        table_ids, table_scores = np.empty_like(new_ids), np.empty_like(model_data['neighbor_scores'])
+        table_ids[order], table_scores[order] = new_ids, model_data['neighbor_scores']
+        artifact.neighbors = NeighborTable(table_ids, table_scores)
+    return artifact
+
+
+def load_model(model_path: Optional[str] = None, version: Optional[str] = None) -> MatrixArtifact:
+    """
+    Load the CB model: a store root / version directory (memory-mapped), or a legacy .pkl.
+
+    Args:
+        model_path: See resolve_model_path().
+        version: For a store root, load this version instead of CURRENT.
+    """
+    path = resolve_model_path(model_path)
+    if not path.exists():
+        raise FileNotFoundError(f"CB model not found: {path}")
+
+    if path.suffix == ".pkl":
+        logger.warning("Loading legacy pickle CB model from %s; retrain to write the store format", path)
+        return _legacy_artifact(path)
+    if version is not None and (path / version).is_dir():
+        path = path / version
+    artifact = load_matrix(path)
+    if "feature_names" not in artifact.meta:
+        raise ValueError(f"CB model at {path} has no feature_names")
+    return artifact
+
+
+class _CBModel:
+    """One CB model version: its feature store, kept current by profile change events, and the indexes built over it."""
+
+    def __init__(self, artifact: MatrixArtifact, geo_config: Optional[GeoConfig] = None):
+        self.artifact = artifact
+        self.feature_names = list(artifact.meta['feature_names'])
+        # Rows are stored unit-normalized, so each query is a single dot product; upserted in place afterwards
+        self.store = CBFeatureStore(artifact.unit_matrix, artifact.norms, artifact.vocab, artifact.vocab.index)
+        # Spatial pre-filter over user coordinates; None below CB_GEO_MIN_ROWS (every row is scored)
+        coordinates = [name for name in ("latitude", "longitude") if name in self.feature_names]
+        self.geo_index = build_geo_index(
+            self.store.columns([self.feature_names.index(name) for name in coordinates]), coordinates, geo_config
+        )
+        # Precomputed top-K per user written by CBModelTrainer; None when trained without one
+        self.neighbors = artifact.neighbors
+
+        # Last profile change event applied. A new version starts from the seq it was trained at, so only
+        # later events dirty its rows (and bypass the neighbour table); if the log has since been reset
+        # behind that seq, every retained event is replayed
+        trained_seq = int(artifact.meta.get('profile_events_seq', 0))
+        self.events_seq = trained_seq if trained_seq <= current_seq() else 0
+        self._events_lock = threading.Lock()
+
+    @property
+    def feature_matrix(self) -> np.ndarray:
+        return self.store.feature_matrix
+
+    @property
+    def usernames(self) -> List[str]:
+        return self.store.usernames
+
+    @property
+    def username_to_idx(self) -> Dict[str, int]:
+        return self.store.username_to_idx
+
+    @property
+    def exact_index(self) -> ExactIndex:
+        return self.store.exact_index
+
+    def exclusions(self, usernames: Set[str]) -> np.ndarray:
+        """Rows of the given users plus every tombstoned row."""
+        exclude_idx = indices_of(usernames, self.username_to_idx)
+        dead_rows = self.store.dead_rows
+        return np.concatenate([exclude_idx, dead_rows]) if len(dead_rows) else exclude_idx
+
+    def table_lookup(self, row: Optional[int], k: int, exclude_idx: np.ndarray):
+        """
+        Neighbour table answer for a row, or None (no table, row added or changed since training, too few left).
+        The table's entries for rows written since training are stale, so those rows are left out of the
+        table slice and scored against the query row instead, then merged in.
+        """
+        if row is None or self.neighbors is None or row >= self.neighbors.n_rows or self.store.is_dirty(row):
+            return None
+        dirty_rows = self.store.dirty_rows
+        if not len(dirty_rows):
+            return self.neighbors.lookup(row, k, exclude_idx)
+        hit = self.neighbors.lookup(row, k, np.union1d(exclude_idx, dirty_rows))
+        if hit is None:
+            return None
+        index = self.exact_index
+        dirty_ids, dirty_scores = index.search_subset(index.rows(row), dirty_rows, k, exclude_idx)
+        ids, scores = np.concatenate([hit[0], dirty_ids]), np.concatenate([hit[1], dirty_scores])
+        order = np.argsort(-scores, kind="stable")[:k]
+        return ids[order], scores[order].astype(np.float32)
+
+    def apply_events(self, feature_engineer: FeatureEngineer) -> List[str]:
+        """
+        Upsert / tombstone rows for profile change events past events_seq. Skipped when another
+        thread is already applying them.
+
+        Returns:
+            Usernames whose rows changed.
+        """
+        if not self._events_lock.acquire(blocking=False):
+            return []
+        changed = []
+        try:
+            while True:
+                events = read_events(self.events_seq)
+                if not events:
+                    return changed
+                # Last event per user wins; events are full profiles, so earlier ones are redundant
+                latest = {username: (op, profile) for _, op, username, profile in events}
+                upserts = [(u, profile) for u, (op, profile) in latest.items() if op != DELETE]
+                deletes = [u for u, (op, _) in latest.items() if op == DELETE]
+                if upserts:
+                    features = feature_engineer.featurize_users_batch([profile for _, profile in upserts])
+                    self.store.upsert([u for u, _ in upserts], features)
+                if deletes:
+                    self.store.delete(deletes)
+                self.events_seq = events[-1][0]
+                changed.extend(latest)
+                logger.info("<cb> Applied %d profile changes (%d upserts, %d deletes)", len(events), len(upserts), len(deletes))
+        except Exception as e:
+            logger.error("<cb> Error applying profile changes; retrying on the next request: %s", e)
+            return changed
+        finally:
+            self._events_lock.release()
+
+
+def _validate_model(new: _CBModel, old: _CBModel):
+    """Reject a reloaded model that is empty or whose feature space differs from the one being served."""
+    if len(new.usernames) == 0:
+        raise ValueError("Empty vocabulary")
+    new_matrix, old_matrix = new.store.unit_matrix, old.store.unit_matrix
+    if new_matrix.ndim != 2 or new_matrix.shape[0] != len(new.usernames):
+        raise ValueError(f"Inconsistent model: feature_matrix {new_matrix.shape}, usernames {len(new.usernames)}")
+    if len(new.feature_names) != new_matrix.shape[1]:
+        raise ValueError(f"{len(new.feature_names)} feature names for {new_matrix.shape[1]} features")
+    if new.neighbors is not None and new.neighbors.n_rows != len(new.usernames):
+        raise ValueError(f"Neighbour table has {new.neighbors.n_rows} rows for {len(new.usernames)} users")
+    if new_matrix.shape[1] != old_matrix.shape[1]:
+        raise ValueError(f"Dimension mismatch: expected {old_matrix.shape[1]}, got {new_matrix.shape[1]}")
+
+
 class CBRecommender:
-    def __init__(self):
-        model_path = "ml_service/rec_system/data/models/cb_model.pkl"
-        with open(model_path, 'rb') as f:
-            model_data = pickle.load(f)
-        
-        self.feature_matrix = model_data['feature_matrix']
-        self.usernames = model_data['usernames']
-        self.feature_names = model_data['feature_names']
+    def __init__(
+        self,
+        reload_interval: Optional[int] = None,
+        geo_config: Optional[GeoConfig] = None,
+        model_path: Optional[str] = None,
+        lazy: bool = True,
+    ):
+        """
+        Args:
+            reload_interval: Seconds between checks for a retrained model file (0 disables).
+                             If None, uses MODEL_RELOAD_INTERVAL env var.
+            geo_config: Spatial pre-filter settings. If None, read from CB_GEO_* env vars.
+            model_path: CB model store root/version dir, or a legacy .pkl. If None, uses
+                        CB_MODEL_PATH env var or default ml_service/rec_system/data/models/cb.
+            lazy: Load the model on the first recommendation instead of here.
+        """
+        path = resolve_model_path(model_path)
+        geo_config = geo_config or GeoConfig.from_env("CB")
 
-        self.username_to_idx = {
-            username: idx for idx, username in enumerate(self.usernames)
-        }
+        # Every request reads self.registry.current once, so a reload never mixes two versions
+        self.registry = ModelRegistry(
+            "cb",
+            version_fn=lambda: artifact_version(path),
+            load_fn=lambda version: _CBModel(load_model(str(path), version), geo_config),
+            validate_fn=_validate_model,
+            lazy=lazy,
+        )
+        self.registry.start(reload_interval)
 
         self.feature_engineer = FeatureEngineer()
+        # Featurized users outside the model, so repeated requests for them skip Neo4j
+        self.cold_cache = ColdUserCache()
 
         neo4j_uri = os.getenv("NEO4J_URI")
         neo4j_username = os.getenv("NEO4J_USERNAME")
         neo4j_password = os.getenv("NEO4J_PASSWORD")
-        neo4j_database = os.getenv("NEO4J_DATABASE")
         
         self.driver = GraphDatabase.driver(neo4j_uri, auth=(neo4j_username, neo4j_password))
         self.database = os.getenv("NEO4J_DATABASE")
-        self.session = self.driver.session(database=neo4j_database)
-        
-        self.feature_matrix = model_data['feature_matrix']
-        self.usernames = model_data['usernames']
-        self.feature_names = model_data['feature_names']
+
+    # Attributes of the live version, for callers that read the model directly
+    @property
+    def feature_matrix(self) -> np.ndarray:
+        return self.registry.current.feature_matrix
+
+    @property
+    def usernames(self) -> List[str]:
+        return self.registry.current.usernames
+
+    @property
+    def feature_names(self) -> List[str]:
+        return self.registry.current.feature_names
+
+    @property
+    def username_to_idx(self) -> Dict[str, int]:
+        return self.registry.current.username_to_idx
+
+    @property
+    def exact_index(self) -> ExactIndex:
+        return self.registry.current.exact_index
     
+    def _current(self) -> _CBModel:
+        """The live model version with pending profile change events applied."""
+        model = self.registry.current
+        changed = model.apply_events(self.feature_engineer)
+        if changed:
+            self.cold_cache.invalidate(changed)
+        return model
+
+    def cold_cache_stats(self) -> Dict[str, float]:
+        """Hit/miss counters of the cold-user feature cache."""
+        return self.cold_cache.stats()
+
     def close(self):
-        """Close Neo4j driver connection."""
+        """Close Neo4j driver connection and stop the reload watcher."""
+        self.registry.stop()
         if self.driver:
             self.driver.close()
             self.driver = None
@@ -64,45 +301,41 @@ class CBRecommender:
             return self.driver.session(database=self.database)
         return self.driver.session()
     
-    def _fetch_user_from_neo4j(self, username: str) -> Optional[Dict]:
+    def _fetch_users_from_neo4j(self, usernames: List[str]) -> Optional[Dict[str, Dict]]:
         """
-        Fetch user data from Neo4j.
+        Fetch user data for many users in one UNWIND query.
         
         Args:
-            username: Username to fetch
+            usernames: Usernames to fetch
             
         Returns:
-            User data dict or None if not found
+            Dict of {username: user data} for the users found, or None if Neo4j is not connected
         """
         if not self.driver:
-            logger.warning("Cannot fetch user - Neo4j not connected")
+            logger.warning("Cannot fetch users - Neo4j not connected")
             return None
         
-        query = """
-        MATCH (u:User {name: $username})
-        RETURN 
-            u.name AS username,
-            u.age AS age,
-            u.sport AS favorite_sport,
-            u.competitive_level AS competitive_level,
-            u.latitude AS latitude,
-            u.longitude AS longitude
+        query = f"""
+        UNWIND $usernames AS username
+        MATCH (u:User {{username: username}})
+        RETURN {PROFILE_PROJECTION}
         """
         with self._session() as session:
-            result = session.run(query, username=username)
-            record = result.single()
-            
-            if not record:
-                return None
+            result = session.run(query, usernames=list(usernames))
+            return {record['username']: profile_of(record) for record in result}
+
+    def _fetch_user_from_neo4j(self, username: str) -> Optional[Dict]:
+        """
+        Fetch user data from Neo4j.
+        
+        Args:
+            username: Username to fetch
             
-            return {
-                'username': record['username'],
-                'age': record['age'],
-                'favorite_sport': record['favorite_sport'],
-                'competitive_level': record['competitive_level'],
-                'latitude': record['latitude'],
-                'longitude': record['longitude']
-            }
+        Returns:
+            User data dict or None if not found
+        """
+        users = self._fetch_users_from_neo4j([username])
+        return users.get(username) if users else None
     
     def get_user_features(self, username: str) -> Optional[np.ndarray]:
         """
@@ -115,20 +348,48 @@ class CBRecommender:
         Returns:
             Feature vector (1D numpy array) or None if user not found
         """
-        # Check if user is in cached model
-        if username in self.username_to_idx:
-            idx = self.username_to_idx[username]
-            return self.feature_matrix[idx]
-        
-        user_data = self._fetch_user_from_neo4j(username)
-        if user_data is None:
-            logger.warning("User '%s' not found in Neo4j either", username)
-            return None
-        
-        # Featurize on-the-fly
-        features = self.feature_engineer.featurize_user(user_data)
-        logger.info("Featurized user '%s' on-the-fly", username)
+        return self._user_features(self._current(), username)
+
+    def _user_features(self, model: _CBModel, username: str) -> Optional[np.ndarray]:
+        """get_user_features() against a specific model version."""
+        return self._users_features(model, [username]).get(username)
+
+    def _users_features(self, model: _CBModel, usernames: List[str]) -> Dict[str, Optional[np.ndarray]]:
+        """
+        Feature vectors for many users: rows of the model, then the cold-user cache, then one
+        batched Neo4j fetch + featurization for the rest.
         
+        Returns:
+            Dict of {username: feature vector, or None if the user is not found}
+        """
+        features = {}
+        cold = []
+        for username in dict.fromkeys(usernames):
+            row = model.username_to_idx.get(username)
+            if row is not None:
+                features[username] = model.store.rows(row)
+            else:
+                cold.append(username)
+        if not cold:
+            return features
+
+        cached, missing = self.cold_cache.get_many(cold)
+        features.update(cached)
+        if missing:
+            users = self._fetch_users_from_neo4j(missing)
+            if users is None:
+                return features
+            fetched = dict.fromkeys(missing)
+            found = [users[u] for u in missing if u in users]
+            if found:
+                vectors = self.feature_engineer.featurize_users_batch(found)
+                fetched.update(zip((user['username'] for user in found), vectors))
+                logger.info("<cb> Featurized %d cold users on-the-fly", len(found))
+            for username in missing:
+                if fetched[username] is None:
+                    logger.warning("User '%s' not found in Neo4j either", username)
+            self.cold_cache.put_many(fetched)
+            features.update(fetched)
         return features
     
     def get_similar_users(
@@ -148,41 +409,42 @@ class CBRecommender:
         Returns:
             List of (username, similarity_score) tuples, sorted by similarity (descending)
         """
+        model = self._current()
+
         # Get target user's features
-        target_features = self.get_user_features(username)
+        target_features = self._user_features(model, username)
         if target_features is None:
             logger.warning("User '%s' not found", username)
             return []
         
-        # Reshape for sklearn
-        target_features = target_features.reshape(1, -1)
-        
-        # Compute cosine similarity with all cached users
-        similarities = cosine_similarity(target_features, self.feature_matrix)[0]
-        
-        # Get indices sorted by similarity (descending)
-        sorted_indices = np.argsort(similarities)[::-1]
+        exclude = set(exclude_users or set())
+        exclude.add(username)  # Always exclude self
+        exclude_idx = model.exclusions(exclude)
 
-        # Build results, filtering as needed
-        results = []
-        exclude_users = exclude_users or set()
-        exclude_users.add(username)  # Always exclude self
-        
-        for idx in sorted_indices:
-            candidate_username = self.usernames[idx]
-            
-            # Skip if in exclude list
-            if candidate_username in exclude_users:
-                continue
-            
-            similarity_score = float(similarities[idx])
-            results.append((candidate_username, similarity_score))
-            
-            # Stop when we have k results
-            if len(results) >= k:
-                break
-        
-        return results
+        # Cached users: precomputed table slice; otherwise score only the users near the target
+        # when there is a geo index, else one dot product against the pre-normalized matrix
+        row = model.username_to_idx.get(username)
+        hit = model.table_lookup(row, k, exclude_idx)
+        if hit is not None:
+            ids, scores = hit
+        elif model.geo_index is not None:
+            rows = self._geo_candidates(model, [target_features], [k + len(exclude_idx)])[0]
+            ids, scores = model.exact_index.search_subset(target_features, rows, k, exclude_idx)
+        elif row is not None:
+            ids, scores = model.exact_index.search_row(row, k, exclude_idx)
+        else:
+            ids, scores = model.exact_index.search(target_features, k, exclude_idx)
+
+        return [(model.usernames[i], float(s)) for i, s in zip(ids, scores)]
+
+    @staticmethod
+    def _geo_candidates(model: _CBModel, vectors: List[np.ndarray], min_count: List[int]) -> List[np.ndarray]:
+        """Nearby matrix rows for each feature vector (coordinates read from its latitude/longitude features)."""
+        latitudes, longitudes = coordinates_from_features(np.vstack(vectors), model.feature_names)
+        candidates = model.geo_index.candidates(latitudes, longitudes, min_count)
+        # Rows added or moved since the geo index was built are always scored
+        dirty_rows = model.store.dirty_rows
+        return [np.union1d(rows, dirty_rows) for rows in candidates] if len(dirty_rows) else candidates
     
     def recommend_users(
         self,
@@ -223,30 +485,60 @@ class CBRecommender:
         self,
         usernames: List[str],
         k: int = 10,
-        already_following_dict: Optional[Dict[str, Set[str]]] = None
+        already_following_dict: Optional[Dict[str, Set[str]]] = None,
+        min_similarity: float = 0.0,
+        block_rows: Optional[int] = None
     ) -> Dict[str, List[Tuple[str, float]]]:
         """
-        Generate recommendations for multiple users efficiently.
+        Generate recommendations for multiple users: precomputed neighbour table slices where
+        possible; the rest against their nearby users when there is a geo index, else as blocked
+        matrix multiplications (query block x feature matrix) with per-row top-k and exclusions.
         
         Args:
             usernames: List of usernames to generate recommendations for
             k: Number of recommendations per user
             already_following_dict: Dict of {username: set of followed users}
+            min_similarity: Minimum similarity threshold (0.0 to 1.0)
+            block_rows: Users per GEMM block (default bounds each block's score buffer to ~256MB)
             
         Returns:
-            Dict of {username: [(recommended_user, score), ...]}
+            Dict of {username: [(recommended_user, score), ...]}; users that cannot be featurized get []
         """
+        model = self._current()
         already_following_dict = already_following_dict or {}
-        
-        results = {}
-        for username in usernames:
-            already_following = already_following_dict.get(username, set())
-            recommendations = self.recommend_users(
-                username=username,
-                k=k,
-                already_following=already_following
-            )
-            results[username] = recommendations
+        results = {username: [] for username in usernames}
+
+        # Cached users are answered from the neighbour table when it has enough rows left after
+        # exclusion; everyone else is scored (cached vectors from the matrix, others from Neo4j)
+        answered, excludes = {}, {}
+        for username in results:
+            exclude_idx = model.exclusions(already_following_dict.get(username, set()) | {username})
+            hit = model.table_lookup(model.username_to_idx.get(username), k, exclude_idx)
+            if hit is not None:
+                answered[username] = hit
+            else:
+                excludes[username] = exclude_idx
+
+        # One cache lookup and at most one Neo4j query for every cold user in the batch
+        query_users, query_vectors, query_excludes = [], [], []
+        for username, features in self._users_features(model, list(excludes)).items():
+            if features is None:
+                logger.warning("User '%s' not found", username)
+                continue
+            query_users.append(username)
+            query_vectors.append(features)
+            query_excludes.append(excludes[username])
+
+        if query_users and model.geo_index is not None:
+            candidate_rows = self._geo_candidates(model, query_vectors, [k + len(idx) for idx in query_excludes])
+            for username, features, rows, exclude_idx in zip(query_users, query_vectors, candidate_rows, query_excludes):
+                answered[username] = model.exact_index.search_subset(features, rows, k, exclude_idx)
+        elif query_users:
+            batch = model.exact_index.search_batch(np.vstack(query_vectors), k, query_excludes, block_rows)
+            answered.update(zip(query_users, batch))
+        for username, (ids, scores) in answered.items():
+            keep = scores >= min_similarity
+            results[username] = [(model.usernames[i], float(s)) for i, s in zip(ids[keep], scores[keep])]
         
         return results
 
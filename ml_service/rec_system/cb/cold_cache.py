@@ -0,0 +1,117 @@
+"""
+Bounded LRU + TTL cache of featurized cold users (users outside the trained CB matrix).
+
+Without it, every request for a user missing from the model costs a Neo4j round
+trip and a featurization. Entries expire after CB_COLD_CACHE_TTL seconds, so an
+edit made outside the profile change events still shows up; users Neo4j does not
+know are cached too (as negative entries), so unknown names stop reaching the graph.
+CB_COLD_CACHE_TTL=0 disables the cache.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+ENV_COLD_CACHE_TTL = "CB_COLD_CACHE_TTL"
+ENV_COLD_CACHE_MAX_ENTRIES = "CB_COLD_CACHE_MAX_ENTRIES"
+DEFAULT_COLD_CACHE_TTL = 300
+DEFAULT_COLD_CACHE_MAX_ENTRIES = 10000
+
+# Stored for users Neo4j does not have, to tell them apart from a cache miss
+_NOT_FOUND = object()
+
+
+def _int_env(key: str, default: int) -> int:
+    """Parse int from env var with fallback."""
+    raw = os.getenv(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning("Invalid int for %s='%s', using default %d", key, raw, default)
+        return default
+
+
+class ColdUserCache:
+    """Thread-safe username -> feature vector map with TTL expiry, LRU eviction and hit/miss counters."""
+
+    def __init__(self, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        """
+        Args:
+            ttl: Seconds an entry lives (0 disables). If None, uses CB_COLD_CACHE_TTL.
+            max_entries: Users kept before the least recently used is evicted. If None, uses CB_COLD_CACHE_MAX_ENTRIES.
+        """
+        self.ttl = _int_env(ENV_COLD_CACHE_TTL, DEFAULT_COLD_CACHE_TTL) if ttl is None else ttl
+        self.max_entries = (
+            _int_env(ENV_COLD_CACHE_MAX_ENTRIES, DEFAULT_COLD_CACHE_MAX_ENTRIES) if max_entries is None else max_entries
+        )
+        self._entries = OrderedDict()  # username -> (features or _NOT_FOUND, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get_many(self, usernames: Iterable[str]) -> Tuple[Dict[str, Optional[np.ndarray]], list]:
+        """
+        Returns:
+            (cached, missing): cached maps username -> features, or None for users known not to exist;
+            missing lists the users that must be fetched.
+        """
+        cached, missing = {}, []
+        now = time.monotonic()
+        with self._lock:
+            for username in usernames:
+                entry = self._entries.get(username)
+                if entry is not None and entry[1] > now:
+                    self._entries.move_to_end(username)
+                    cached[username] = None if entry[0] is _NOT_FOUND else entry[0]
+                    continue
+                if entry is not None:
+                    del self._entries[username]
+                missing.append(username)
+            self.hits += len(cached)
+            self.misses += len(missing)
+        return cached, missing
+
+    def put_many(self, features: Dict[str, Optional[np.ndarray]]):
+        """Cache feature vectors; None records a user Neo4j does not have."""
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for username, vector in features.items():
+                self._entries[username] = (_NOT_FOUND if vector is None else vector, expires_at)
+                self._entries.move_to_end(username)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, usernames: Iterable[str]):
+        with self._lock:
+            for username in usernames:
+                self._entries.pop(username, None)
+
+    def stats(self) -> Dict[str, float]:
+        """Counters since start: hits, misses, evictions, hit_rate, size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+            }
@@ -5,7 +5,7 @@ Transforms raw user attributes into feature vectors.
 
 import os
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 import numpy as np
 from pathlib import Path
 import json
@@ -52,6 +52,7 @@ class FeatureEngineer:
                             If None, will look for default location.
         """
         self.sports = SPORTS
+        self.sport_to_idx = {sport: idx for idx, sport in enumerate(self.sports)}
         self.competitive_levels = COMPETITIVE_LEVELS
         self.feature_names = self._build_feature_names()
     
@@ -109,9 +110,8 @@ class FeatureEngineer:
         encoding = [0.0] * len(self.sports)
         
         if favorite_sport:
-            normalized = favorite_sport.lower().strip()
-            if normalized in self.sports:
-                idx = self.sports.index(normalized)
+            idx = self.sport_to_idx.get(favorite_sport.lower().strip())
+            if idx is not None:
                 encoding[idx] = 1.0
         
         return encoding
@@ -152,10 +152,10 @@ class FeatureEngineer:
             longitude: Longitude
 
         Returns:
-            [normalized_latitude, normalized_longitude] each in [0, 1]
+            [normalized_latitude, normalized_longitude] each in [0, 1]; 0.5 where missing
         """
-        lat_norm = (latitude + 90) / 180.0
-        lng_norm = (longitude + 180) / 360.0
+        lat_norm = 0.5 if latitude is None else (latitude + 90) / 180.0
+        lng_norm = 0.5 if longitude is None else (longitude + 180) / 360.0
         return [lat_norm, lng_norm]
     
     def featurize_user(self, user_data: Dict) -> np.ndarray:
@@ -194,7 +194,7 @@ class FeatureEngineer:
     
     def featurize_users_batch(self, users_data: List[Dict]) -> np.ndarray:
         """
-        Featurize multiple users at once.
+        Featurize multiple users at once (columnar, see featurize_columns).
         
         Args:
             users_data: List of user data dicts
@@ -202,10 +202,68 @@ class FeatureEngineer:
         Returns:
             2D numpy array (n_users x n_features)
         """
-        feature_vectors = [
-            self.featurize_user(user) for user in users_data
-        ]
-        return np.vstack(feature_vectors)
+        return self.featurize_columns(
+            ages=[user.get('age') for user in users_data],
+            sports=[user.get('favorite_sport') for user in users_data],
+            levels=[user.get('competitive_level') for user in users_data],
+            latitudes=[user.get('latitude') for user in users_data],
+            longitudes=[user.get('longitude') for user in users_data],
+        )
+
+    def featurize_columns(
+        self,
+        ages: Sequence,
+        sports: Sequence,
+        levels: Sequence,
+        latitudes: Sequence,
+        longitudes: Sequence,
+    ) -> np.ndarray:
+        """
+        Featurize users given as columns, with NumPy ops over whole columns into one
+        preallocated matrix; row i matches featurize_user() for user i.
+        
+        Args:
+            ages, sports, levels, latitudes, longitudes: Equal-length columns; None marks a missing value
+            
+        Returns:
+            2D numpy array (n_users x n_features), float32
+        """
+        n_users = len(ages)
+        n_sports = len(self.sports)
+        features = np.zeros((n_users, len(self.feature_names)), dtype=np.float32)
+
+        # Age: clip + normalize, missing -> 0.5
+        age = np.asarray(ages, dtype=np.float64).reshape(n_users)
+        features[:, 0] = np.where(
+            np.isnan(age), 0.5, (np.clip(age, MIN_AGE, MAX_AGE) - MIN_AGE) / (MAX_AGE - MIN_AGE)
+        )
+
+        # Sport (one-hot): raw value -> column index once per distinct value, then one scatter
+        sport_idx = self._encode_column(
+            sports, lambda s: self.sport_to_idx.get(s.lower().strip(), -1) if s else -1, np.int64
+        )
+        rows = np.flatnonzero(sport_idx >= 0)
+        features[rows, 1 + sport_idx[rows]] = 1.0
+
+        # Competitive level, encoded once per distinct value
+        features[:, 1 + n_sports] = self._encode_column(levels, self._encode_competitive_level, np.float64)
+
+        # Geography, missing -> 0.5
+        lat = np.asarray(latitudes, dtype=np.float64).reshape(n_users)
+        lng = np.asarray(longitudes, dtype=np.float64).reshape(n_users)
+        features[:, 2 + n_sports] = np.where(np.isnan(lat), 0.5, (lat + 90) / 180.0)
+        features[:, 3 + n_sports] = np.where(np.isnan(lng), 0.5, (lng + 180) / 360.0)
+        return features
+
+    @staticmethod
+    def _encode_column(values: Sequence, encode, dtype) -> np.ndarray:
+        """encode(value) for every value of a column, calling encode once per distinct value."""
+        memo = {}
+        return np.fromiter(
+            (memo[v] if v in memo else memo.setdefault(v, encode(v)) for v in values),
+            dtype=dtype,
+            count=len(values),
+        )
     
     def get_feature_importance(self, feature_vector: np.ndarray) -> Dict[str, float]:
         """
@@ -0,0 +1,200 @@
+"""
+Appendable feature store behind the served CB model.
+
+Rows are kept as a unit-normalized matrix plus per-row norms (raw features =
+unit row * norm), the layout of the memory-mapped store artifact, so a freshly
+loaded model serves straight from the mapped pages. The first profile change
+copies the rows into growable in-memory buffers; after that an update
+overwrites its row in place and a new user is an append, never a rebuild.
+Deleted users are tombstoned: they leave the name index and their row is
+excluded from every search until the next retrain compacts the matrix.
+
+Rows written since the model was trained are "dirty": the precomputed
+neighbour table and the geo index were built without their current features,
+so searches score them explicitly.
+"""
+
+import threading
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ml_service.rec_system.index.exact import ExactIndex, l2_normalize
+
+
+class _RowNames(Sequence):
+    """Row -> username: the trained vocabulary followed by users appended since."""
+
+    def __init__(self, base: Sequence):
+        self._base = base
+        self._n_base = len(base)
+        self._added: List[str] = []
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        i = int(i)
+        if i < 0:
+            i += len(self)
+        return self._base[i] if i < self._n_base else self._added[i - self._n_base]
+
+    def __len__(self) -> int:
+        return self._n_base + len(self._added)
+
+    def extend(self, usernames: List[str]):
+        self._added.extend(usernames)
+
+
+class _RowIndex(Mapping):
+    """Username -> row: the trained vocabulary's index, plus appended users, minus tombstoned ones."""
+
+    def __init__(self, base: Mapping):
+        self._base = base
+        self._added: Dict[str, int] = {}
+        self._removed = set()
+
+    def __getitem__(self, username: str) -> int:
+        if username in self._added:
+            return self._added[username]
+        if username in self._removed:
+            raise KeyError(username)
+        return self._base[username]
+
+    def __contains__(self, username) -> bool:
+        return username in self._added or (username not in self._removed and username in self._base)
+
+    def get(self, username, default=None):
+        return self[username] if username in self else default
+
+    def __iter__(self):
+        yield from (u for u in self._base if u not in self._removed and u not in self._added)
+        yield from self._added
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def update(self, rows: Dict[str, int]):
+        self._added.update(rows)
+
+    def pop(self, username: str) -> int:
+        row = self[username]
+        self._added.pop(username, None)
+        self._removed.add(username)
+        return row
+
+
+class CBFeatureStore:
+    """Growable (n_rows, dim) unit matrix + norms with in-place upserts and tombstones."""
+
+    def __init__(
+        self,
+        unit_matrix: np.ndarray,
+        norms: np.ndarray,
+        usernames: Sequence,
+        username_to_idx: Optional[Mapping] = None,
+    ):
+        """
+        Args:
+            unit_matrix: (n_users, n_features) L2-normalized trained features (may be memory-mapped).
+            norms: (n_users,) original row norms.
+            usernames: Username of each row.
+            username_to_idx: Username -> row; built from usernames if not given.
+        """
+        self._unit = unit_matrix
+        self._norms = norms
+        self._writable = False  # base arrays are shared (e.g. mmap); copied on first write
+        self.usernames = _RowNames(usernames)
+        self.username_to_idx = _RowIndex(
+            username_to_idx if username_to_idx is not None else {u: i for i, u in enumerate(usernames)}
+        )
+        self.n_rows = len(usernames)
+        # Rows covered by the structures built at train/load time (neighbour table, geo index)
+        self.n_base_rows = self.n_rows
+        self._dirty = set()
+        self._dead = set()
+        self.dirty_rows = np.empty(0, dtype=np.int64)
+        self.dead_rows = np.empty(0, dtype=np.int64)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_features(cls, feature_matrix: np.ndarray, usernames: Sequence) -> "CBFeatureStore":
+        """Store over raw (unnormalized) features, e.g. from a legacy pickle."""
+        feature_matrix = np.asarray(feature_matrix, dtype=np.float32)
+        return cls(l2_normalize(feature_matrix), np.linalg.norm(feature_matrix, axis=1).astype(np.float32), usernames)
+
+    @property
+    def unit_matrix(self) -> np.ndarray:
+        return self._unit[:self.n_rows]
+
+    @property
+    def feature_matrix(self) -> np.ndarray:
+        """Raw features of every row (materialized; prefer rows())."""
+        return self.rows(slice(0, self.n_rows))
+
+    def rows(self, rows) -> np.ndarray:
+        """Raw float32 features for the given row(s)."""
+        return self._unit[rows].astype(np.float32) * np.asarray(self._norms[rows], dtype=np.float32)[..., None]
+
+    def columns(self, columns: List[int]) -> np.ndarray:
+        """Raw features of every row for a few columns, without materializing the whole matrix."""
+        unit = np.asarray(self._unit[:self.n_rows, columns], dtype=np.float32)
+        return unit * np.asarray(self._norms[:self.n_rows], dtype=np.float32)[:, None]
+
+    @property
+    def exact_index(self) -> ExactIndex:
+        """Exact cosine index over the live rows (a view, no copy)."""
+        return ExactIndex(self.unit_matrix, normalized=True)
+
+    def is_dirty(self, row: int) -> bool:
+        return row in self._dirty
+
+    def _grow(self, n_rows: int):
+        """Copy the rows into in-memory buffers for at least n_rows; readers holding the old views keep them."""
+        capacity = max(n_rows, 2 * self._unit.shape[0] if self._writable else self.n_rows + max(1024, self.n_rows // 16))
+        unit = np.zeros((capacity, self._unit.shape[1]), dtype=np.float32)
+        norms = np.zeros(capacity, dtype=np.float32)
+        unit[:self.n_rows] = self._unit[:self.n_rows]
+        norms[:self.n_rows] = self._norms[:self.n_rows]
+        self._unit, self._norms, self._writable = unit, norms, True
+
+    def upsert(self, usernames: Sequence[str], features: np.ndarray) -> int:
+        """
+        Overwrite the rows of known users and append rows for new ones.
+
+        Returns:
+            Number of users appended.
+        """
+        features = np.asarray(features, dtype=np.float32).reshape(len(usernames), -1)
+        unit = l2_normalize(features)
+        norms = np.linalg.norm(features, axis=1)
+        with self._lock:
+            new_users = [u for u in dict.fromkeys(usernames) if u not in self.username_to_idx]
+            if not self._writable or self.n_rows + len(new_users) > self._unit.shape[0]:
+                self._grow(self.n_rows + len(new_users))
+            new_rows = {username: self.n_rows + i for i, username in enumerate(new_users)}
+            rows = np.fromiter(
+                (self.username_to_idx.get(u, new_rows.get(u)) for u in usernames), dtype=np.int64, count=len(usernames)
+            )
+            self._unit[rows] = unit
+            self._norms[rows] = norms
+            # Rows are written before their names are published, so a reader never finds a half-added user
+            self.usernames.extend(new_users)
+            self.username_to_idx.update(new_rows)
+            self.n_rows = len(self.usernames)
+            self._dirty.update(rows.tolist())
+            self.dirty_rows = np.fromiter(sorted(self._dirty), dtype=np.int64)
+            return len(new_users)
+
+    def delete(self, usernames: Sequence[str]) -> int:
+        """
+        Tombstone users: drop them from the name index and exclude their rows from searches.
+
+        Returns:
+            Number of users tombstoned.
+        """
+        with self._lock:
+            rows = [self.username_to_idx.pop(u) for u in usernames if u in self.username_to_idx]
+            self._dead.update(rows)
+            self.dead_rows = np.fromiter(sorted(self._dead), dtype=np.int64)
+            return len(rows)
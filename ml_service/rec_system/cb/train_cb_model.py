@@ -1,10 +1,15 @@
 """
 Training a content-based recommendation model.
 Ran periodically to keep model up-to-date.
+
+The model is written as a new version of the CB store (rec_system.index.store) at
+CB_MODEL_PATH or ml_service/rec_system/data/models/cb. A legacy cb_model.pkl can be
+converted without retraining:
+    python -m ml_service.rec_system.cb.train_cb_model --convert <cb_model.pkl>
 """
 
 import os
-import pickle
+import argparse
 import logging
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -13,7 +18,11 @@ import numpy as np
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
 
+from ml_service.knowledge_graph.profile_events import PROFILE_PROJECTION, current_seq, profile_of
+from ml_service.rec_system.cb.cb_recommender import load_model, resolve_model_path
 from ml_service.rec_system.cb.feature_engineering import FeatureEngineer
+from ml_service.rec_system.index.neighbors import neighbors_k_from_env
+from ml_service.rec_system.index.store import save_matrix
 
 load_dotenv()
 
@@ -21,6 +30,14 @@ logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger(__name__)
 
 
+def _output_dir() -> str:
+    """Store root to write: CB_MODEL_PATH or the default store root (never the legacy pickle)."""
+    path = resolve_model_path()
+    if path.suffix == ".pkl":
+        path = Path(__file__).resolve().parent.parent / "data" / "models" / "cb"
+    return str(path)
+
+
 class CBModelTrainer:
     """Train content-based model from Neo4j user data."""
     
@@ -41,9 +58,9 @@ class CBModelTrainer:
         
         self.feature_engineer = FeatureEngineer()
         
-        self.output_dir = str (
-            Path(__file__).resolve().parent.parent / "data" / "models"
-        )
+        self.output_dir = _output_dir()
+        # Top-K similar users precomputed per user and stored in the model (0 = off)
+        self.neighbors_k = neighbors_k_from_env()
     
     def close(self):
         """Close Neo4j driver."""
@@ -58,37 +75,23 @@ class CBModelTrainer:
     
     def fetch_users(self) -> List[Dict]:
         """
-        Fetch all users from Neo4j Database at runtime.
+        Fetch all users from Neo4j Database at runtime, projected like the serving-side
+        cold fetch and the profile change events (PROFILE_PROJECTION).
 
         Returns:
             List of user dicts.
         """
-        query = """
+        query = f"""
         MATCH (u:User)
-        RETURN 
-            u.name AS username,
-            u.age AS age,
-            u.sport AS favorite_sport,
-            u.competitive_level AS competitive_level,
-            u.latitude AS latitude,
-            u.longitude AS longitude
-        ORDER BY u.name
+        WHERE u.username IS NOT NULL
+        RETURN {PROFILE_PROJECTION}
+        ORDER BY u.username
         """
 
         # create a session.
         with self._session() as session:
             result = session.run(query)
-            users = []
-            for record in result:
-                users.append({
-                    "username": record["username"],
-                    "age": record["age"],
-                    "favorite_sport": record["favorite_sport"],
-                    "competitive_level": record["competitive_level"],
-                    "latitude": record["latitude"],
-                    "longitude": record["longitude"]
-                })
-            return users
+            return [profile_of(record) for record in result]
     
     def featurize_users(self, users: List[Dict]) -> tuple[np.ndarray, List[str]]:
         """
@@ -112,29 +115,36 @@ class CBModelTrainer:
         self,
         feature_matrix: np.ndarray,
         usernames: List[str],
-        feature_names: List[str]
+        feature_names: List[str],
+        events_seq: int = 0
     ) -> Dict[str, str]:
-        # Create output directory
-        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
-                
-        # Save complete model as pickle
-        model_data = {
-            'feature_matrix': feature_matrix,
-            'usernames': usernames,
-            'feature_names': feature_names,
-            'n_users': len(usernames),
-            'n_features': len(feature_names)
-        }
-        
-        model_path = os.path.join(
-            self.output_dir, "cb_model.pkl"
+        """
+        Write the features as a new store version and make it CURRENT, so a serving
+        recommender swaps it in on its next reload check.
+
+        Args:
+            events_seq: Profile change event seq the features include; the serving model
+                        replays only later events (see knowledge_graph.profile_events).
+
+        Returns:
+            Dict with the path to the new model version
+        """
+        # Version directory is fully written before CURRENT moves, so a reloading recommender never reads a partial model
+        version_dir = save_matrix(
+            self.output_dir,
+            usernames,
+            feature_matrix,
+            extra_meta={
+                'feature_names': list(feature_names),
+                'n_features': len(feature_names),
+                'profile_events_seq': int(events_seq)
+            },
+            neighbors_k=self.neighbors_k,
         )
-        with open(model_path, 'wb') as f:
-            pickle.dump(model_data, f)
         
-        logger.info("Saved CB model to: %s", model_path)
+        logger.info("Saved CB model to: %s", version_dir)
         
-        return {'model_path': model_path}
+        return {'model_path': str(version_dir)}
     
     def train_model(self) -> Dict[str, str]:
         """
@@ -144,6 +154,9 @@ class CBModelTrainer:
             Dict with paths to saved model files
         """
         try:
+            # read the event offset before the users, so changes made during the fetch are replayed.
+            events_seq = current_seq()
+
             # featch users.
             users = self.fetch_users()
 
@@ -152,7 +165,7 @@ class CBModelTrainer:
 
             # save model.
             feature_names = self.feature_engineer.feature_names
-            saved_files = self.save_model(features, usernames, feature_names)
+            saved_files = self.save_model(features, usernames, feature_names, events_seq)
 
             return saved_files
         except Exception as e:
@@ -162,8 +175,28 @@ class CBModelTrainer:
             self.close()
     
 
+def convert_legacy_model(pickle_path: str, output_dir: Optional[str] = None) -> Path:
+    """Write a legacy cb_model.pkl as a new version of the CB store, without Neo4j."""
+    artifact = load_model(pickle_path)
+    features = artifact.unit_matrix * artifact.norms[:, None]
+    return save_matrix(
+        output_dir or _output_dir(),
+        artifact.vocab[:],
+        features,
+        extra_meta={'feature_names': artifact.meta['feature_names'], 'n_features': features.shape[1], 'source': str(pickle_path)},
+        neighbors_k=neighbors_k_from_env(),
+    )
+
+
 def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--convert", default=None, help="Convert this legacy cb_model.pkl instead of training")
+    args = parser.parse_args()
+
+    if args.convert:
+        print(convert_legacy_model(args.convert))
+        return
     trainer = CBModelTrainer()
     trainer.train_model()
 
@@ -1,57 +1,183 @@
 """
 CF-based recommender using pre-trained Node2Vec embeddings.
-Loads cf_embeddings.pkl and provides a recommendation API (similar users, recommend to follow).
+Memory-maps the versioned embedding store written by Node2VecTrainer (rec_system.index.store)
+and provides a recommendation API (similar users, recommend to follow).
 """
 
 import os
 import pickle
+import logging
 from pathlib import Path
 from typing import List, Tuple, Optional, Set
 
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
 from dotenv import load_dotenv
 
+from ml_service.rec_system.index.ann import ANNConfig, build_ann_index
+from ml_service.rec_system.index.exact import ExactIndex, indices_of
+from ml_service.rec_system.index.quantization import QUANTIZATION_MODES
+from ml_service.rec_system.index.registry import ModelRegistry, artifact_version
+from ml_service.rec_system.index.store import MatrixArtifact, artifact_from_arrays, load_matrix, validate
+
 load_dotenv()
 
-# Default path: ml_service/rec_system/data/embeddings/cf_embeddings.pkl
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+# Default path: ml_service/rec_system/data/embeddings/cf (store root, see rec_system.index.store)
 _DEFAULT_EMBEDDINGS_PATH = str(
+    Path(__file__).resolve().parent.parent / "data" / "embeddings" / "cf"
+)
+# Pre-store format, still read when no store has been written yet
+_LEGACY_EMBEDDINGS_PATH = str(
     Path(__file__).resolve().parent.parent / "data" / "embeddings" / "cf_embeddings.pkl"
 )
 ENV_EMBEDDINGS_PATH = "EMBEDDINGS_PATH"
+# ANN settings are read from CF_ANN_* env vars (see rec_system.index.ann.ANNConfig)
+ANN_ENV_PREFIX = "CF"
+# In-memory scalar quantization of the matrix: none | float16 | int8 (see rec_system.index.quantization)
+ENV_QUANTIZATION = "CF_QUANTIZATION"
+
+
+def resolve_embeddings_path(embeddings_path: Optional[str] = None) -> Path:
+    """
+    Embeddings location: the given path, else EMBEDDINGS_PATH env var or the default store root,
+    falling back to the legacy cf_embeddings.pkl if no store exists.
+    """
+    if embeddings_path is None:
+        embeddings_path = os.getenv(ENV_EMBEDDINGS_PATH) or _DEFAULT_EMBEDDINGS_PATH
+        if not Path(embeddings_path).exists() and Path(_LEGACY_EMBEDDINGS_PATH).exists():
+            embeddings_path = _LEGACY_EMBEDDINGS_PATH
+    return Path(embeddings_path)
+
+
+def load_embeddings(embeddings_path: Optional[str] = None, version: Optional[str] = None) -> MatrixArtifact:
+    """
+    Load CF embeddings: a store root / version directory (memory-mapped), or a legacy .pkl.
+
+    Args:
+        embeddings_path: See resolve_embeddings_path().
+        version: For a store root, load this version instead of CURRENT.
+    """
+    path = resolve_embeddings_path(embeddings_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Embeddings file not found: {path}")
+
+    if path.suffix == ".pkl":
+        logger.warning("Loading legacy pickle embeddings from %s; convert with rec_system.index.store", path)
+        with open(path, "rb") as f:
+            raw = pickle.load(f)
+        names = list(raw.keys())
+        return artifact_from_arrays(names, np.asarray([raw[u] for u in names], dtype=np.float32), {"source": str(path)})
+    if version is not None and (path / version).is_dir():
+        path = path / version
+    return load_matrix(path)
+
+
+class _CFModel:
+    """One immutable embeddings version and the indexes built over it."""
+
+    def __init__(self, artifact: MatrixArtifact, ann_config: ANNConfig, quantization: str = ""):
+        if quantization and quantization not in QUANTIZATION_MODES:
+            logger.warning("Unknown %s='%s', serving %s", ENV_QUANTIZATION, quantization, artifact.quantization)
+        elif quantization and quantization != artifact.quantization:
+            artifact = artifact.quantized(quantization)
+            logger.info("Quantized CF embeddings to %s", quantization)
+
+        # Rows are unit-normalized and sorted by username; nothing is copied into Python objects
+        self.artifact = artifact
+        self.usernames = artifact.vocab
+        self.username_to_idx = artifact.vocab.index
+        self.embeddings_matrix = artifact.unit_matrix
+
+        self.exact_index = ExactIndex(self.embeddings_matrix, normalized=True, scales=artifact.scales)
+        # ANN index for top-k lookups; None means exact search. FAISS indexes float32 vectors.
+        ann_matrix = self.embeddings_matrix if artifact.quantization == "none" else artifact.dequantized()
+        self.ann_index = build_ann_index(ann_matrix, ann_config)
+        # Precomputed top-K per user written by the trainer; None if the artifact has no table
+        self.neighbors = artifact.neighbors
+
+
+def _validate_model(new: _CFModel, old: _CFModel):
+    """Reject a reloaded version whose embeddings do not fit the one being served."""
+    validate(new.artifact.unit_matrix, new.artifact.norms, new.usernames, expected_dim=old.embeddings_matrix.shape[1])
+
 
 class CFRecommender:
     """Collaborative filtering recommender using Node2Vec embeddings (trained on follow-graph walks)."""
 
-    def __init__(self, embeddings_path: Optional[str] = None):
+    def __init__(
+        self,
+        embeddings_path: Optional[str] = None,
+        ann_config: Optional[ANNConfig] = None,
+        quantization: Optional[str] = None,
+        reload_interval: Optional[int] = None,
+    ):
         """
-        Initialize recommender by loading pre-trained embeddings.
+        Initialize recommender by memory-mapping pre-trained embeddings.
 
         Args:
-            embeddings_path: Path to cf_embeddings.pkl. If None, uses EMBEDDINGS_PATH env var
-                             or default ml_service/rec_system/data/embeddings/cf_embeddings.pkl.
+            embeddings_path: Embedding store root/version dir, or a legacy .pkl. If None, uses
+                             EMBEDDINGS_PATH env var or default ml_service/rec_system/data/embeddings/cf.
+            ann_config: ANN backend settings. If None, read from CF_ANN_* env vars.
+            quantization: none | float16 | int8. If None, uses CF_QUANTIZATION env var; when unset,
+                          the artifact is served in the dtype it was saved with.
+            reload_interval: Seconds between checks for a newly published version (0 disables).
+                             If None, uses MODEL_RELOAD_INTERVAL env var.
         """
-        if embeddings_path is None:
-            embeddings_path = os.getenv(ENV_EMBEDDINGS_PATH) or _DEFAULT_EMBEDDINGS_PATH
+        path = resolve_embeddings_path(embeddings_path)
+        ann_config = ann_config or ANNConfig.from_env(ANN_ENV_PREFIX)
+        quantization = quantization or (os.getenv(ENV_QUANTIZATION) or "").strip().lower()
 
-        path = Path(embeddings_path)
-        if not path.exists():
-            raise FileNotFoundError(f"Embeddings file not found: {path}")
+        # Every request reads self.registry.current once, so a reload never mixes two versions
+        self.registry = ModelRegistry(
+            "cf",
+            version_fn=lambda: artifact_version(path),
+            load_fn=lambda version: _CFModel(load_embeddings(str(path), version), ann_config, quantization),
+            validate_fn=_validate_model,
+        )
+        self.registry.start(reload_interval)
 
-        with open(path, "rb") as f:
-            raw = pickle.load(f)
-        self.embeddings_dict = {k: np.asarray(v, dtype=np.float32) for k, v in raw.items()}
+    def close(self):
+        """Stop the reload watcher."""
+        self.registry.stop()
 
-        self.usernames = list(self.embeddings_dict.keys())
-        self.embeddings_matrix = np.array(
-            [self.embeddings_dict[u] for u in self.usernames],
-            dtype=np.float32,
-        )
-        self.username_to_idx = {u: i for i, u in enumerate(self.usernames)}
+    # Attributes of the live version, for callers that read the model directly
+    @property
+    def artifact(self) -> MatrixArtifact:
+        return self.registry.current.artifact
+
+    @property
+    def usernames(self):
+        return self.registry.current.usernames
+
+    @property
+    def username_to_idx(self):
+        return self.registry.current.username_to_idx
+
+    @property
+    def embeddings_matrix(self) -> np.ndarray:
+        return self.registry.current.embeddings_matrix
+
+    @property
+    def exact_index(self) -> ExactIndex:
+        return self.registry.current.exact_index
+
+    @property
+    def ann_index(self):
+        return self.registry.current.ann_index
+
+    def bytes_per_user(self) -> int:
+        """Resident bytes per user of the exact-search matrix (codes + per-row scale)."""
+        artifact = self.artifact
+        scale_bytes = artifact.scales.itemsize if artifact.scales is not None else 0
+        return artifact.unit_matrix.shape[1] * artifact.unit_matrix.itemsize + scale_bytes
     
     def get_embedding(self, username: str) -> Optional[np.ndarray]:
         """Return embedding vector for a user, or None if not in vocab."""
-        return self.embeddings_dict.get(username)
+        model = self.registry.current
+        idx = model.username_to_idx.get(username)
+        return None if idx is None else model.artifact.vector(idx)
     
     def get_similar_users(
         self,
@@ -63,29 +189,51 @@ class CFRecommender:
         Return k most similar users by embedding cosine similarity (descending).
         Target user is always excluded. Optionally exclude additional usernames.
         """
-        if username not in self.username_to_idx:
+        model = self.registry.current
+        if username not in model.username_to_idx:
             print(f"User '{username}' not in embeddings")
             return []
 
         exclude = set(exclude_users or set())
         exclude.add(username)
 
-        target_idx = self.username_to_idx[username]     # grab user's index
-        target_emb = self.embeddings_matrix[target_idx].reshape(1, -1)  # grab user's embedding
-        similarities = cosine_similarity(target_emb, self.embeddings_matrix)[0]  # calculate similarities
-        sorted_indices = np.argsort(similarities)[::-1]     # heap: sort indices by similarity descending
-
-        # grab k most similar users
-        results = []
-        for idx in sorted_indices:
-            candidate = self.usernames[idx]
-            if candidate in exclude:
-                continue
-            results.append((candidate, float(similarities[idx])))
-            if len(results) >= k:
-                break
-        return results
+        target_idx = model.username_to_idx[username]     # grab user's index
+        exclude_idx = indices_of(exclude, model.username_to_idx)
+
+        # precomputed table: slice + exclusion filter, no scoring at all
+        if model.neighbors is not None:
+            hit = model.neighbors.lookup(target_idx, k, exclude_idx)
+            if hit is not None:
+                return [(model.usernames[i], float(s)) for i, s in zip(*hit)]
+
+        if model.ann_index is not None:
+            results = self._ann_similar_users(model, model.exact_index.rows(target_idx), k, exclude_idx)
+            if results is not None:
+                return results
+
+        # exact: one dot product against the pre-normalized matrix + argpartition top-k
+        ids, scores = model.exact_index.search_row(target_idx, k, exclude_idx)
+        return [(model.usernames[i], float(s)) for i, s in zip(ids, scores)]
     
+    @staticmethod
+    def _ann_similar_users(
+        model: _CFModel,
+        target_emb: np.ndarray,
+        k: int,
+        exclude_idx: np.ndarray,
+    ) -> Optional[List[Tuple[str, float]]]:
+        """
+        Top-k via the ANN index, over-fetching by len(exclude_idx) so filtering still leaves k.
+        Returns None if the index could not supply k candidates (caller falls back to exact).
+        """
+        scores, ids = model.ann_index.search(target_emb, k + len(exclude_idx))
+        scores, ids = scores[0], ids[0]
+        keep = (ids >= 0) & ~np.isin(ids, exclude_idx)
+        ids, scores = ids[keep][:k], scores[keep][:k]
+        if len(ids) < k:
+            return None
+        return [(model.usernames[i], float(s)) for i, s in zip(ids, scores)]
+
     def recommend_users(
         self,
         username: str,
@@ -113,18 +261,46 @@ class CFRecommender:
         usernames: List[str],
         k: int = 10,
         already_following_dict: Optional[dict] = None,
+        min_similarity: float = 0.0,
+        block_rows: Optional[int] = None,
     ) -> dict:
         """
-        Recommendations for multiple users.
-        Returns {username: [(recommended_user, score), ...]}.
+        Recommendations for multiple users: served from the precomputed neighbour table where
+        possible, the rest computed as blocked matrix multiplications (query block x all
+        embeddings) with per-row top-k and per-row exclusions.
+        Returns {username: [(recommended_user, score), ...]}; users not in vocab get [].
         already_following_dict: optional {username: set of usernames they follow}.
+        block_rows: users per GEMM block; default bounds each block's score buffer to ~256MB.
         """
+        model = self.registry.current
         already_following_dict = already_following_dict or {}
-        return {
-            u: self.recommend_users(u, k=k, already_following=already_following_dict.get(u, set()))
-            for u in usernames
-        }
+        results = {u: [] for u in usernames}
+        known = [u for u in results if u in model.username_to_idx]
+        if not known:
+            return results
 
+        rows = np.fromiter((model.username_to_idx[u] for u in known), dtype=np.int64, count=len(known))
+        exclude_idx = [
+            np.append(indices_of(already_following_dict.get(u, ()), model.username_to_idx), row)
+            for u, row in zip(known, rows)
+        ]
+        # Users the neighbour table can answer skip the GEMM entirely
+        hits = {}
+        if model.neighbors is not None:
+            for pos, (row, excluded) in enumerate(zip(rows, exclude_idx)):
+                hit = model.neighbors.lookup(row, k, excluded)
+                if hit is not None:
+                    hits[pos] = hit
+        misses = [pos for pos in range(len(known)) if pos not in hits]
+        if misses:
+            searched = model.exact_index.search_rows(rows[misses], k, [exclude_idx[pos] for pos in misses], block_rows)
+            hits.update(zip(misses, searched))
+
+        for pos, u in enumerate(known):
+            ids, scores = hits[pos]
+            keep = scores >= min_similarity
+            results[u] = [(model.usernames[i], float(s)) for i, s in zip(ids[keep], scores[keep])]
+        return results
 
 def main():
     """Demo: load embeddings and print recommendations for a user."""
@@ -154,6 +330,8 @@ def main():
         for i, (rec, score) in enumerate(user_recs, 1):
             print(f"    {i}. {rec} ({score:.3f})")
 
+    recommender.close()
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
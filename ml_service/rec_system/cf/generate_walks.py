@@ -1,18 +1,22 @@
 """Generate random walks for the CF model. All settings via env vars.
-Falls back to Cypher + in-memory Python walks if GDS is not available.
+Falls back to Cypher + in-memory NumPy walks over a CSR graph (rec_system.cf.walk_engine)
+if GDS is not available.
 """
 
 import os
-import random
 import logging
+from array import array
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
+import numpy as np
 from dotenv import load_dotenv
 from neo4j import GraphDatabase
 from neo4j.exceptions import ClientError
 
+from ml_service.rec_system.cf.walk_engine import CSRGraph, WalkCorpus
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO, format="%(message)s")
@@ -69,58 +73,50 @@ class RandomWalkGenerator:
             self.driver.close()
             self.driver = None
 
-    def _load_graph_cypher(self) -> dict:
-        """Load User-FOLLOWS graph via Cypher. Returns adjacency: username -> [neighbor usernames]."""
+    def _load_graph_cypher(self) -> CSRGraph:
+        """Load User-FOLLOWS graph via Cypher into an int32 CSR graph (node ids in first-seen order)."""
         query = """
         MATCH (u:User)-[:FOLLOWS]->(v:User)
         RETURN u.name AS src, v.name AS dst
         """
+        node_ids = {}
+        src, dst = array("i"), array("i")
         with self._session() as session:
-            result = session.run(query)
-            adj = {}
-            for record in result:
-                src, dst = record["src"], record["dst"]
-                if src and dst:
-                    adj.setdefault(src, []).append(dst)
+            for record in session.run(query):
+                u, v = record["src"], record["dst"]
+                if u and v:
+                    src.append(node_ids.setdefault(u, len(node_ids)))
+                    dst.append(node_ids.setdefault(v, len(node_ids)))
             for record in session.run("MATCH (u:User) RETURN u.name AS username"):
                 u = record["username"]
-                if u and u not in adj:
-                    adj[u] = []
-        return adj
+                if u:
+                    node_ids.setdefault(u, len(node_ids))
+        return CSRGraph.from_edges(
+            np.frombuffer(src, dtype=np.int32), np.frombuffer(dst, dtype=np.int32), list(node_ids)
+        )
 
     def _walks_python_fallback(
         self,
         walk_length: int,
         walks_per_node: int,
         random_seed: int,
-    ) -> list:
-        """Generate random walks in Python from Cypher-loaded graph (no GDS)."""
-        adjacency = self._load_graph_cypher()
-        random.seed(random_seed)
-        # Start from nodes that have at least one out-neighbor (so we can extend the walk)
-        start_nodes = [u for u, nbrs in adjacency.items() if u and nbrs]
-        if not start_nodes:
-            # No FOLLOWS edges: emit single-node "walks" so we still have something per user
-            all_users = [u for u in adjacency if u]
-            if not all_users:
-                logger.warning("No User nodes found in graph")
-                return []
+    ) -> Union[WalkCorpus, list]:
+        """Generate random walks with the NumPy CSR engine from the Cypher-loaded graph (no GDS)."""
+        graph = self._load_graph_cypher()
+        if graph.n_nodes == 0:
+            logger.warning("No User nodes found in graph")
+            return []
+        # Walks start from nodes with at least one out-neighbour; with no FOLLOWS edges at all,
+        # every user gets single-node "walks" so we still have something per user
+        n_starts = int(np.count_nonzero(graph.out_degree))
+        if n_starts == 0:
             logger.warning("No FOLLOWS edges in graph; emitting single-node walks only")
-            return [[u] for u in all_users for _ in range(walks_per_node)]
-        walks = []
-        n_walks = walks_per_node * len(start_nodes)
-        for _ in range(n_walks):
-            current = random.choice(start_nodes)
-            walk = [current]
-            for _ in range(walk_length - 1):
-                nbrs = adjacency.get(current)
-                if not nbrs:
-                    break
-                current = random.choice(nbrs)
-                walk.append(current)
-            walks.append(walk)
-        logger.info("Generated %d random walks (Cypher fallback, no GDS)", len(walks))
-        return walks
+            n_starts = graph.n_nodes
+        logger.info(
+            "Generating %d random walks over %d nodes / %d edges (Cypher fallback, no GDS)",
+            walks_per_node * n_starts, graph.n_nodes, len(graph.indices),
+        )
+        return WalkCorpus(graph, walk_length, walks_per_node, random_seed)
 
     def create_graph(self, session, graph_name: str):
         """Drop existing projection if present, then create User/FOLLOWS graph."""
@@ -202,14 +198,19 @@ class RandomWalkGenerator:
         logger.info("Generated %d random walks", len(walks))
         return walks
 
-    def save_walks(self, walks: list, output_dir: str) -> str:
+    def save_walks(self, walks: Union[WalkCorpus, list], output_dir: str) -> str:
+        """Write walks (lists of usernames, or a WalkCorpus generated batch by batch) one per line."""
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         output_file = os.path.join(output_dir, f"random_walks_{timestamp}.txt")
         with open(output_file, "w") as f:
-            for walk in walks:
-                f.write(" ".join(walk) + "\n")
-        logger.info("Saved %d walks to %s", len(walks), output_file)
+            if isinstance(walks, WalkCorpus):
+                n_walks = walks.write(f)
+            else:
+                for walk in walks:
+                    f.write(" ".join(walk) + "\n")
+                n_walks = len(walks)
+        logger.info("Saved %d walks to %s", n_walks, output_file)
         return output_file
 
     def run_pipeline(
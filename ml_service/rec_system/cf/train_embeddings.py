@@ -10,7 +10,9 @@ from typing import Optional
 
 from dotenv import load_dotenv
 from gensim.models import Word2Vec
-import pickle
+
+from ml_service.rec_system.index.neighbors import DEFAULT_NEIGHBORS_K, ENV_NEIGHBORS_K
+from ml_service.rec_system.index.store import save_matrix
 
 load_dotenv()
 
@@ -26,6 +28,7 @@ ENV_EPOCHS = "EPOCHS"
 ENV_WORKERS = "WORKERS"
 ENV_MODELS_OUTPUT_DIR = "MODELS_OUTPUT_DIR"
 ENV_EMBEDDINGS_OUTPUT_DIR = "EMBEDDINGS_OUTPUT_DIR"
+ENV_EMBEDDINGS_DTYPE = "EMBEDDINGS_DTYPE"  # float32 (default), float16 or int8 (+ per-row scales) on disk
 
 _DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 _DEFAULT_MODELS_OUTPUT_DIR = str(_DATA_DIR / "models")
@@ -56,6 +59,9 @@ class Node2VecTrainer:
         self.workers = _int_env(ENV_WORKERS, 4)
         self.models_dir = os.getenv(ENV_MODELS_OUTPUT_DIR, _DEFAULT_MODELS_OUTPUT_DIR)
         self.embeddings_dir = os.getenv(ENV_EMBEDDINGS_OUTPUT_DIR, _DEFAULT_EMBEDDINGS_OUTPUT_DIR)
+        self.embeddings_dtype = os.getenv(ENV_EMBEDDINGS_DTYPE, "float32")
+        # Top-K similar users precomputed per user and stored with the embeddings (0 = off)
+        self.neighbors_k = _int_env(ENV_NEIGHBORS_K, DEFAULT_NEIGHBORS_K)
 
     def load_walks(self, walks_file: str) -> list:
         """
@@ -138,7 +144,9 @@ class Node2VecTrainer:
     def save_model(self, model: Word2Vec, walks_file: str) -> dict:
         """
         Save trained model to models dir and embeddings to embeddings dir.
-        Filenames: cf_model.model, cf_embeddings.pkl (no timestamp).
+        Model: cf_model.model. Embeddings: a new version of the memory-mappable store
+        at <embeddings_dir>/cf (see rec_system.index.store), made CURRENT once fully written,
+        including the top-K neighbour table (rec_system.index.neighbors).
         """
         Path(self.models_dir).mkdir(parents=True, exist_ok=True)
         Path(self.embeddings_dir).mkdir(parents=True, exist_ok=True)
@@ -147,18 +155,24 @@ class Node2VecTrainer:
         model.save(model_path)
         print("Saved Word2Vec model to: %s", model_path)
 
-        embeddings_path = os.path.join(self.embeddings_dir, "cf_embeddings.pkl")
-        embeddings_dict = {
-            username: model.wv[username].tolist()
-            for username in model.wv.index_to_key
-        }
-        with open(embeddings_path, "wb") as f:
-            pickle.dump(embeddings_dict, f)
+        embeddings_path = save_matrix(
+            Path(self.embeddings_dir) / "cf",
+            model.wv.index_to_key,
+            model.wv.vectors,
+            dtype=self.embeddings_dtype,
+            extra_meta={
+                "walks_file": str(walks_file),
+                "vector_size": self.vector_size,
+                "window": self.window,
+                "epochs": self.epochs,
+            },
+            neighbors_k=self.neighbors_k,
+        )
         print("Saved embeddings to: %s", embeddings_path)
 
         return {
             "model_path": model_path,
-            "embeddings_path": embeddings_path,
+            "embeddings_path": str(embeddings_path),
         }
 
     def run_pipeline(self, walks_file: str) -> dict:
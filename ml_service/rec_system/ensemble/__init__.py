@@ -1,3 +1,6 @@
 from .hybrid_recommender import HybridRecommender
+from .pipeline import RecommendationPipeline
+from .reranker import Reranker
+from .train_reranker import RerankerTrainer
 
-__all__ = ["HybridRecommender"]
\ No newline at end of file
+__all__ = ["HybridRecommender", "RecommendationPipeline", "Reranker", "RerankerTrainer"]
\ No newline at end of file
@@ -1,97 +1,359 @@
 """
 Hybrid recommender system.
 Uses content-based and collaborative filtering to recommend users.
+CF and CB are queried concurrently, each under its own timeout; if one source
+fails, times out or is saturated, the other source's results are returned on their own.
 """
 
+import os
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
 from ml_service.rec_system.cb.cb_recommender import CBRecommender
 from ml_service.rec_system.cf.cf_recommender import CFRecommender
 from ml_service.knowledge_graph.methods.user import User
-from typing import List, Tuple
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+# Per-source timeouts (milliseconds) for the concurrent CF/CB fan-out
+ENV_CF_TIMEOUT_MS = "HYBRID_CF_TIMEOUT_MS"
+ENV_CB_TIMEOUT_MS = "HYBRID_CB_TIMEOUT_MS"
+ENV_BATCH_TIMEOUT_MS = "HYBRID_BATCH_TIMEOUT_MS"  # per source, for batch_recommend
+ENV_MAX_WORKERS = "HYBRID_MAX_WORKERS"  # per source: max in-flight calls
+
+SOURCES = ("cf", "cb")
+
+
+def _int_env(key: str, default: int) -> int:
+    """Parse int from env var with fallback."""
+    raw = os.getenv(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning("Invalid int for %s='%s', using default %d", key, raw, default)
+        return default
+
 
 class HybridRecommender:
-    def __init__(self):
-        self.cb_recommender = CBRecommender()
-        self.cf_recommender = CFRecommender()
-        self.user_methods = User()
+    def __init__(
+        self,
+        cf_recommender: Optional[CFRecommender] = None,
+        cb_recommender: Optional[CBRecommender] = None,
+        user_methods: Optional[User] = None,
+    ):
+        """
+        Args:
+            cf_recommender, cb_recommender, user_methods: Shared instances to reuse (e.g. per-process
+                singletons in the recommendations route); created here when not given.
+        """
+        self.cb_recommender = cb_recommender or CBRecommender()
+        self.cf_recommender = cf_recommender or CFRecommender()
+        self.user_methods = user_methods or User()
         self.cf_weight = 0.5
         self.cb_weight = 0.5
         self.k = 10
         self.follower_threshold = 10
         self.model_name = "weighted"
+
+        self.cf_timeout = _int_env(ENV_CF_TIMEOUT_MS, 250) / 1000.0
+        self.cb_timeout = _int_env(ENV_CB_TIMEOUT_MS, 500) / 1000.0
+        self.batch_timeout = _int_env(ENV_BATCH_TIMEOUT_MS, 5000) / 1000.0
+        # One pool per source, sized to its in-flight limit. A timed-out call cannot be cancelled and
+        # keeps its slot until it returns; when every slot is busy the source is skipped, not queued.
+        max_workers = max(1, _int_env(ENV_MAX_WORKERS, 4))
+        self._executors = {
+            source: ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"hybrid-{source}")
+            for source in SOURCES
+        }
+        self._slots = {source: threading.BoundedSemaphore(max_workers) for source in SOURCES}
+
+    def close(self):
+        """Shut down the fan-out pools (does not wait for timed-out calls)."""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+
+    def _submit(self, source: str, call: Callable):
+        """
+        Start `call` on the source's pool if it has a free slot.
+
+        Returns:
+            (future, started) where started[0] is set to the call's monotonic start time once it runs,
+            or None when the source is saturated.
+        """
+        slots = self._slots[source]
+        if not slots.acquire(blocking=False):
+            return None
+        started = [None]
+
+        def run():
+            started[0] = time.monotonic()
+            try:
+                return call()
+            finally:
+                slots.release()
+
+        try:
+            return self._executors[source].submit(run), started
+        except Exception:
+            slots.release()
+            raise
+
+    @staticmethod
+    def _wait(future, started: list, submitted: float, timeout: float):
+        """Wait for `future` until `timeout` after the call started (or was submitted, if it has not started)."""
+        while True:
+            start = started[0] or submitted
+            try:
+                return future.result(timeout=max(0.0, start + timeout - time.monotonic()))
+            except FuturesTimeoutError:
+                if (started[0] or submitted) == start:
+                    raise
+
+    def _fan_out(
+        self,
+        cf_call: Callable,
+        cb_call: Callable,
+        cf_timeout: float,
+        cb_timeout: float,
+    ) -> Tuple[Optional[object], Optional[object]]:
+        """
+        Run the CF and CB calls concurrently on their own pools, each bounded by its own timeout
+        measured from when the call starts, so the wait is max(cf_timeout, cb_timeout) rather than their sum.
+        A source whose in-flight limit is reached is skipped immediately.
+
+        Returns:
+            (cf_result, cb_result); None for a source that failed, timed out or was saturated.
+
+        Raises:
+            RuntimeError: both sources failed, timed out or were saturated.
+        """
+        submitted = time.monotonic()
+        calls = {
+            "cf": (self._submit("cf", cf_call), cf_timeout),
+            "cb": (self._submit("cb", cb_call), cb_timeout),
+        }
+        results = {}
+        for source, (pending, timeout) in calls.items():
+            if pending is None:
+                logger.warning("<hybrid> %s is saturated; using the other source only", source)
+                results[source] = None
+                continue
+            future, started = pending
+            try:
+                results[source] = self._wait(future, started, submitted, timeout)
+            except FuturesTimeoutError:
+                logger.warning("<hybrid> %s timed out after %d ms; using the other source only", source, timeout * 1000)
+                results[source] = None
+            except Exception as e:
+                logger.error("<hybrid> %s failed; using the other source only: %s", source, e)
+                results[source] = None
+        if results["cf"] is None and results["cb"] is None:
+            raise RuntimeError("Both CF and CB recommenders failed or timed out")
+        return results["cf"], results["cb"]
     
-    def _weighted_recommender(self, username: str) -> List[Tuple[str, float]]:
+    def _weighted_recommender(
+        self,
+        username: str,
+        k: Optional[int] = None,
+        already_following: Optional[Set[str]] = None,
+    ) -> List[Tuple[str, float]]:
         """
         Recommend users for a given username using a weighted combination of content-based and collaborative filtering.
 
         Args:
             username: The username of the user to recommend users for.
+            k: Number of recommendations (default self.k).
+            already_following: Usernames to exclude from both sources.
 
         Returns:
             A list of tuples of (username, score) sorted by score (descending).
         """
-        # grab results from both recommenders.
-        cf_result = self.cf_recommender.recommend_users(username=username, k=self.k)
-        cb_result = self.cb_recommender.recommend_users(username=username, k=self.k)
+        k = k or self.k
 
-        # Convert to dictionaries for easy lookup
-        cf_scores = {user: score for user, score in cf_result}
-        cb_scores = {user: score for user, score in cb_result}
+        # grab results from both recommenders, concurrently.
+        cf_result, cb_result = self._fan_out(
+            lambda: self.cf_recommender.recommend_users(username=username, k=k, already_following=already_following),
+            lambda: self.cb_recommender.recommend_users(username=username, k=k, already_following=already_following),
+            self.cf_timeout,
+            self.cb_timeout,
+        )
+        return self._combine(cf_result, cb_result, k)
+
+    def _combine(
+        self,
+        cf_result: Optional[List[Tuple[str, float]]],
+        cb_result: Optional[List[Tuple[str, float]]],
+        k: int,
+    ) -> List[Tuple[str, float]]:
+        """
+        Weighted sum of min-max normalized CF and CB scores over the union of both lists, top-k descending.
+        A source that is None (failed / timed out) is left out and the weights are renormalized.
+        """
+        sources = [
+            (result, weight)
+            for result, weight in ((cf_result, self.cf_weight), (cb_result, self.cb_weight))
+            if result is not None
+        ]
+        total_weight = sum(weight for _, weight in sources) or 1.0
 
-        # Normalize scores BEFORE combining
-        # cf_scores = HybridRecommender._normalize_scores(cf_scores)
-        # cb_scores = HybridRecommender._normalize_scores(cb_scores)
-        
         # get union of all users.
-        all_users = set(cf_scores.keys()) | set(cb_scores.keys())
+        users = list(dict.fromkeys(user for result, _ in sources for user, _ in result))
+        if not users:
+            return []
+        position = {user: i for i, user in enumerate(users)}
 
-        # combine results based on weights.
-        combined_scores = []
-        for user in all_users:
-            cf_score = cf_scores.get(user, 0)
-            cb_score = cb_scores.get(user, 0)
+        # combine results based on weights; users missing from a source get 0 from it.
+        combined = np.zeros(len(users))
+        for result, weight in sources:
+            if not result:
+                continue
+            idx = np.fromiter((position[user] for user, _ in result), dtype=np.int64, count=len(result))
+            scores = np.fromiter((score for _, score in result), dtype=np.float64, count=len(result))
+            # Normalize scores BEFORE combining
+            combined[idx] += HybridRecommender._normalize_array(scores) * (weight / total_weight)
 
-            # weighted combination of scores.
-            combined_score = cf_score * self.cf_weight + cb_score * self.cb_weight
-            combined_scores.append((user, combined_score))
-        
         # Sort by combined score (descending) and return top-k
-        combined_scores.sort(key=lambda x: x[1], reverse=True)
-        return combined_scores[:self.k]
+        order = np.argsort(-combined, kind="stable")[:k]
+        return [(users[i], float(combined[i])) for i in order]
 
-    def _switch_recommender(self, username: str) -> List[Tuple[str, float]]:
+    def _switch_recommender(
+        self,
+        username: str,
+        k: Optional[int] = None,
+        already_following: Optional[Set[str]] = None,
+    ) -> List[Tuple[str, float]]:
         """
         Recommend users for a given username using a switch between content-based and collaborative filtering.
 
         Args:
             username: The username of the user to recommend users for.
+            k: Number of recommendations (default self.k).
+            already_following: Usernames to exclude.
 
         Returns:
             A list of tuples of (username, score) sorted by score (descending).
         """
-        # grab number of followers from the user.
+        k = k or self.k
+
+        # grab number of followers from the user (count-only query, served from the degree cache).
         number_of_followers = self.user_methods.get_number_of_followers(username=username)
         if number_of_followers >= self.follower_threshold:
             print(f"Using collaborative filtering for user: {username}")
-            return self.cf_recommender.recommend_users(username=username, k=self.k)
+            return self.cf_recommender.recommend_users(username=username, k=k, already_following=already_following)
 
         print(f"Using content-based filtering for user: {username}")
-        return self.cb_recommender.recommend_users(username=username, k=self.k)
+        return self.cb_recommender.recommend_users(username=username, k=k, already_following=already_following)
     
-    def recommend(self, username: str) -> List[Tuple[str, float]]:
+    def recommend(
+        self,
+        username: str,
+        k: Optional[int] = None,
+        already_following: Optional[Set[str]] = None,
+        min_similarity: float = 0.0,
+        strategy: Optional[str] = None,
+    ) -> List[Tuple[str, float]]:
         """
         Recommend users for a given username.
         Args:
             username: The username of the user to recommend users for.
+            k: Number of recommendations (default self.k).
+            already_following: Usernames to exclude (e.g. users already followed).
+            min_similarity: Drop results scoring below this.
+            strategy: weighted | switched | cf | cb (default self.model_name).
 
         Returns:
             A list of tuples of (username, score) sorted by score (descending).
         """
-        if self.model_name == "weighted":
-            return self._weighted_recommender(username=username)
-        elif self.model_name == "switched":
-            return self._switch_recommender(username=username)
+        k = k or self.k
+        strategy = strategy or self.model_name
+        if strategy == "weighted":
+            results = self._weighted_recommender(username=username, k=k, already_following=already_following)
+        elif strategy == "switched":
+            results = self._switch_recommender(username=username, k=k, already_following=already_following)
+        elif strategy == "cf":
+            results = self.cf_recommender.recommend_users(username=username, k=k, already_following=already_following)
+        elif strategy == "cb":
+            results = self.cb_recommender.recommend_users(username=username, k=k, already_following=already_following)
         else:
-            raise ValueError(f"Invalid model name: {self.model_name}")
+            raise ValueError(f"Invalid model name: {strategy}")
+        return [(user, score) for user, score in results if score >= min_similarity]
+
+    def batch_recommend(
+        self,
+        usernames: List[str],
+        k: Optional[int] = None,
+        already_following_dict: Optional[Dict[str, Set[str]]] = None,
+        min_similarity: float = 0.0,
+        strategy: Optional[str] = None,
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        recommend() for several users. Every strategy goes through the recommenders' batched search;
+        switched routes users with one batched follower-count query.
+
+        Returns:
+            Dict of {username: [(recommended_user, score), ...]}.
+        """
+        k = k or self.k
+        strategy = strategy or self.model_name
+        already_following_dict = already_following_dict or {}
+        if strategy == "cf":
+            return self.cf_recommender.batch_recommend(usernames, k, already_following_dict, min_similarity)
+        if strategy == "cb":
+            return self.cb_recommender.batch_recommend(usernames, k, already_following_dict, min_similarity)
+        if strategy == "weighted":
+            cf_results, cb_results = self._fan_out(
+                lambda: self.cf_recommender.batch_recommend(usernames, k, already_following_dict),
+                lambda: self.cb_recommender.batch_recommend(usernames, k, already_following_dict),
+                self.batch_timeout,
+                self.batch_timeout,
+            )
+            return {
+                username: [
+                    (user, score) for user, score in self._combine(
+                        cf_results[username] if cf_results is not None else None,
+                        cb_results[username] if cb_results is not None else None,
+                        k,
+                    )
+                    if score >= min_similarity
+                ]
+                for username in dict.fromkeys(usernames)
+            }
+        if strategy == "switched":
+            return self._switch_batch_recommend(usernames, k, already_following_dict, min_similarity)
+        raise ValueError(f"Invalid model name: {strategy}")
+
+    def _switch_batch_recommend(
+        self,
+        usernames: List[str],
+        k: int,
+        already_following_dict: Dict[str, Set[str]],
+        min_similarity: float,
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Switched strategy for several users: follower counts come from one batched count query,
+        then each side runs one batched search over the users routed to it.
+        """
+        usernames = list(dict.fromkeys(usernames))
+        counts = self.user_methods.get_follow_counts_batch(usernames)
+        cf_users = [u for u in usernames if counts.get(u, {}).get("followers", 0) >= self.follower_threshold]
+        cf_set = set(cf_users)
+        cb_users = [u for u in usernames if u not in cf_set]
+        logger.info("<hybrid> Switched batch: %d users to CF, %d to CB", len(cf_users), len(cb_users))
+
+        results = {}
+        if cf_users:
+            results.update(self.cf_recommender.batch_recommend(cf_users, k, already_following_dict, min_similarity))
+        if cb_users:
+            results.update(self.cb_recommender.batch_recommend(cb_users, k, already_following_dict, min_similarity))
+        return results
     
     @staticmethod
     def _normalize_scores(scores_dict: dict) -> dict:
@@ -106,24 +368,22 @@ class HybridRecommender:
         """
         if not scores_dict:
             return {}
-        
-        scores = list(scores_dict.values())
-        min_score = min(scores)
-        max_score = max(scores)
-        
+        normalized = HybridRecommender._normalize_array(np.fromiter(scores_dict.values(), dtype=np.float64))
+        return dict(zip(scores_dict.keys(), normalized.tolist()))
+
+    @staticmethod
+    def _normalize_array(scores: np.ndarray) -> np.ndarray:
+        """Vectorized min-max normalization to [0, 1]; all-equal scores map to 1.0."""
+        if scores.size == 0:
+            return scores
+        min_score, max_score = scores.min(), scores.max()
         # Handle edge case: all scores are the same
         if max_score == min_score:
-            return {user: 1.0 for user in scores_dict}
-        
-        # Min-max normalization
-        normalized = {
-            user: (score - min_score) / (max_score - min_score)
-            for user, score in scores_dict.items()
-        }
-        
-        return normalized
+            return np.ones_like(scores)
+        return (scores - min_score) / (max_score - min_score)
 
 if __name__ == "__main__":
     hybrid_recommender = HybridRecommender()
     print(f"Weighted recommender:\n {hybrid_recommender._weighted_recommender(username='carlos_m')}\n\n")
-    print(f"Switch recommender:\n {hybrid_recommender._switch_recommender(username='carlos_m')}")
\ No newline at end of file
+    print(f"Switch recommender:\n {hybrid_recommender._switch_recommender(username='carlos_m')}")
+    hybrid_recommender.close()
\ No newline at end of file
@@ -0,0 +1,425 @@
+"""
+Multi-stage recommendation pipeline: retrieval -> features -> re-ranking.
+
+1. Retrieval: the candidate sources run concurrently under one latency budget:
+   CF nearest neighbours, CB nearest neighbours, friends-of-friends and event
+   co-attendance (plus the users' followers, used as a feature). A source that
+   fails or misses the budget is dropped for that request.
+2. Features: the union of every source's candidates, minus the user and the
+   users they already follow, is featurized as one matrix (ensemble.reranker.
+   FEATURE_NAMES). CF and CB similarity are computed for every candidate, not
+   only for the ones that source retrieved itself. Event co-attendance only
+   adds candidates: the re-ranker is trained without event data, so it is not
+   a feature and is not counted in n_sources.
+3. Re-ranking: the trained re-ranker scores all pairs of the request in one
+   call, then per-user top-k. Without a trained model, or when the request is
+   already past the retrieval + feature budgets, candidates are ordered by the
+   mean of their CF and CB similarity instead.
+
+Every stage records its latency and budget overruns in RecommendationPipeline.metrics.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ml_service.rec_system.cb.cb_recommender import CBRecommender
+from ml_service.rec_system.cf.cf_recommender import CFRecommender
+from ml_service.rec_system.ensemble.reranker import FEATURE_NAMES, Reranker, resolve_reranker_path, validate_reranker
+from ml_service.rec_system.ensemble.signals import GraphSignals
+from ml_service.rec_system.index.exact import ExactIndex, l2_normalize
+from ml_service.rec_system.index.registry import ModelRegistry, artifact_version
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+SOURCES = ("cf", "cb", "fof", "events")
+FEATURE_SOURCES = ("cf", "cb", "fof")  # sources counted in the n_sources feature
+STAGES = ("retrieval", "features", "rerank")
+
+ENV_CANDIDATES_PER_SOURCE = "PIPELINE_CANDIDATES_PER_SOURCE"
+# Stage budgets (milliseconds); 0 disables a budget
+ENV_RETRIEVAL_BUDGET_MS = "PIPELINE_RETRIEVAL_BUDGET_MS"
+ENV_BATCH_RETRIEVAL_BUDGET_MS = "PIPELINE_BATCH_RETRIEVAL_BUDGET_MS"  # retrieval for more than one user
+ENV_FEATURES_BUDGET_MS = "PIPELINE_FEATURES_BUDGET_MS"  # per user in the request
+ENV_RERANK_BUDGET_MS = "PIPELINE_RERANK_BUDGET_MS"  # per user in the request
+ENV_MAX_WORKERS = "PIPELINE_MAX_WORKERS"
+
+
+def _int_env(key: str, default: int) -> int:
+    """Parse int from env var with fallback."""
+    raw = os.getenv(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning("Invalid int for %s='%s', using default %d", key, raw, default)
+        return default
+
+
+class StageMetrics:
+    """Recent latencies and budget overruns of one pipeline stage."""
+
+    def __init__(self, window: int = 1024):
+        self.calls = 0
+        self.over_budget = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, budget_ms: float) -> bool:
+        """Record one run. Returns True if it went over budget."""
+        over = budget_ms > 0 and elapsed_ms > budget_ms
+        with self._lock:
+            self.calls += 1
+            self.over_budget += int(over)
+            self._latencies.append(elapsed_ms)
+        return over
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            latencies = np.fromiter(self._latencies, dtype=np.float64)
+            calls, over_budget = self.calls, self.over_budget
+        if latencies.size == 0:
+            return {"calls": calls, "over_budget": over_budget}
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        return {
+            "calls": calls,
+            "over_budget": over_budget,
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(latencies.max()), 3),
+        }
+
+
+class PipelineMetrics:
+    """Per-stage latencies plus per-source candidate, timeout and error counts."""
+
+    def __init__(self):
+        self.stages = {stage: StageMetrics() for stage in STAGES}
+        self.sources = {source: {"candidates": 0, "timeouts": 0, "errors": 0} for source in SOURCES + ("followers",)}
+        self.rerank_fallbacks = 0
+        self._lock = threading.Lock()
+
+    def count(self, source: str, field: str, n: int = 1):
+        with self._lock:
+            self.sources[source][field] += n
+
+    def count_fallback(self):
+        with self._lock:
+            self.rerank_fallbacks += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            sources = {source: dict(counts) for source, counts in self.sources.items()}
+            fallbacks = self.rerank_fallbacks
+        return {
+            "stages": {stage: metrics.snapshot() for stage, metrics in self.stages.items()},
+            "sources": sources,
+            "rerank_fallbacks": fallbacks,
+        }
+
+
+class RecommendationPipeline:
+    def __init__(
+        self,
+        cf_recommender: Optional[CFRecommender] = None,
+        cb_recommender: Optional[CBRecommender] = None,
+        signals=None,
+        reranker_path: Optional[str] = None,
+        reload_interval: Optional[int] = None,
+    ):
+        """
+        Args:
+            cf_recommender, cb_recommender: Shared instances to reuse; created here when not given.
+            signals: Graph signal provider (ensemble.signals); GraphSignals over Neo4j by default.
+            reranker_path: Trained re-ranker file. If None, uses RERANKER_PATH env var or the default.
+            reload_interval: Seconds between checks for a retrained re-ranker (0 disables).
+        """
+        self.cf_recommender = cf_recommender or CFRecommender()
+        self.cb_recommender = cb_recommender or CBRecommender()
+        self.signals = signals or GraphSignals()
+
+        path = resolve_reranker_path(reranker_path)
+        # None until a re-ranker has been trained; the pipeline then uses the fallback ordering
+        self.registry = ModelRegistry(
+            "reranker",
+            version_fn=lambda: artifact_version(path),
+            load_fn=lambda version: Reranker.load(path),
+            validate_fn=validate_reranker,
+        )
+        self.registry.start(reload_interval)
+
+        self.candidates_per_source = _int_env(ENV_CANDIDATES_PER_SOURCE, 100)
+        self.retrieval_budget_ms = _int_env(ENV_RETRIEVAL_BUDGET_MS, 300)
+        self.batch_retrieval_budget_ms = _int_env(ENV_BATCH_RETRIEVAL_BUDGET_MS, 5000)
+        self.features_budget_ms = _int_env(ENV_FEATURES_BUDGET_MS, 50)
+        self.rerank_budget_ms = _int_env(ENV_RERANK_BUDGET_MS, 20)
+        self.metrics = PipelineMetrics()
+        self._executor = ThreadPoolExecutor(
+            max_workers=_int_env(ENV_MAX_WORKERS, 8), thread_name_prefix="pipeline"
+        )
+
+    @property
+    def reranker(self) -> Optional[Reranker]:
+        return self.registry.current
+
+    def close(self):
+        """Stop the re-ranker reload watcher and the retrieval pool."""
+        self.registry.stop()
+        self._executor.shutdown(wait=False)
+
+    def retrieve(
+        self,
+        usernames: List[str],
+        already_following_dict: Dict[str, Set[str]],
+        budget_ms: int = 0,
+    ) -> Tuple[Dict[str, Dict[str, Dict[str, float]]], Dict[str, Set[str]]]:
+        """
+        Stage 1: run every candidate source, and the followers lookup, concurrently for all users.
+
+        Args:
+            usernames: Users to retrieve candidates for.
+            already_following_dict: {username: followed usernames}, excluded by the CF/CB searches.
+            budget_ms: Common deadline for all calls (0 = wait for every call).
+
+        Returns:
+            (retrieved, followers): retrieved[source][username] = {candidate: source score};
+            a source that failed or missed the budget contributes {}.
+        """
+        n = self.candidates_per_source
+        calls = {
+            "cf": lambda: self._as_dicts(self.cf_recommender.batch_recommend(usernames, n, already_following_dict)),
+            "cb": lambda: self._as_dicts(self.cb_recommender.batch_recommend(usernames, n, already_following_dict)),
+            "fof": lambda: self.signals.friends_of_friends(usernames, n),
+            "events": lambda: self.signals.co_attendees(usernames, n),
+            "followers": lambda: self.signals.followers(usernames),
+        }
+        deadline = time.monotonic() + budget_ms / 1000.0 if budget_ms > 0 else None
+        futures = {name: self._executor.submit(call) for name, call in calls.items()}
+
+        results = {}
+        for name, future in futures.items():
+            try:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                results[name] = future.result(timeout=timeout) or {}
+                self.metrics.count(name, "candidates", sum(len(found) for found in results[name].values()))
+            except FuturesTimeoutError:
+                future.cancel()
+                logger.warning("<pipeline> %s missed the %d ms retrieval budget; dropped", name, budget_ms)
+                self.metrics.count(name, "timeouts")
+                results[name] = {}
+            except Exception as e:
+                logger.error("<pipeline> %s failed; dropped: %s", name, e)
+                self.metrics.count(name, "errors")
+                results[name] = {}
+        followers = results.pop("followers")
+        return results, followers
+
+    @staticmethod
+    def _as_dicts(batch: Dict[str, List[Tuple[str, float]]]) -> Dict[str, Dict[str, float]]:
+        return {username: dict(recs) for username, recs in batch.items()}
+
+    def featurize(
+        self,
+        usernames: List[str],
+        retrieved: Dict[str, Dict[str, Dict[str, float]]],
+        followers: Dict[str, Set[str]],
+        already_following_dict: Dict[str, Set[str]],
+    ) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """
+        Stage 2: filter the union of every source's candidates and assemble the pair feature matrix.
+
+        Returns:
+            (user_pos, candidates, features): pair i is (usernames[user_pos[i]], candidates[i]) and
+            features[i] is its FEATURE_NAMES row (float32).
+        """
+        user_pos, candidates, n_sources = [], [], []
+        mutual, follows_back = [], []
+        fof = retrieved.get("fof", {})
+        for pos, username in enumerate(usernames):
+            excluded = already_following_dict.get(username, set())
+            union = {}
+            for source in SOURCES:
+                for candidate in retrieved.get(source, {}).get(username, ()):
+                    if candidate != username and candidate not in excluded:
+                        union[candidate] = union.get(candidate, 0) + (source in FEATURE_SOURCES)
+            user_fof = fof.get(username, {})
+            user_followers = followers.get(username, set())
+            for candidate, count in union.items():
+                user_pos.append(pos)
+                candidates.append(candidate)
+                n_sources.append(count)
+                mutual.append(user_fof.get(candidate, 0))
+                follows_back.append(candidate in user_followers)
+
+        user_pos = np.asarray(user_pos, dtype=np.int64)
+        features = np.zeros((len(candidates), len(FEATURE_NAMES)), dtype=np.float32)
+        if not candidates:
+            return user_pos, candidates, features
+
+        cf_model, cb_model = self.cf_recommender.registry.current, self.cb_recommender.registry.current
+        cf_queries, cf_known = self._query_vectors(cf_model.exact_index, cf_model.username_to_idx, usernames)
+        cb_queries, cb_known = self._query_vectors(
+            cb_model.exact_index, cb_model.username_to_idx, usernames, self.cb_recommender.get_user_features
+        )
+        features[:, 0] = self._pair_cosines(cf_model.exact_index, cf_model.username_to_idx, cf_queries, cf_known, user_pos, candidates)
+        features[:, 1] = self._pair_cosines(cb_model.exact_index, cb_model.username_to_idx, cb_queries, cb_known, user_pos, candidates)
+        features[:, 2] = np.log1p(np.asarray(mutual, dtype=np.float32))
+        features[:, 3] = np.asarray(follows_back, dtype=np.float32)
+        features[:, 4] = np.log1p(self._follower_counts(candidates))
+        features[:, 5] = np.asarray(n_sources, dtype=np.float32)
+        return user_pos, candidates, features
+
+    @staticmethod
+    def _query_vectors(
+        index: ExactIndex,
+        username_to_idx: Dict[str, int],
+        usernames: List[str],
+        featurize=None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(unit query vectors, known mask) for the request users; featurize(username) covers users outside the index."""
+        queries = np.zeros((len(usernames), index.unit_matrix.shape[1]), dtype=np.float32)
+        known = np.zeros(len(usernames), dtype=bool)
+        rows = np.fromiter((username_to_idx.get(u, -1) for u in usernames), dtype=np.int64, count=len(usernames))
+        in_index = rows >= 0
+        if in_index.any():
+            queries[in_index] = index.rows(rows[in_index])
+            known[in_index] = True
+        if featurize is not None:
+            for pos in np.flatnonzero(~in_index):
+                try:
+                    vector = featurize(usernames[pos])
+                except Exception as e:
+                    logger.warning("<pipeline> Could not featurize '%s'; similarity set to 0: %s", usernames[pos], e)
+                    vector = None
+                if vector is not None:
+                    queries[pos] = l2_normalize(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+                    known[pos] = True
+        return queries, known
+
+    @staticmethod
+    def _pair_cosines(
+        index: ExactIndex,
+        username_to_idx: Dict[str, int],
+        queries: np.ndarray,
+        known: np.ndarray,
+        user_pos: np.ndarray,
+        candidates: List[str],
+    ) -> np.ndarray:
+        """Cosine of every (user, candidate) pair as one gather + row-wise dot; 0 where either side is missing."""
+        rows = np.fromiter((username_to_idx.get(c, -1) for c in candidates), dtype=np.int64, count=len(candidates))
+        valid = (rows >= 0) & known[user_pos]
+        scores = np.zeros(len(candidates), dtype=np.float32)
+        if valid.any():
+            scores[valid] = np.einsum("ij,ij->i", queries[user_pos[valid]], index.rows(rows[valid]))
+        return scores
+
+    def _follower_counts(self, candidates: List[str]) -> np.ndarray:
+        try:
+            counts = self.signals.follower_counts(set(candidates))
+        except Exception as e:
+            logger.error("<pipeline> Follower counts failed; using 0: %s", e)
+            counts = {}
+        return np.fromiter((counts.get(c, 0) for c in candidates), dtype=np.float32, count=len(candidates))
+
+    def rerank(self, features: np.ndarray, shed: bool = False) -> np.ndarray:
+        """
+        Stage 3: score every pair with the re-ranker in one call.
+        Falls back to the mean CF/CB similarity when no re-ranker is trained or shed is set.
+        """
+        reranker = self.registry.current
+        if reranker is None or shed:
+            self.metrics.count_fallback()
+            return self._fallback_scores(features)
+        return reranker.score(features)
+
+    @staticmethod
+    def _fallback_scores(features: np.ndarray) -> np.ndarray:
+        return 0.5 * (features[:, 0] + features[:, 1])
+
+    @staticmethod
+    def _top_k_per_user(
+        user_pos: np.ndarray,
+        candidates: List[str],
+        scores: np.ndarray,
+        n_users: int,
+        k: int,
+        min_score: float,
+    ) -> List[List[Tuple[str, float]]]:
+        """Group pairs by user (one lexsort) and keep each user's top-k above min_score."""
+        order = np.lexsort((-scores, user_pos))
+        bounds = np.searchsorted(user_pos[order], np.arange(n_users + 1))
+        ranked = []
+        for pos in range(n_users):
+            rows = order[bounds[pos]:bounds[pos + 1]]
+            rows = rows[scores[rows] >= min_score][:k]
+            ranked.append([(candidates[i], float(scores[i])) for i in rows])
+        return ranked
+
+    def batch_recommend(
+        self,
+        usernames: List[str],
+        k: int = 10,
+        already_following_dict: Optional[Dict[str, Set[str]]] = None,
+        min_similarity: float = 0.0,
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Recommend users to follow for several users through all three stages.
+
+        Args:
+            usernames: Users to recommend for.
+            k: Recommendations per user.
+            already_following_dict: {username: followed usernames}, never recommended.
+                                    Fetched from the graph signals when None.
+            min_similarity: Drop results whose final score is below this.
+
+        Returns:
+            Dict of {username: [(recommended_user, score), ...]}, score descending.
+        """
+        usernames = list(dict.fromkeys(usernames))
+        if not usernames:
+            return {}
+        if already_following_dict is None:
+            already_following_dict = self.signals.following(usernames)
+        n_users = len(usernames)
+
+        start = time.monotonic()
+        retrieval_budget = self.retrieval_budget_ms if n_users == 1 else self.batch_retrieval_budget_ms
+        retrieved, followers = self.retrieve(usernames, already_following_dict, retrieval_budget)
+        retrieved_at = time.monotonic()
+        self.metrics.stages["retrieval"].record((retrieved_at - start) * 1000, retrieval_budget)
+
+        user_pos, candidates, features = self.featurize(usernames, retrieved, followers, already_following_dict)
+        featurized_at = time.monotonic()
+        features_budget = self.features_budget_ms * n_users
+        self.metrics.stages["features"].record((featurized_at - retrieved_at) * 1000, features_budget)
+
+        # The re-ranker is the stage that can be shed once the request has used up the earlier budgets
+        shed = (
+            retrieval_budget > 0 and features_budget > 0
+            and (featurized_at - start) * 1000 > retrieval_budget + features_budget
+        )
+        scores = self.rerank(features, shed=shed)
+        self.metrics.stages["rerank"].record((time.monotonic() - featurized_at) * 1000, self.rerank_budget_ms * n_users)
+
+        ranked = self._top_k_per_user(user_pos, candidates, scores, n_users, k, min_similarity)
+        return dict(zip(usernames, ranked))
+
+    def recommend_users(
+        self,
+        username: str,
+        k: int = 10,
+        already_following: Optional[Set[str]] = None,
+        min_similarity: float = 0.0,
+    ) -> List[Tuple[str, float]]:
+        """batch_recommend() for one user."""
+        already_following_dict = None if already_following is None else {username: already_following}
+        return self.batch_recommend([username], k, already_following_dict, min_similarity)[username]
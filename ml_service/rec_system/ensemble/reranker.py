@@ -0,0 +1,99 @@
+"""
+Stage-3 re-ranker for the recommendation pipeline.
+
+A small classifier (logistic regression by default, or gradient-boosted trees)
+over the pipeline's pair features, trained by RerankerTrainer on
+train_edges.csv and scored for every candidate of a request in one call.
+"""
+
+import os
+import pickle
+import logging
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+# Pair features assembled by RecommendationPipeline.featurize, in column order
+FEATURE_NAMES = (
+    "cf_score",             # CF embedding cosine (0 if either user has no embedding)
+    "cb_score",             # CB feature cosine
+    "mutual_follows",       # log1p(users followed by the user who follow the candidate)
+    "follows_back",         # 1 if the candidate already follows the user
+    "candidate_followers",  # log1p(candidate follower count)
+    "n_sources",            # number of candidate sources that retrieved the pair (events not counted)
+)
+# Event co-attendance is a retrieval source only: the training data (train_edges.csv)
+# has no attendance, so a co-attendance feature would always be 0 when fitting.
+
+MODEL_TYPES = ("logistic", "gbdt")
+
+_DEFAULT_RERANKER_PATH = str(
+    Path(__file__).resolve().parent.parent / "data" / "models" / "reranker.pkl"
+)
+ENV_RERANKER_PATH = "RERANKER_PATH"
+
+
+def resolve_reranker_path(path: Optional[str] = None) -> Path:
+    """The given path, else RERANKER_PATH env var or the default under data/models."""
+    return Path(path or os.getenv(ENV_RERANKER_PATH) or _DEFAULT_RERANKER_PATH)
+
+
+class Reranker:
+    """A fitted classifier plus the feature layout it was trained on."""
+
+    def __init__(self, model, feature_names: Sequence[str] = FEATURE_NAMES, model_type: str = "logistic"):
+        self.model = model
+        self.feature_names = tuple(feature_names)
+        self.model_type = model_type
+
+    def score(self, features: np.ndarray) -> np.ndarray:
+        """P(follow) for each row of an (n_pairs, n_features) matrix."""
+        if len(features) == 0:
+            return np.zeros(0, dtype=np.float32)
+        return self.model.predict_proba(features)[:, 1].astype(np.float32)
+
+    def save(self, path: Optional[str] = None) -> Path:
+        """Pickle to path (atomic rename, so a reloading pipeline never reads a partial file)."""
+        path = resolve_reranker_path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = str(path) + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                {"model": self.model, "feature_names": list(self.feature_names), "model_type": self.model_type}, f
+            )
+        os.replace(tmp_path, path)
+        logger.info("Saved re-ranker to: %s", path)
+        return path
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> Optional["Reranker"]:
+        """Load a saved re-ranker; None if none has been trained yet."""
+        path = resolve_reranker_path(path)
+        if not path.exists():
+            return None
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        return cls(data["model"], data["feature_names"], data.get("model_type", "logistic"))
+
+
+def validate_reranker(new: Optional[Reranker], old: Optional[Reranker]):
+    """Reject a reloaded re-ranker trained on a different feature layout than the pipeline assembles."""
+    if new is not None and new.feature_names != FEATURE_NAMES:
+        raise ValueError(f"Feature mismatch: expected {list(FEATURE_NAMES)}, got {list(new.feature_names)}")
+
+
+def build_model(model_type: str = "logistic", seed: int = 42):
+    """Unfitted sklearn classifier for a model type."""
+    if model_type == "logistic":
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000, class_weight="balanced"))
+    if model_type == "gbdt":
+        from sklearn.ensemble import HistGradientBoostingClassifier
+        return HistGradientBoostingClassifier(max_iter=200, learning_rate=0.05, random_state=seed)
+    raise ValueError(f"Unknown re-ranker model type: {model_type} (expected one of {', '.join(MODEL_TYPES)})")
@@ -0,0 +1,146 @@
+"""
+Graph signals for the recommendation pipeline: friends-of-friends, event
+co-attendance, followers and follower counts.
+
+GraphSignals reads them from Neo4j (one UNWIND query per signal for a whole
+batch); EdgeListSignals computes the follow signals from a follow edge list
+(e.g. train_edges.csv) with sparse matrix products, so the re-ranker is trained
+on the same follow features it is served with. An edge list has no events, so
+EdgeListSignals.co_attendees is always empty; co-attendance therefore only
+retrieves candidates and is not a re-ranker feature. Both expose:
+
+    friends_of_friends(usernames, limit) -> {username: {candidate: mutual follows}}
+    co_attendees(usernames, limit)       -> {username: {candidate: shared events}}
+    followers(usernames)                 -> {username: set of follower usernames}
+    following(usernames)                 -> {username: set of followed usernames}
+    follower_counts(usernames)           -> {username: follower count}
+"""
+
+import csv
+from typing import Dict, Iterable, List, Set
+
+import numpy as np
+from scipy import sparse
+
+
+def load_follows(edges_path, nodes_path) -> Dict[str, Set[str]]:
+    """{username: set of followed usernames} from an edges csv (source_id, target_id by node id)."""
+    with open(nodes_path, newline="") as f:
+        id_to_username = {row["id"]: row["username"] for row in csv.DictReader(f)}
+    follows = {}
+    with open(edges_path, newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("relationship_type", "FOLLOWS") != "FOLLOWS":
+                continue
+            source, target = id_to_username.get(row["source_id"]), id_to_username.get(row["target_id"])
+            if source and target:
+                follows.setdefault(source, set()).add(target)
+    return follows
+
+
+class GraphSignals:
+    """Signals served from the live graph through the knowledge_graph User methods."""
+
+    def __init__(self, user_methods=None):
+        """
+        Args:
+            user_methods: knowledge_graph User instance to reuse; created here when not given.
+        """
+        if user_methods is None:
+            from ml_service.knowledge_graph.methods.user import User
+            user_methods = User()
+        self.user_methods = user_methods
+
+    def friends_of_friends(self, usernames: List[str], limit: int) -> Dict[str, Dict[str, float]]:
+        return self.user_methods.get_friends_of_friends_batch(usernames, limit)
+
+    def co_attendees(self, usernames: List[str], limit: int) -> Dict[str, Dict[str, float]]:
+        return self.user_methods.get_event_coattendees_batch(usernames, limit)
+
+    def followers(self, usernames: List[str]) -> Dict[str, Set[str]]:
+        return self.user_methods.get_followers_batch(usernames)
+
+    def following(self, usernames: List[str]) -> Dict[str, Set[str]]:
+        return self.user_methods.get_following_batch(usernames)
+
+    def follower_counts(self, usernames: Iterable[str]) -> Dict[str, int]:
+        counts = self.user_methods.get_follow_counts_batch(list(usernames))
+        return {username: value["followers"] for username, value in counts.items()}
+
+
+class EdgeListSignals:
+    """Signals computed from an in-memory follow graph; there is no event data, so no co-attendance."""
+
+    def __init__(self, follows: Dict[str, Set[str]]):
+        """
+        Args:
+            follows: {username: set of usernames they follow}.
+        """
+        names = sorted(set(follows) | {target for targets in follows.values() for target in targets})
+        self.usernames = names
+        self.username_to_idx = {name: idx for idx, name in enumerate(names)}
+        rows = np.fromiter(
+            (self.username_to_idx[source] for source, targets in follows.items() for _ in targets), dtype=np.int64
+        )
+        cols = np.fromiter(
+            (self.username_to_idx[target] for targets in follows.values() for target in targets), dtype=np.int64
+        )
+        n = len(names)
+        self.adjacency = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(n, n))
+        self.adjacency.sum_duplicates()
+        self.adjacency.data[:] = 1.0
+        self.reverse = self.adjacency.T.tocsr()
+        self._follower_counts = np.asarray(self.adjacency.sum(axis=0)).ravel().astype(np.int64)
+
+    @classmethod
+    def from_csv(cls, edges_path, nodes_path) -> "EdgeListSignals":
+        """Build from an edges csv (source_id, target_id by node id) and nodes.csv (id, username)."""
+        return cls(load_follows(edges_path, nodes_path))
+
+    def _rows(self, usernames: List[str]) -> np.ndarray:
+        return np.fromiter((self.username_to_idx.get(u, -1) for u in usernames), dtype=np.int64, count=len(usernames))
+
+    def _neighbours(self, matrix: sparse.csr_matrix, usernames: List[str]) -> Dict[str, Set[str]]:
+        result = {}
+        for username, row in zip(usernames, self._rows(usernames)):
+            if row < 0:
+                result[username] = set()
+            else:
+                cols = matrix.indices[matrix.indptr[row]:matrix.indptr[row + 1]]
+                result[username] = {self.usernames[c] for c in cols}
+        return result
+
+    def friends_of_friends(self, usernames: List[str], limit: int) -> Dict[str, Dict[str, float]]:
+        """Two-hop FOLLOWS counts for every user in one sparse product A[rows] @ A."""
+        result = {username: {} for username in usernames}
+        rows = self._rows(usernames)
+        known = rows >= 0
+        if not known.any():
+            return result
+        two_hop = (self.adjacency[rows[known]] @ self.adjacency).tocsr()
+        for username, row, i in zip(np.asarray(usernames)[known], rows[known], range(two_hop.shape[0])):
+            start, end = two_hop.indptr[i], two_hop.indptr[i + 1]
+            cols, counts = two_hop.indices[start:end], two_hop.data[start:end]
+            followed = self.adjacency.indices[self.adjacency.indptr[row]:self.adjacency.indptr[row + 1]]
+            keep = (cols != row) & ~np.isin(cols, followed)
+            cols, counts = cols[keep], counts[keep]
+            if len(cols) > limit:
+                top = np.argpartition(-counts, limit - 1)[:limit]
+                cols, counts = cols[top], counts[top]
+            result[username] = {self.usernames[c]: float(n) for c, n in zip(cols, counts)}
+        return result
+
+    def co_attendees(self, usernames: List[str], limit: int) -> Dict[str, Dict[str, float]]:
+        return {username: {} for username in usernames}
+
+    def followers(self, usernames: List[str]) -> Dict[str, Set[str]]:
+        return self._neighbours(self.reverse, usernames)
+
+    def following(self, usernames: List[str]) -> Dict[str, Set[str]]:
+        return self._neighbours(self.adjacency, usernames)
+
+    def follower_counts(self, usernames: Iterable[str]) -> Dict[str, int]:
+        return {
+            username: int(self._follower_counts[self.username_to_idx[username]]) if username in self.username_to_idx else 0
+            for username in usernames
+        }
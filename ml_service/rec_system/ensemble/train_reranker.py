@@ -0,0 +1,145 @@
+"""
+Training the pipeline's re-ranker from train_edges.csv.
+Ran after the CF/CB models are retrained.
+
+For every user with at least two follows in train_edges.csv, a fraction of
+their follows is held out as positive labels. The graph signals are built from
+the remaining follows, and the pipeline retrieves and featurizes candidates
+exactly as it does when serving. Label = the candidate is a held-out follow.
+"""
+
+import argparse
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ml_service.rec_system.ensemble.pipeline import RecommendationPipeline
+from ml_service.rec_system.ensemble.reranker import FEATURE_NAMES, MODEL_TYPES, Reranker, build_model
+from ml_service.rec_system.ensemble.signals import EdgeListSignals, load_follows
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+_RAW_DIR = Path(__file__).resolve().parent.parent / "data" / "raw"
+
+
+class RerankerTrainer:
+    """Build (pair features, label) examples with the serving pipeline and fit the re-ranker."""
+
+    def __init__(
+        self,
+        pipeline: Optional[RecommendationPipeline] = None,
+        raw_dir: Path = _RAW_DIR,
+        holdout: float = 0.2,
+        model_type: str = "logistic",
+        seed: int = 42,
+    ):
+        """
+        Args:
+            pipeline: Pipeline whose CF/CB recommenders supply candidates; created here when not given
+                      (its graph signals are replaced by the train edge list).
+            raw_dir: Directory with nodes.csv and train_edges.csv.
+            holdout: Fraction of each user's follows held out as positive labels.
+            model_type: logistic | gbdt.
+            seed: Seed for the holdout split and the model.
+        """
+        if model_type not in MODEL_TYPES:
+            raise ValueError(f"Unknown re-ranker model type: {model_type} (expected one of {', '.join(MODEL_TYPES)})")
+        self.raw_dir = Path(raw_dir)
+        self.holdout = holdout
+        self.model_type = model_type
+        self.seed = seed
+        self.pipeline = pipeline or RecommendationPipeline(signals=EdgeListSignals({}), reload_interval=0)
+
+    def split_follows(self, follows: Dict[str, Set[str]]) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+        """(kept, held_out) per user; users with fewer than two follows keep all of them."""
+        rng = np.random.default_rng(self.seed)
+        kept, held_out = {}, {}
+        for username in sorted(follows):
+            targets = sorted(follows[username])
+            n_held = int(round(len(targets) * self.holdout)) if len(targets) >= 2 else 0
+            held = set(rng.choice(targets, size=n_held, replace=False)) if n_held else set()
+            kept[username] = set(targets) - held
+            if held:
+                held_out[username] = held
+        return kept, held_out
+
+    def build_dataset(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns:
+            (features, labels, user_pos): one row per retrieved (user, candidate) pair;
+            user_pos groups rows by user for a user-level validation split.
+        """
+        follows = load_follows(self.raw_dir / "train_edges.csv", self.raw_dir / "nodes.csv")
+        kept, held_out = self.split_follows(follows)
+        users: List[str] = sorted(held_out)
+
+        pipeline = self.pipeline
+        pipeline.signals = EdgeListSignals(kept)
+        retrieved, followers = pipeline.retrieve(users, kept)
+        user_pos, candidates, features = pipeline.featurize(users, retrieved, followers, kept)
+        labels = np.fromiter(
+            (candidate in held_out[users[pos]] for pos, candidate in zip(user_pos, candidates)),
+            dtype=np.int8,
+            count=len(candidates),
+        )
+        recall = labels.sum() / max(1, sum(len(held) for held in held_out.values()))
+        logger.info(
+            "Built %d pairs for %d users (%d positives, candidate recall %.3f)",
+            len(labels), len(users), int(labels.sum()), recall,
+        )
+        return features, labels, user_pos
+
+    def fit(self, features: np.ndarray, labels: np.ndarray, user_pos: np.ndarray) -> Reranker:
+        """Fit on 80% of users, log validation AUC on the rest, then refit on everyone."""
+        from sklearn.metrics import roc_auc_score
+
+        rng = np.random.default_rng(self.seed)
+        n_users = int(user_pos.max()) + 1
+        val_users = rng.random(n_users) < 0.2
+        val = val_users[user_pos]
+        if labels[~val].any() and labels[val].any() and not labels[val].all():
+            model = build_model(self.model_type, self.seed).fit(features[~val], labels[~val])
+            auc = roc_auc_score(labels[val], model.predict_proba(features[val])[:, 1])
+            baseline = roc_auc_score(labels[val], 0.5 * (features[val, 0] + features[val, 1]))
+            logger.info("<reranker> Validation AUC %.4f (mean CF/CB similarity: %.4f)", auc, baseline)
+
+        model = build_model(self.model_type, self.seed).fit(features, labels)
+        return Reranker(model, FEATURE_NAMES, self.model_type)
+
+    def train_model(self, output_path: Optional[str] = None) -> Dict[str, str]:
+        """
+        Full training pipeline: split follows, build examples, fit, save.
+
+        Returns:
+            Dict with the path to the saved re-ranker
+        """
+        try:
+            features, labels, user_pos = self.build_dataset()
+            if not labels.any():
+                raise ValueError("No positive pairs retrieved; cannot train the re-ranker")
+            reranker = self.fit(features, labels, user_pos)
+            return {"reranker_path": str(reranker.save(output_path))}
+        except Exception as e:
+            logger.error(f"<reranker> Error training model: {e}")
+            raise e
+        finally:
+            self.pipeline.close()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", choices=MODEL_TYPES, default="logistic")
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--output", default=None, help="Re-ranker file (default: RERANKER_PATH or data/models/reranker.pkl)")
+    args = parser.parse_args()
+
+    trainer = RerankerTrainer(holdout=args.holdout, model_type=args.model)
+    trainer.train_model(args.output)
+
+
+if __name__ == "__main__":
+    main()
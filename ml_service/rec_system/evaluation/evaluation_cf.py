@@ -0,0 +1,109 @@
+"""
+Offline evaluation of CFRecommender, including the recall cost of quantizing embeddings.
+
+For every source user in test_edges.csv, recommends k users (excluding the user's
+train_edges.csv follows) and measures recall@k against the held-out test follows.
+Each quantization mode (none = float32, float16, int8) is scored on the same
+embeddings, and reported next to its memory per user and its top-k overlap with
+float32 (how many of the float32 neighbours survive quantization).
+
+Usage:
+    python -m ml_service.rec_system.evaluation.evaluation_cf [--embeddings PATH] [--k 10 20 50]
+"""
+
+import argparse
+import csv
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from ml_service.rec_system.cf.cf_recommender import CFRecommender
+from ml_service.rec_system.evaluation.metrics import mean_recall_at_k, overlap_at_k
+from ml_service.rec_system.index.ann import ANNConfig
+from ml_service.rec_system.index.quantization import QUANTIZATION_MODES
+
+_RAW_DIR = Path(__file__).resolve().parent.parent / "data" / "raw"
+
+
+def load_follows(edges_path: Path, id_to_username: Dict[str, str]) -> Dict[str, Set[str]]:
+    """{username: set of followed usernames} from an edges csv (source_id, target_id by node id)."""
+    follows = defaultdict(set)
+    with open(edges_path, newline="") as f:
+        for row in csv.DictReader(f):
+            if row.get("relationship_type", "FOLLOWS") != "FOLLOWS":
+                continue
+            source, target = id_to_username.get(row["source_id"]), id_to_username.get(row["target_id"])
+            if source and target:
+                follows[source].add(target)
+    return follows
+
+
+def load_splits(raw_dir: Path = _RAW_DIR):
+    """(train_follows, test_follows) keyed by username."""
+    with open(raw_dir / "nodes.csv", newline="") as f:
+        id_to_username = {row["id"]: row["username"] for row in csv.DictReader(f)}
+    return (
+        load_follows(raw_dir / "train_edges.csv", id_to_username),
+        load_follows(raw_dir / "test_edges.csv", id_to_username),
+    )
+
+
+def recommend_all(recommender: CFRecommender, users: List[str], k: int, train: Dict[str, Set[str]]) -> Dict[str, List[str]]:
+    """Top-k usernames per user (exact search), excluding their train follows."""
+    batch = recommender.batch_recommend(users, k=k, already_following_dict=train)
+    return {u: [name for name, _ in recs] for u, recs in batch.items()}
+
+
+def evaluate(embeddings_path: Optional[str] = None, ks=(10, 20, 50), raw_dir: Path = _RAW_DIR) -> List[dict]:
+    """
+    recall@k on test_edges.csv and top-k overlap with float32 for every quantization mode.
+
+    Returns:
+        One row per mode: {mode, bytes_per_user, recall@k..., recall_loss@k..., overlap@k...}.
+    """
+    train, test = load_splits(raw_dir)
+    exact = ANNConfig(backend="exact")
+    max_k = max(ks)
+    rows, baseline = [], None
+    for mode in QUANTIZATION_MODES:
+        recommender = CFRecommender(embeddings_path, ann_config=exact, quantization=mode, reload_interval=0)
+        relevant = {u: {t for t in test[u] if t in recommender.username_to_idx} for u in test if u in recommender.username_to_idx}
+        test_users = [u for u, items in relevant.items() if items]
+        all_users = list(recommender.usernames)
+        recs = recommend_all(recommender, all_users, max_k, train)
+        if baseline is None:
+            baseline = recs
+
+        row = {"mode": mode, "bytes_per_user": recommender.bytes_per_user(), "test_users": len(test_users)}
+        for k in ks:
+            row[f"recall@{k}"] = mean_recall_at_k(recs, relevant, k)
+            row[f"overlap@{k}"] = sum(overlap_at_k(recs[u], baseline[u], k) for u in all_users) / len(all_users)
+        rows.append(row)
+
+    for row in rows:
+        for k in ks:
+            row[f"recall_loss@{k}"] = rows[0][f"recall@{k}"] - row[f"recall@{k}"]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--embeddings", default=None, help="Store root, version dir or legacy .pkl")
+    parser.add_argument("--k", type=int, nargs="+", default=[10, 20, 50])
+    args = parser.parse_args()
+
+    rows = evaluate(args.embeddings, ks=args.k)
+    print(f"\nCF quantization evaluation ({rows[0]['test_users']} test users with held-out follows)\n")
+    header = f"{'mode':>8} {'B/user':>7}" + "".join(
+        f" {'recall@' + str(k):>10} {'loss':>7} {'overlap':>8}" for k in args.k
+    )
+    print(header)
+    for row in rows:
+        line = f"{row['mode']:>8} {row['bytes_per_user']:>7}"
+        for k in args.k:
+            line += f" {row[f'recall@{k}']:>10.4f} {row[f'recall_loss@{k}']:>7.4f} {row[f'overlap@{k}']:>8.4f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Offline evaluation of the multi-stage pipeline against the weighted hybrid.
+
+Graph signals come from train_edges.csv (EdgeListSignals); for every source user
+in test_edges.csv, k users are recommended (excluding the user's train follows)
+and recall@k is measured against the held-out test follows. Compared:
+
+    weighted   HybridRecommender's blend of the CF and CB top-k lists
+    pipeline   all candidate sources, ordered by mean CF/CB similarity (no re-ranker)
+    reranked   all candidate sources, ordered by the trained re-ranker
+
+Usage:
+    python -m ml_service.rec_system.evaluation.evaluation_ensemble [--reranker PATH] [--k 10 20 50]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from ml_service.rec_system.cb.cb_recommender import CBRecommender
+from ml_service.rec_system.cf.cf_recommender import CFRecommender
+from ml_service.rec_system.ensemble.hybrid_recommender import HybridRecommender
+from ml_service.rec_system.ensemble.pipeline import RecommendationPipeline
+from ml_service.rec_system.ensemble.reranker import resolve_reranker_path
+from ml_service.rec_system.ensemble.signals import EdgeListSignals
+from ml_service.rec_system.evaluation.evaluation_cf import load_splits
+from ml_service.rec_system.evaluation.metrics import mean_recall_at_k
+from ml_service.rec_system.index.ann import ANNConfig
+
+_RAW_DIR = Path(__file__).resolve().parent.parent / "data" / "raw"
+
+
+def evaluate(reranker_path: Optional[str] = None, ks=(10, 20, 50), raw_dir: Path = _RAW_DIR) -> List[dict]:
+    """
+    recall@k on test_edges.csv for the weighted hybrid and the pipeline with and without its re-ranker.
+    The pipeline's retrieval and features are computed once and scored both ways.
+
+    Returns:
+        One row per method: {method, test_users, ms_per_user, recall@k...}.
+    """
+    train, test = load_splits(raw_dir)
+    users = sorted(u for u, items in test.items() if items)
+    relevant = {u: test[u] for u in users}
+    cf = CFRecommender(ann_config=ANNConfig(backend="exact"), reload_interval=0)
+    cb = CBRecommender(reload_interval=0)
+    max_k = max(ks)
+
+    def row(method: str, batch: dict, elapsed: float) -> dict:
+        recs = {u: [name for name, _ in batch.get(u, [])] for u in users}
+        result = {"method": method, "test_users": len(users), "ms_per_user": 1000 * elapsed / len(users)}
+        for k in ks:
+            result[f"recall@{k}"] = mean_recall_at_k(recs, relevant, k)
+        return result
+
+    rows = []
+    hybrid = HybridRecommender(cf_recommender=cf, cb_recommender=cb)
+    start = time.perf_counter()
+    rows.append(row("weighted", hybrid.batch_recommend(users, max_k, train, strategy="weighted"), time.perf_counter() - start))
+    hybrid.close()
+
+    pipeline = RecommendationPipeline(cf, cb, EdgeListSignals(train), reranker_path=reranker_path, reload_interval=0)
+    start = time.perf_counter()
+    retrieved, followers = pipeline.retrieve(users, train)
+    user_pos, candidates, features = pipeline.featurize(users, retrieved, followers, train)
+    shared = time.perf_counter() - start
+
+    scorers = {"pipeline": lambda: pipeline.rerank(features, shed=True)}
+    if pipeline.reranker is not None:
+        scorers["reranked"] = lambda: pipeline.rerank(features)
+    else:
+        print(f"No re-ranker at {resolve_reranker_path(reranker_path)}; skipping 'reranked'")
+    for method, score in scorers.items():
+        start = time.perf_counter()
+        ranked = pipeline._top_k_per_user(user_pos, candidates, score(), len(users), max_k, 0.0)
+        rows.append(row(method, dict(zip(users, ranked)), shared + time.perf_counter() - start))
+    pipeline.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reranker", default=None, help="Re-ranker file (default: RERANKER_PATH or data/models/reranker.pkl)")
+    parser.add_argument("--k", type=int, nargs="+", default=[10, 20, 50])
+    args = parser.parse_args()
+
+    rows = evaluate(args.reranker, ks=args.k)
+    print(f"\nEnsemble evaluation ({rows[0]['test_users']} test users with held-out follows)\n")
+    print(f"{'method':>9} {'ms/user':>8}" + "".join(f" {'recall@' + str(k):>10}" for k in args.k))
+    for row in rows:
+        print(f"{row['method']:>9} {row['ms_per_user']:>8.3f}" + "".join(f" {row[f'recall@{k}']:>10.4f}" for k in args.k))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""
+Offline ranking metrics for recommender evaluation.
+"""
+
+from typing import Dict, Iterable, List, Set
+
+
+def recall_at_k(recommended: List[str], relevant: Set[str], k: int) -> float:
+    """Fraction of relevant items found in the first k recommendations (0.0 if nothing is relevant)."""
+    if not relevant:
+        return 0.0
+    return len(set(recommended[:k]) & relevant) / len(relevant)
+
+
+def mean_recall_at_k(recommendations: Dict[str, List[str]], relevant: Dict[str, Set[str]], k: int) -> float:
+    """recall@k averaged over the users that have at least one relevant item."""
+    users = [u for u, items in relevant.items() if items]
+    if not users:
+        return 0.0
+    return sum(recall_at_k(recommendations.get(u, []), relevant[u], k) for u in users) / len(users)
+
+
+def overlap_at_k(a: Iterable[str], b: Iterable[str], k: int) -> float:
+    """Share of b's top-k that also appears in a's top-k (e.g. quantized vs float32 results)."""
+    a, b = list(a)[:k], list(b)[:k]
+    if not b:
+        return 1.0
+    return len(set(a) & set(b)) / len(b)
@@ -0,0 +1,11 @@
+from .ann import ANNConfig, ANNIndex, build_ann_index
+from .exact import ExactIndex, batched_top_k, l2_normalize, top_k
+from .geo import GeoConfig, GeoIndex, build_geo_index
+from .quantization import QUANTIZATION_MODES, dequantize, quantize
+from .registry import ModelRegistry
+
+__all__ = [
+    "ANNConfig", "ANNIndex", "build_ann_index", "ExactIndex", "batched_top_k", "l2_normalize", "top_k",
+    "GeoConfig", "GeoIndex", "build_geo_index",
+    "QUANTIZATION_MODES", "dequantize", "quantize", "ModelRegistry",
+]
@@ -0,0 +1,133 @@
+"""
+Approximate nearest-neighbour (ANN) backends for cosine top-k over embedding matrices.
+
+Backends (all report cosine similarity as the score):
+    exact  brute force; no index is built (the recommender keeps its own exact path)
+    hnsw   FAISS HNSW graph over L2-normalized vectors (inner product)
+    ivf    FAISS inverted lists over L2-normalized vectors (inner product)
+    auto   hnsw when FAISS is installed and the matrix has >= min_rows rows, else exact
+
+Recall/latency is tuned per backend: ef_search for HNSW, nprobe for IVF
+(higher = better recall, slower queries).
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:  # faiss-cpu is optional; exact search still works without it
+    faiss = None
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("auto", "exact", "hnsw", "ivf")
+
+
+def _int_env(key: str, default: int) -> int:
+    """Parse int from env var with fallback."""
+    raw = os.getenv(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning("Invalid int for %s='%s', using default %d", key, raw, default)
+        return default
+
+
+@dataclass
+class ANNConfig:
+    """ANN backend settings. from_env() reads <prefix>_ANN_* env vars (e.g. CF_ANN_BACKEND)."""
+
+    backend: str = "auto"
+    min_rows: int = 10000       # auto: below this, exact search is already fast enough
+    hnsw_m: int = 32            # graph degree; more = better recall, more memory
+    ef_construction: int = 80
+    ef_search: int = 64         # query-time beam width (recall/latency knob)
+    nlist: int = 0              # IVF lists; 0 = 4 * sqrt(rows)
+    nprobe: int = 16            # IVF lists scanned per query (recall/latency knob)
+
+    @classmethod
+    def from_env(cls, prefix: str) -> "ANNConfig":
+        backend = (os.getenv(f"{prefix}_ANN_BACKEND") or "auto").strip().lower()
+        if backend not in BACKENDS:
+            logger.warning("Unknown %s_ANN_BACKEND='%s', using auto", prefix, backend)
+            backend = "auto"
+        return cls(
+            backend=backend,
+            min_rows=_int_env(f"{prefix}_ANN_MIN_ROWS", cls.min_rows),
+            hnsw_m=_int_env(f"{prefix}_ANN_HNSW_M", cls.hnsw_m),
+            ef_construction=_int_env(f"{prefix}_ANN_EF_CONSTRUCTION", cls.ef_construction),
+            ef_search=_int_env(f"{prefix}_ANN_EF_SEARCH", cls.ef_search),
+            nlist=_int_env(f"{prefix}_ANN_NLIST", cls.nlist),
+            nprobe=_int_env(f"{prefix}_ANN_NPROBE", cls.nprobe),
+        )
+
+
+class ANNIndex:
+    """FAISS inner-product index over an L2-normalized copy of the matrix."""
+
+    def __init__(self, matrix: np.ndarray, config: ANNConfig, backend: str):
+        vectors = np.ascontiguousarray(matrix, dtype=np.float32).copy()
+        faiss.normalize_L2(vectors)
+        n_rows, dim = vectors.shape
+        self.backend = backend
+        self.n_rows = n_rows
+
+        if backend == "hnsw":
+            index = faiss.IndexHNSWFlat(dim, config.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = config.ef_construction
+            index.add(vectors)
+            index.hnsw.efSearch = config.ef_search
+        else:
+            nlist = config.nlist or max(1, int(4 * np.sqrt(n_rows)))
+            nlist = min(nlist, n_rows)
+            quantizer = faiss.IndexFlatIP(dim)
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+            index.train(vectors)
+            index.add(vectors)
+            index.nprobe = min(config.nprobe, nlist)
+        self.index = index
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k rows for each query row.
+
+        Args:
+            queries: (n_queries, dim) array; normalized here, callers pass raw vectors.
+            k: Neighbours per query (capped at the number of indexed rows).
+
+        Returns:
+            (scores, ids), each (n_queries, k). ids are row indices into the matrix,
+            -1 where the index returned fewer than k hits.
+        """
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype=np.float32).copy()
+        faiss.normalize_L2(queries)
+        return self.index.search(queries, min(k, self.n_rows))
+
+
+def build_ann_index(matrix: np.ndarray, config: Optional[ANNConfig] = None) -> Optional[ANNIndex]:
+    """
+    Build the configured ANN index for `matrix`, or return None when exact search should be used
+    (backend=exact, auto below min_rows, FAISS missing, or an empty matrix).
+    """
+    config = config or ANNConfig()
+    n_rows = matrix.shape[0] if matrix.ndim == 2 else 0
+    backend = config.backend
+    if backend == "auto":
+        backend = "hnsw" if n_rows >= config.min_rows else "exact"
+    if backend == "exact" or n_rows == 0:
+        return None
+    if faiss is None:
+        logger.warning("faiss is not installed; %s backend unavailable, using exact search", backend)
+        return None
+
+    index = ANNIndex(matrix, config, backend)
+    logger.info("Built %s ANN index over %d rows (dim=%d)", backend, n_rows, matrix.shape[1])
+    return index
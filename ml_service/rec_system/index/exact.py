@@ -0,0 +1,215 @@
+"""
+Exact cosine top-k over a matrix that is L2-normalized once at load.
+
+A query is one dot product against the unit matrix, a vectorized exclusion
+mask, and an argpartition top-k (O(n) instead of a full O(n log n) sort).
+Batches run as blocked GEMMs (query block x catalogue) with per-row top-k and
+per-row exclusions; the block size bounds the (block, n) score buffer.
+
+The catalogue may also be quantized (float16, or int8 codes with per-row scales,
+see quantization.py); it is then scored chunk by chunk, upcasting one chunk at a
+time, so the full-precision matrix is never materialized.
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    """Row-wise L2 normalization to float32; all-zero rows stay zero (cosine 0 with everything)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k(scores: np.ndarray, k: int, exclude_idx: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Indices and scores of the k largest entries, descending.
+
+    Args:
+        scores: 1D score array. Modified in place when exclude_idx is given.
+        k: Number of results.
+        exclude_idx: Row indices that must not be returned.
+
+    Returns:
+        (indices, scores); fewer than k when too few rows remain after exclusion.
+    """
+    if exclude_idx is not None and len(exclude_idx):
+        scores[exclude_idx] = -np.inf
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)
+    if k < scores.shape[0]:
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(scores.shape[0])
+    order = candidates[np.argsort(scores[candidates])[::-1]]
+    order = order[np.isfinite(scores[order])]
+    return order, scores[order]
+
+
+# Memory budget for one (block, n_rows) float32 score buffer in batched search
+DEFAULT_BLOCK_BYTES = 256 * 1024 * 1024
+# Catalogue rows upcast at a time when scoring a quantized matrix
+QUANTIZED_CHUNK_ROWS = 65536
+
+
+def dot_scores(queries: np.ndarray, unit_matrix: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    queries @ unit_matrix.T as float32, for float32, float16 or int8 (+ per-row scales) catalogues.
+
+    Args:
+        queries: (dim,) or (n_queries, dim) float32 unit queries.
+        unit_matrix: (n_rows, dim) catalogue rows.
+        scales: Per-row scales for int8 codes (row = codes * scale).
+
+    Returns:
+        (n_rows,) or (n_queries, n_rows) scores.
+    """
+    if unit_matrix.dtype == np.float32 and scales is None:
+        return queries @ unit_matrix.T
+    n_rows = unit_matrix.shape[0]
+    out = np.empty(queries.shape[:-1] + (n_rows,), dtype=np.float32)
+    for start in range(0, n_rows, QUANTIZED_CHUNK_ROWS):
+        stop = min(start + QUANTIZED_CHUNK_ROWS, n_rows)
+        chunk = queries @ unit_matrix[start:stop].astype(np.float32).T
+        if scales is not None:
+            chunk *= scales[start:stop]
+        out[..., start:stop] = chunk
+    return out
+
+
+def block_rows_for(n_rows: int, block_bytes: int = DEFAULT_BLOCK_BYTES) -> int:
+    """Number of query rows per block so a block's score buffer fits in block_bytes."""
+    return max(1, min(4096, block_bytes // max(1, n_rows * 4)))
+
+
+def batched_top_k(
+    unit_queries: np.ndarray,
+    unit_matrix: np.ndarray,
+    k: int,
+    exclude_idx: Optional[Sequence[np.ndarray]] = None,
+    block_rows: Optional[int] = None,
+    scales: Optional[np.ndarray] = None,
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Row-wise top-k of unit_queries @ unit_matrix.T, one GEMM per block of queries.
+
+    Args:
+        unit_queries: (n_queries, dim) L2-normalized queries.
+        unit_matrix: (n_rows, dim) L2-normalized catalogue (float32, float16 or int8 codes).
+        k: Results per query.
+        exclude_idx: Optional per-query arrays of catalogue rows to skip.
+        block_rows: Queries per block; default from block_rows_for().
+        scales: Per-row scales when unit_matrix holds int8 codes.
+
+    Returns:
+        One (indices, scores) pair per query, descending, like top_k().
+    """
+    n_queries, n_rows = unit_queries.shape[0], unit_matrix.shape[0]
+    k = min(k, n_rows)
+    block_rows = block_rows or block_rows_for(n_rows)
+    results = []
+    for start in range(0, n_queries, block_rows):
+        stop = min(start + block_rows, n_queries)
+        scores = dot_scores(unit_queries[start:stop], unit_matrix, scales)
+
+        if exclude_idx is not None:
+            block_excludes = exclude_idx[start:stop]
+            lengths = [len(idx) for idx in block_excludes]
+            if sum(lengths):
+                rows = np.repeat(np.arange(stop - start), lengths)
+                scores[rows, np.concatenate(block_excludes).astype(np.int64)] = -np.inf
+
+        if k <= 0:
+            results.extend((np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)) for _ in range(stop - start))
+            continue
+        if k < n_rows:
+            candidates = np.argpartition(scores, -k, axis=1)[:, -k:]
+        else:
+            candidates = np.broadcast_to(np.arange(n_rows), scores.shape)
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        ids = np.take_along_axis(candidates, order, axis=1)
+        top_scores = np.take_along_axis(candidate_scores, order, axis=1)
+        finite = np.isfinite(top_scores)
+        results.extend((ids[r][finite[r]], top_scores[r][finite[r]]) for r in range(stop - start))
+    return results
+
+
+def indices_of(keys: Iterable, key_to_idx: dict) -> np.ndarray:
+    """Row indices for the keys present in key_to_idx (unknown keys are ignored)."""
+    return np.fromiter((key_to_idx[key] for key in keys if key in key_to_idx), dtype=np.int64)
+
+
+class ExactIndex:
+    """Brute-force cosine search over a unit-normalized copy of the matrix."""
+
+    def __init__(self, matrix: np.ndarray, normalized: bool = False, scales: Optional[np.ndarray] = None):
+        """
+        Args:
+            matrix: (n_rows, dim) vectors.
+            normalized: Rows are already unit length (e.g. a memory-mapped store artifact);
+                        use the matrix as-is instead of making a normalized copy.
+            scales: Per-row scales when matrix holds int8 codes of unit rows (implies normalized).
+        """
+        quantized = scales is not None or matrix.dtype in (np.float16, np.int8)
+        self.unit_matrix = matrix if normalized or quantized else l2_normalize(matrix)
+        self.scales = scales
+
+    def rows(self, rows) -> np.ndarray:
+        """float32 unit vectors for the given row(s), dequantized if needed."""
+        vectors = self.unit_matrix[rows].astype(np.float32)
+        if self.scales is not None:
+            vectors *= self.scales[rows][..., None]
+        return vectors
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """Cosine similarity of a raw (unnormalized) query vector to every row."""
+        return dot_scores(l2_normalize(query.reshape(-1)), self.unit_matrix, self.scales)
+
+    def search(self, query: np.ndarray, k: int, exclude_idx: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k (indices, scores) for a raw query vector, skipping exclude_idx."""
+        return top_k(self.scores(query), k, exclude_idx)
+
+    def search_row(self, row: int, k: int, exclude_idx: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k for a row already in the matrix (no query normalization needed)."""
+        return top_k(dot_scores(self.rows(row), self.unit_matrix, self.scales), k, exclude_idx)
+
+    def search_subset(
+        self,
+        query: np.ndarray,
+        rows: np.ndarray,
+        k: int,
+        exclude_idx: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k for a raw query vector among the given rows only (e.g. a spatial pre-filter); returns matrix rows."""
+        rows = np.asarray(rows, dtype=np.int64)
+        scales = self.scales[rows] if self.scales is not None else None
+        scores = dot_scores(l2_normalize(query.reshape(-1)), self.unit_matrix[rows], scales)
+        if exclude_idx is not None and len(exclude_idx):
+            scores[np.isin(rows, exclude_idx)] = -np.inf
+        local, top_scores = top_k(scores, k)
+        return rows[local], top_scores
+
+    def search_rows(
+        self,
+        rows: np.ndarray,
+        k: int,
+        exclude_idx: Optional[Sequence[np.ndarray]] = None,
+        block_rows: Optional[int] = None,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Batched top-k for rows already in the matrix; see batched_top_k()."""
+        return batched_top_k(self.rows(rows), self.unit_matrix, k, exclude_idx, block_rows, self.scales)
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        k: int,
+        exclude_idx: Optional[Sequence[np.ndarray]] = None,
+        block_rows: Optional[int] = None,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Batched top-k for raw (unnormalized) query vectors; see batched_top_k()."""
+        return batched_top_k(l2_normalize(queries), self.unit_matrix, k, exclude_idx, block_rows, self.scales)
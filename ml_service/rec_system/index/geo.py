@@ -0,0 +1,130 @@
+"""
+Spatial candidate pre-filter for content-based search.
+
+GeoIndex is a BallTree (haversine metric) over user coordinates, built with the
+CB model. A query first takes the users within radius_km of the target; if that
+leaves too few, it takes the nearest users instead (at least min_candidates).
+Cosine scoring then runs over those rows only, so a query costs in proportion to
+local user density rather than to the total number of users.
+
+Coordinates are recovered from the model's normalized latitude/longitude feature
+columns, so no extra arrays are stored with the model.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def _number_env(key: str, default, cast=float):
+    """Parse a number from env var with fallback."""
+    raw = os.getenv(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        logger.warning("Invalid value for %s='%s', using default %s", key, raw, default)
+        return default
+
+
+@dataclass
+class GeoConfig:
+    """Spatial pre-filter settings. from_env() reads <prefix>_GEO_* env vars (e.g. CB_GEO_RADIUS_KM)."""
+
+    radius_km: float = 150.0    # 0 disables the pre-filter
+    min_candidates: int = 1000  # fall back to this many nearest users when the radius holds fewer
+    min_rows: int = 50000       # below this, scoring every row is already fast enough
+
+    @classmethod
+    def from_env(cls, prefix: str) -> "GeoConfig":
+        return cls(
+            radius_km=_number_env(f"{prefix}_GEO_RADIUS_KM", cls.radius_km, float),
+            min_candidates=_number_env(f"{prefix}_GEO_MIN_CANDIDATES", cls.min_candidates, int),
+            min_rows=_number_env(f"{prefix}_GEO_MIN_ROWS", cls.min_rows, int),
+        )
+
+
+def coordinates_from_features(features: np.ndarray, feature_names: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(latitudes, longitudes) in degrees from the normalized 'latitude'/'longitude' feature columns."""
+    features = np.atleast_2d(features)
+    lat_col, lng_col = list(feature_names).index("latitude"), list(feature_names).index("longitude")
+    return (
+        features[:, lat_col].astype(np.float64) * 180.0 - 90.0,
+        features[:, lng_col].astype(np.float64) * 360.0 - 180.0,
+    )
+
+
+class GeoIndex:
+    """BallTree over (lat, lon) in radians; queries return row indices of nearby users."""
+
+    def __init__(self, latitudes: np.ndarray, longitudes: np.ndarray, config: GeoConfig):
+        from sklearn.neighbors import BallTree
+
+        self.config = config
+        self.n_rows = len(latitudes)
+        self.tree = BallTree(np.radians(np.column_stack([latitudes, longitudes])), metric="haversine")
+
+    def candidates(
+        self,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        min_count: Optional[Sequence[int]] = None,
+    ) -> List[np.ndarray]:
+        """
+        Candidate rows for each query point: everyone within radius_km, or the nearest users when
+        that is fewer than max(min_candidates, min_count[i]).
+
+        Args:
+            latitudes, longitudes: Query points in degrees.
+            min_count: Per-query lower bound on candidates (e.g. k + excluded rows).
+
+        Returns:
+            One int64 row-index array per query point.
+        """
+        points = np.radians(np.column_stack([np.atleast_1d(latitudes), np.atleast_1d(longitudes)]))
+        wanted = np.full(len(points), self.config.min_candidates, dtype=np.int64)
+        if min_count is not None:
+            wanted = np.maximum(wanted, np.asarray(min_count, dtype=np.int64))
+        wanted = np.minimum(wanted, self.n_rows)
+
+        in_radius = self.tree.query_radius(points, r=self.config.radius_km / EARTH_RADIUS_KM)
+        results = [rows.astype(np.int64) for rows in in_radius]
+        short = [i for i, rows in enumerate(results) if len(rows) < wanted[i]]
+        if short:
+            # One k-NN query for every short query point, at the largest k any of them needs
+            _, nearest = self.tree.query(points[short], k=int(wanted[short].max()))
+            for i, rows in zip(short, nearest):
+                results[i] = rows[:wanted[i]].astype(np.int64)
+        return results
+
+
+def build_geo_index(
+    feature_matrix: np.ndarray,
+    feature_names: Sequence[str],
+    config: Optional[GeoConfig] = None,
+) -> Optional[GeoIndex]:
+    """
+    Build the spatial pre-filter for a CB feature matrix, or return None when every row should be
+    scored (disabled, fewer than min_rows rows, or no coordinate features).
+    """
+    config = config or GeoConfig()
+    n_rows = feature_matrix.shape[0] if feature_matrix.ndim == 2 else 0
+    if config.radius_km <= 0 or n_rows < max(1, config.min_rows):
+        return None
+    if "latitude" not in feature_names or "longitude" not in feature_names:
+        logger.warning("No latitude/longitude features; geo pre-filter disabled")
+        return None
+
+    latitudes, longitudes = coordinates_from_features(feature_matrix, feature_names)
+    index = GeoIndex(latitudes, longitudes, config)
+    logger.info("Built geo index over %d rows (radius %.0f km)", n_rows, config.radius_km)
+    return index
@@ -0,0 +1,112 @@
+"""
+Precomputed top-K neighbour tables.
+
+Built offline by the trainers right after a model is produced: every row's K most
+similar rows (self excluded), stored columnar as
+
+    neighbor_ids     (n_rows, K) int32, descending by score, -1 padded
+    neighbor_scores  (n_rows, K) float16 cosine similarity
+
+At K=200 that is 1.2 KB per user. A request is then a slice of one row plus an
+exclusion filter; callers fall back to brute force when a user is not in the
+table or exclusions leave fewer than k neighbours.
+"""
+
+import logging
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ml_service.rec_system.index.exact import ExactIndex, block_rows_for
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+NEIGHBOR_IDS_FILE = "neighbor_ids.npy"
+NEIGHBOR_SCORES_FILE = "neighbor_scores.npy"
+
+# Neighbours precomputed per user by the trainers; 0 disables the table
+ENV_NEIGHBORS_K = "NEIGHBORS_K"
+DEFAULT_NEIGHBORS_K = 200
+
+
+def neighbors_k_from_env() -> int:
+    """NEIGHBORS_K, falling back to the default on bad input."""
+    raw = os.getenv(ENV_NEIGHBORS_K)
+    if raw is None or raw == "":
+        return DEFAULT_NEIGHBORS_K
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning("Invalid int for %s='%s', using default %d", ENV_NEIGHBORS_K, raw, DEFAULT_NEIGHBORS_K)
+        return DEFAULT_NEIGHBORS_K
+
+
+class NeighborTable:
+    """Row -> top-K (ids, scores) lookups over the precomputed arrays (in memory or memory-mapped)."""
+
+    def __init__(self, ids: np.ndarray, scores: np.ndarray):
+        if ids.shape != scores.shape or ids.ndim != 2:
+            raise ValueError(f"Neighbour ids {ids.shape} and scores {scores.shape} do not match")
+        self.ids = ids
+        self.scores = scores
+        self.n_rows, self.k = ids.shape
+
+    def complete(self) -> bool:
+        """True when each row lists every other row, so exclusions can never make a lookup fall short."""
+        return self.k >= self.n_rows - 1
+
+    def lookup(
+        self,
+        row: int,
+        k: int,
+        exclude_idx: Optional[np.ndarray] = None,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Top-k (indices, float32 scores) for a row, skipping exclude_idx.
+
+        Returns:
+            None if the table cannot answer (k beyond the table, or too few left after exclusion);
+            the caller should fall back to brute force.
+        """
+        ids, scores = self.ids[row], self.scores[row]
+        keep = ids >= 0
+        if exclude_idx is not None and len(exclude_idx):
+            keep &= ~np.isin(ids, exclude_idx)
+        ids, scores = ids[keep][:k], scores[keep][:k]
+        if len(ids) < k and not self.complete():
+            return None
+        return ids.astype(np.int64), scores.astype(np.float32)
+
+
+def build_neighbor_table(
+    unit_matrix: np.ndarray,
+    k: int = DEFAULT_NEIGHBORS_K,
+    scales: Optional[np.ndarray] = None,
+    block_rows: Optional[int] = None,
+) -> NeighborTable:
+    """
+    Exact top-k neighbours of every row, computed as blocked GEMMs.
+
+    Args:
+        unit_matrix: (n_rows, dim) L2-normalized rows (or int8 codes with scales).
+        k: Neighbours per row (capped at n_rows - 1).
+        scales: Per-row scales when unit_matrix holds int8 codes.
+        block_rows: Rows per GEMM block; default from block_rows_for().
+    """
+    n_rows = unit_matrix.shape[0]
+    k = max(0, min(k, n_rows - 1))
+    ids = np.full((n_rows, k), -1, dtype=np.int32)
+    scores = np.zeros((n_rows, k), dtype=np.float16)
+
+    index = ExactIndex(unit_matrix, normalized=True, scales=scales)
+    block_rows = block_rows or block_rows_for(n_rows)
+    for start in range(0, n_rows, block_rows):
+        rows = np.arange(start, min(start + block_rows, n_rows))
+        results = index.search_rows(rows, k, [np.array([row]) for row in rows], block_rows)
+        for row, (row_ids, row_scores) in zip(rows, results):
+            ids[row, :len(row_ids)] = row_ids
+            scores[row, :len(row_scores)] = row_scores
+    logger.info("Built top-%d neighbour table for %d rows", k, n_rows)
+    return NeighborTable(ids, scores)
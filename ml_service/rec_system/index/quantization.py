@@ -0,0 +1,56 @@
+"""
+Scalar quantization of unit-normalized embedding rows.
+
+    float16  2 bytes/dim, no scales
+    int8     1 byte/dim + one float32 scale per row: row ~= codes * scale, scale = max|row| / 127
+
+Cosine scores are computed straight from the codes (see ExactIndex): for int8,
+score = scale_i * (codes_i . q). A 128-dim float32 row (512 B) becomes 256 B or 132 B.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+QUANTIZATION_MODES = ("none", "float16", "int8")
+
+
+def quantize(unit_matrix: np.ndarray, mode: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Quantize rows.
+
+    Args:
+        unit_matrix: (n_rows, dim) float rows.
+        mode: One of QUANTIZATION_MODES.
+
+    Returns:
+        (codes, scales). scales is None unless mode is int8.
+    """
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode '{mode}', expected one of {QUANTIZATION_MODES}")
+    matrix = np.asarray(unit_matrix, dtype=np.float32)
+    if mode == "none":
+        return matrix, None
+    if mode == "float16":
+        return matrix.astype(np.float16), None
+
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize(codes: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """float32 rows back from codes (and per-row scales for int8)."""
+    matrix = np.asarray(codes, dtype=np.float32)
+    return matrix * scales[:, None] if scales is not None else matrix
+
+
+def mode_of(dtype) -> str:
+    """Quantization mode implied by a dtype (float32 -> none)."""
+    dtype = np.dtype(dtype)
+    if dtype == np.int8:
+        return "int8"
+    if dtype == np.float16:
+        return "float16"
+    return "none"
@@ -0,0 +1,180 @@
+"""
+Hot reload of model artifacts without restarting the process.
+
+A ModelRegistry holds the live model (any immutable snapshot object) and a
+version string for it. A background watcher polls the artifact's version
+(e.g. the store's CURRENT file), and when it changes, loads and validates the
+new version on the watcher thread and then swaps the reference in one
+assignment. Requests read `registry.current` once and use that object to the
+end, so requests already running finish on the old version while new ones see
+the new one.
+
+With lazy=True nothing is loaded until `current` is first read, so processes
+that never serve from the model never pay for loading it.
+
+If a new version fails to load or validate (dimension mismatch, empty
+vocabulary, corrupt file), the registry keeps serving the previous model and
+remembers the rejected version so it is not retried on every poll.
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Generic, Optional, Set, TypeVar
+
+from ml_service.rec_system.index.store import CURRENT_FILE, current_version
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Seconds between version checks; 0 disables the watcher
+ENV_RELOAD_INTERVAL = "MODEL_RELOAD_INTERVAL"
+DEFAULT_RELOAD_INTERVAL = 30
+
+
+def reload_interval_from_env() -> int:
+    """MODEL_RELOAD_INTERVAL in seconds, falling back to the default on bad input."""
+    raw = os.getenv(ENV_RELOAD_INTERVAL)
+    if raw is None or raw == "":
+        return DEFAULT_RELOAD_INTERVAL
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning("Invalid int for %s='%s', using default %d", ENV_RELOAD_INTERVAL, raw, DEFAULT_RELOAD_INTERVAL)
+        return DEFAULT_RELOAD_INTERVAL
+
+
+def artifact_version(path) -> Optional[str]:
+    """
+    Version of the artifact at path: CURRENT for a store root, else the file's mtime/size stamp.
+    Returns None if nothing exists there yet.
+    """
+    path = Path(path)
+    if (path / CURRENT_FILE).exists():
+        return current_version(path)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+class ModelRegistry(Generic[T]):
+    """Holds the live model for one artifact and swaps it when a new, valid version appears."""
+
+    def __init__(
+        self,
+        name: str,
+        version_fn: Callable[[], Optional[str]],
+        load_fn: Callable[[Optional[str]], T],
+        validate_fn: Optional[Callable[[T, T], None]] = None,
+        lazy: bool = False,
+    ):
+        """
+        Args:
+            name: Label for log lines (e.g. "cf").
+            version_fn: Returns the artifact's current version (None if absent).
+            load_fn: Builds the model for a version.
+            validate_fn: validate_fn(new, old) raises ValueError if new must not replace old.
+            lazy: Defer loading to the first read of `current` instead of loading here.
+        """
+        self.name = name
+        self._version_fn = version_fn
+        self._load_fn = load_fn
+        self._validate_fn = validate_fn
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._rejected: Set[str] = set()
+        self._previous: Optional[T] = None
+        self._previous_version: Optional[str] = None
+
+        self.version: Optional[str] = None
+        self._current: Optional[T] = None
+        self._loaded = False
+        if not lazy:
+            self._load()
+
+    def _load(self):
+        self.version = self._version_fn()
+        self._current = self._load_fn(self.version)
+        self._loaded = True
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def current(self) -> T:
+        """The live model; loaded here on first read when the registry is lazy."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    logger.info("<%s> Loading model on first use", self.name)
+                    self._load()
+        return self._current
+
+    def check(self) -> bool:
+        """
+        Load, validate and swap in a new version if one was published.
+
+        Returns:
+            True if the live model changed.
+        """
+        with self._lock:
+            try:
+                version = self._version_fn()
+            except OSError as e:
+                logger.warning("<%s> Could not read artifact version: %s", self.name, e)
+                return False
+            if not self._loaded or version is None or version == self.version or version in self._rejected:
+                return False
+
+            try:
+                model = self._load_fn(version)
+                if self._validate_fn is not None:
+                    self._validate_fn(model, self._current)
+            except Exception as e:
+                self._rejected.add(version)
+                logger.error("<%s> Rejected version %s, keeping %s: %s", self.name, version, self.version, e)
+                return False
+
+            self._previous, self._previous_version = self._current, self.version
+            # Single reference assignment: in-flight readers keep the object they already hold
+            self._current, self.version = model, version
+            logger.info("<%s> Swapped in version %s (was %s)", self.name, version, self._previous_version)
+            return True
+
+    def rollback(self) -> bool:
+        """Swap back to the previously served version; it stays pinned until a newer one is published."""
+        with self._lock:
+            if self._previous is None:
+                return False
+            self._rejected.add(self.version)
+            self._current, self.version = self._previous, self._previous_version
+            self._previous, self._previous_version = None, None
+            logger.info("<%s> Rolled back to version %s", self.name, self.version)
+            return True
+
+    def start(self, interval: Optional[int] = None):
+        """Start the background watcher (no-op if interval <= 0 or already running)."""
+        interval = reload_interval_from_env() if interval is None else interval
+        if interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, args=(interval,), name=f"{self.name}-reload", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background watcher."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self, interval: int):
+        while not self._stop.wait(interval):
+            self.check()
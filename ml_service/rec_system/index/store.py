@@ -0,0 +1,305 @@
+"""
+Versioned, memory-mappable on-disk format for embedding / feature matrices.
+
+Layout under a store root (e.g. data/embeddings/cf):
+    CURRENT                 name of the active version (replaced atomically)
+    <version>/matrix.npy    (n_rows, dim) float32 or float16 rows L2-normalized, or int8 codes; sorted by name
+    <version>/scales.npy    (n_rows,) float32 per-row scales, int8 only (unit row = codes * scale)
+    <version>/norms.npy     (n_rows,) float32 original row norms (raw vector = unit row * norm)
+    <version>/vocab.npy     (n_rows,) fixed-width utf-8 names, sorted ascending
+    <version>/meta.json     format_version, version, n_rows, dim, dtype, created_at, extras
+    <version>/neighbor_ids.npy, neighbor_scores.npy
+                            optional precomputed top-K table (see rec_system.index.neighbors)
+
+Everything is opened with np.load(mmap_mode="r"), so loading costs no copy and
+several worker processes share the same pages through the OS page cache. Name
+lookups are binary searches over the memory-mapped vocab, not a Python dict.
+
+Convert a legacy pickle ({name: vector}) with:
+    python -m ml_service.rec_system.index.store <embeddings.pkl> <store_root>
+"""
+
+import json
+import logging
+import os
+import pickle
+import shutil
+import sys
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from ml_service.rec_system.index.exact import l2_normalize
+from ml_service.rec_system.index.neighbors import (
+    NEIGHBOR_IDS_FILE,
+    NEIGHBOR_SCORES_FILE,
+    NeighborTable,
+    build_neighbor_table,
+    neighbors_k_from_env,
+)
+from ml_service.rec_system.index.quantization import dequantize, mode_of, quantize
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+CURRENT_FILE = "CURRENT"
+MATRIX_FILE = "matrix.npy"
+NORMS_FILE = "norms.npy"
+SCALES_FILE = "scales.npy"
+VOCAB_FILE = "vocab.npy"
+META_FILE = "meta.json"
+
+
+class _NameIndex(Mapping):
+    """Read-only name -> row mapping backed by binary search over the sorted vocab array."""
+
+    def __init__(self, names: np.ndarray):
+        self._names = names
+
+    def __getitem__(self, name: str) -> int:
+        key = name.encode("utf-8") if isinstance(name, str) else name
+        if not isinstance(key, bytes) or len(key) > self._names.dtype.itemsize:
+            raise KeyError(name)
+        pos = int(np.searchsorted(self._names, key))
+        if pos < len(self._names) and self._names[pos] == key:
+            return pos
+        raise KeyError(name)
+
+    def __iter__(self):
+        return (name.decode("utf-8") for name in self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class Vocabulary(Sequence):
+    """Row -> name sequence over a sorted fixed-width bytes array; `.index` maps name -> row."""
+
+    def __init__(self, names: np.ndarray):
+        self._names = names
+        self.index = _NameIndex(names)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [name.decode("utf-8") for name in self._names[i]]
+        return self._names[i].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+@dataclass
+class MatrixArtifact:
+    """A loaded matrix version: unit-normalized rows, their norms, and the vocabulary.
+
+    unit_matrix holds int8 codes when scales is set (see quantization.py).
+    """
+
+    unit_matrix: np.ndarray
+    norms: np.ndarray
+    vocab: Vocabulary
+    meta: dict = field(default_factory=dict)
+    path: Optional[Path] = None
+    scales: Optional[np.ndarray] = None
+    neighbors: Optional[NeighborTable] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.meta.get("version")
+
+    @property
+    def quantization(self) -> str:
+        return mode_of(self.unit_matrix.dtype)
+
+    def vector(self, row: int) -> np.ndarray:
+        """Original (un-normalized) vector for a row, as float32."""
+        unit = self.unit_matrix[row].astype(np.float32)
+        if self.scales is not None:
+            unit *= np.float32(self.scales[row])
+        return unit * np.float32(self.norms[row])
+
+    def dequantized(self) -> np.ndarray:
+        """Full float32 unit matrix (a copy unless already float32)."""
+        return dequantize(self.unit_matrix, self.scales)
+
+    def quantized(self, mode: str) -> "MatrixArtifact":
+        """Copy of this artifact re-encoded in memory as mode (none, float16 or int8)."""
+        if mode == self.quantization:
+            return self
+        codes, scales = quantize(self.dequantized(), mode)
+        meta = {**self.meta, "dtype": codes.dtype.name}
+        return MatrixArtifact(codes, self.norms, self.vocab, meta, self.path, scales, self.neighbors)
+
+
+def _new_version() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S%f")
+
+
+def _sorted_arrays(names: Iterable[str], matrix: np.ndarray, dtype=np.float32):
+    """Sort rows by name and split into (vocab, unit_matrix, norms, scales); int8 yields scales."""
+    vocab = np.array([name.encode("utf-8") for name in names], dtype=np.bytes_)
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim != 2 or matrix.shape[0] != len(vocab):
+        raise ValueError(f"Matrix shape {matrix.shape} does not match vocabulary size {len(vocab)}")
+    order = np.argsort(vocab, kind="stable")
+    vocab, matrix = vocab[order], matrix[order]
+    if len(vocab) > 1 and np.any(vocab[1:] == vocab[:-1]):
+        raise ValueError("Duplicate names in vocabulary")
+    norms = np.linalg.norm(matrix, axis=1).astype(np.float32)
+    unit_matrix, scales = quantize(l2_normalize(matrix), mode_of(dtype))
+    return vocab, unit_matrix, norms, scales
+
+
+def artifact_from_arrays(names: Iterable[str], matrix: np.ndarray, meta: Optional[dict] = None) -> MatrixArtifact:
+    """In-memory artifact (same layout as a loaded one), e.g. for legacy pickles."""
+    vocab, unit_matrix, norms, _ = _sorted_arrays(names, matrix)
+    validate(unit_matrix, norms, vocab)
+    return MatrixArtifact(unit_matrix, norms, Vocabulary(vocab), dict(meta or {}))
+
+
+def validate(unit_matrix: np.ndarray, norms: np.ndarray, vocab: np.ndarray, expected_dim: Optional[int] = None):
+    """Raise ValueError if the arrays are inconsistent, empty, or not of expected_dim."""
+    if len(vocab) == 0:
+        raise ValueError("Empty vocabulary")
+    if unit_matrix.ndim != 2 or unit_matrix.shape[0] != len(vocab) or norms.shape != (len(vocab),):
+        raise ValueError(
+            f"Inconsistent artifact: matrix {unit_matrix.shape}, norms {norms.shape}, vocab {len(vocab)}"
+        )
+    if expected_dim is not None and unit_matrix.shape[1] != expected_dim:
+        raise ValueError(f"Dimension mismatch: expected {expected_dim}, got {unit_matrix.shape[1]}")
+
+
+def current_version(root) -> Optional[str]:
+    """Active version name under a store root, or None if nothing has been published."""
+    try:
+        return (Path(root) / CURRENT_FILE).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def save_matrix(
+    root,
+    names: Iterable[str],
+    matrix: np.ndarray,
+    dtype=np.float32,
+    extra_meta: Optional[dict] = None,
+    keep_versions: int = 3,
+    neighbors_k: int = 0,
+) -> Path:
+    """
+    Write a new version under root and make it CURRENT.
+
+    The version directory is fully written before CURRENT is swapped, so readers
+    never see a partial artifact. Older versions beyond keep_versions are removed.
+    With neighbors_k > 0, each row's top-k neighbour table is computed and stored too.
+
+    Returns:
+        Path to the new version directory.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    vocab, unit_matrix, norms, scales = _sorted_arrays(names, matrix, dtype)
+    validate(unit_matrix, norms, vocab)
+
+    version = _new_version()
+    tmp_dir = root / f".tmp-{version}"
+    tmp_dir.mkdir()
+    np.save(tmp_dir / MATRIX_FILE, np.ascontiguousarray(unit_matrix))
+    np.save(tmp_dir / NORMS_FILE, norms)
+    np.save(tmp_dir / VOCAB_FILE, vocab)
+    if scales is not None:
+        np.save(tmp_dir / SCALES_FILE, scales)
+    if neighbors_k > 0:
+        table = build_neighbor_table(unit_matrix, neighbors_k, scales)
+        np.save(tmp_dir / NEIGHBOR_IDS_FILE, table.ids)
+        np.save(tmp_dir / NEIGHBOR_SCORES_FILE, table.scores)
+    meta = {
+        **(extra_meta or {}),
+        "format_version": FORMAT_VERSION,
+        "version": version,
+        "n_rows": int(unit_matrix.shape[0]),
+        "dim": int(unit_matrix.shape[1]),
+        "dtype": np.dtype(dtype).name,
+        "neighbors_k": int(table.k) if neighbors_k > 0 else 0,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    (tmp_dir / META_FILE).write_text(json.dumps(meta, indent=2))
+    version_dir = root / version
+    os.rename(tmp_dir, version_dir)
+
+    tmp_current = root / f".{CURRENT_FILE}.tmp"
+    tmp_current.write_text(version)
+    os.replace(tmp_current, root / CURRENT_FILE)
+    logger.info("Saved %d x %d %s matrix to %s", meta["n_rows"], meta["dim"], meta["dtype"], version_dir)
+
+    versions = sorted(p for p in root.iterdir() if p.is_dir() and not p.name.startswith("."))
+    for old in versions[:-keep_versions] if keep_versions > 0 else []:
+        shutil.rmtree(old, ignore_errors=True)
+    return version_dir
+
+
+def load_matrix(path, mmap: bool = True, expected_dim: Optional[int] = None) -> MatrixArtifact:
+    """
+    Load a version directory, or the CURRENT version of a store root.
+
+    Args:
+        path: Store root or version directory.
+        mmap: Memory-map the arrays (default) instead of reading them into RAM.
+        expected_dim: If set, reject artifacts of another dimension.
+
+    Raises:
+        FileNotFoundError: no artifact at path.
+        ValueError: unsupported format or inconsistent/empty artifact.
+    """
+    path = Path(path)
+    version = current_version(path)
+    if version is not None:
+        path = path / version
+    meta_path = path / META_FILE
+    if not meta_path.exists():
+        raise FileNotFoundError(f"No matrix artifact at {path}")
+
+    meta = json.loads(meta_path.read_text())
+    if meta.get("format_version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format_version {meta.get('format_version')} at {path}")
+    mmap_mode = "r" if mmap else None
+    unit_matrix = np.load(path / MATRIX_FILE, mmap_mode=mmap_mode)
+    norms = np.load(path / NORMS_FILE, mmap_mode=mmap_mode)
+    vocab = np.load(path / VOCAB_FILE, mmap_mode=mmap_mode)
+    scales = np.load(path / SCALES_FILE, mmap_mode=mmap_mode) if (path / SCALES_FILE).exists() else None
+    validate(unit_matrix, norms, vocab, expected_dim)
+    if unit_matrix.dtype == np.int8 and (scales is None or scales.shape != norms.shape):
+        raise ValueError(f"int8 artifact at {path} is missing per-row scales")
+
+    neighbors = None
+    if (path / NEIGHBOR_IDS_FILE).exists():
+        ids = np.load(path / NEIGHBOR_IDS_FILE, mmap_mode=mmap_mode)
+        scores = np.load(path / NEIGHBOR_SCORES_FILE, mmap_mode=mmap_mode)
+        if ids.shape[0] == len(vocab) and ids.shape == scores.shape:
+            neighbors = NeighborTable(ids, scores)
+        else:
+            logger.warning("Ignoring neighbour table at %s: shape %s for %d rows", path, ids.shape, len(vocab))
+    return MatrixArtifact(unit_matrix, norms, Vocabulary(vocab), meta, path, scales, neighbors)
+
+
+def convert_pickle(pickle_path, root, dtype=np.float32, neighbors_k: int = 0) -> Path:
+    """Write a legacy {name: vector} pickle as a new store version."""
+    with open(pickle_path, "rb") as f:
+        raw = pickle.load(f)
+    names = list(raw.keys())
+    matrix = np.asarray([raw[name] for name in names], dtype=np.float32)
+    return save_matrix(
+        root, names, matrix, dtype=dtype, extra_meta={"source": str(pickle_path)}, neighbors_k=neighbors_k
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python -m ml_service.rec_system.index.store <embeddings.pkl> <store_root>")
+        sys.exit(1)
+    print(convert_pickle(sys.argv[1], sys.argv[2], neighbors_k=neighbors_k_from_env()))
@@ -0,0 +1,66 @@
+"""
+Micro-benchmark: per-query exact top-k time, old vs new search path.
+
+old: sklearn cosine_similarity (re-normalizes the whole matrix) + full argsort + Python filter loop
+new: dot product against a matrix normalized once + vectorized exclusion mask + argpartition top-k
+
+Usage:
+    python -m ml_service.rec_system.scripts.benchmark_similarity [--rows 10000 100000 1000000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from ml_service.rec_system.index.exact import ExactIndex
+
+
+def _old_query(matrix: np.ndarray, row: int, k: int, exclude: set) -> list:
+    similarities = cosine_similarity(matrix[row].reshape(1, -1), matrix)[0]
+    results = []
+    for idx in np.argsort(similarities)[::-1]:
+        if idx in exclude:
+            continue
+        results.append((idx, float(similarities[idx])))
+        if len(results) >= k:
+            break
+    return results
+
+
+def _time_per_query(fn, rows: np.ndarray) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        fn(int(row))
+    return (time.perf_counter() - start) / len(rows) * 1000.0
+
+
+def run(sizes, dim: int = 128, k: int = 20, n_exclude: int = 50, queries: int = 20, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    print(f"dim={dim} k={k} excluded={n_exclude} queries={queries}")
+    print(f"{'rows':>10} {'old ms/query':>14} {'new ms/query':>14} {'speedup':>9}")
+    for n_rows in sizes:
+        matrix = rng.standard_normal((n_rows, dim), dtype=np.float32)
+        index = ExactIndex(matrix)
+        rows = rng.integers(0, n_rows, size=queries)
+        exclude_idx = rng.integers(0, n_rows, size=n_exclude)
+        exclude = set(exclude_idx.tolist())
+
+        old_ms = _time_per_query(lambda r: _old_query(matrix, r, k, exclude | {r}), rows)
+        new_ms = _time_per_query(lambda r: index.search_row(r, k, np.append(exclude_idx, r)), rows)
+        print(f"{n_rows:>10} {old_ms:>14.3f} {new_ms:>14.3f} {old_ms / new_ms:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+    run(args.rows, dim=args.dim, k=args.k, queries=args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Tests for the CSR random-walk engine (rec_system.cf.walk_engine)."""
+
+import io
+
+import numpy as np
+import pytest
+
+from ml_service.rec_system.cf import walk_engine
+from ml_service.rec_system.cf.walk_engine import CSRGraph, WalkCorpus, iter_random_walks, random_walks
+
+
+def _graph(edges, n_nodes):
+    src, dst = zip(*edges) if edges else ((), ())
+    return CSRGraph.from_edges(np.array(src), np.array(dst), [f"u{i}" for i in range(n_nodes)])
+
+
+def test_from_edges_keeps_isolated_nodes():
+    graph = _graph([(4, 0), (0, 2), (2, 4), (0, 4)], n_nodes=5)
+
+    assert graph.n_nodes == 5
+    assert graph.indptr.tolist() == [0, 2, 2, 3, 3, 4]
+    assert graph.out_degree.tolist() == [2, 0, 1, 0, 1]
+    assert sorted(graph.indices[graph.indptr[0]:graph.indptr[1]]) == [2, 4]
+    assert graph.indices[graph.indptr[2]:graph.indptr[3]].tolist() == [4]
+    assert graph.indices[graph.indptr[4]:graph.indptr[5]].tolist() == [0]
+
+
+def test_walks_start_only_from_nodes_with_out_edges():
+    graph = _graph([(4, 0), (0, 2), (2, 4), (0, 4)], n_nodes=5)
+
+    walks = random_walks(graph, walk_length=6, walks_per_node=3)
+
+    assert walks.shape == (9, 6)
+    assert sorted(walks[:, 0].tolist()) == [0, 0, 0, 2, 2, 2, 4, 4, 4]
+    # Isolated nodes are never reached
+    assert not np.isin(walks, [1, 3]).any()
+
+
+def test_graph_without_edges_gives_single_node_walks():
+    graph = _graph([], n_nodes=3)
+
+    walks = random_walks(graph, walk_length=4, walks_per_node=2)
+
+    assert sorted(walks[:, 0].tolist()) == [0, 0, 1, 1, 2, 2]
+    assert (walks[:, 1:] == -1).all()
+
+
+def test_dead_end_walkers_are_padded_with_minus_one():
+    # 0 -> 1 -> 2 stops at 2; 3 <-> 4 never stops
+    graph = _graph([(0, 1), (1, 2), (3, 4), (4, 3)], n_nodes=5)
+
+    walks = random_walks(graph, walk_length=5, walks_per_node=4, start_nodes=np.array([0, 3]))
+
+    rows = {tuple(row) for row in walks.tolist()}
+    assert rows == {(0, 1, 2, -1, -1), (3, 4, 3, 4, 3)}
+    assert len(walks) == 8
+
+
+def test_batched_walks_follow_edges():
+    graph = _graph([(i, (i * 7 + 3) % 50) for i in range(50)] + [(i, (i + 1) % 50) for i in range(0, 50, 2)], 50)
+
+    batches = list(iter_random_walks(graph, walk_length=8, walks_per_node=4, seed=7, batch_walks=33))
+
+    assert [len(batch) for batch in batches] == [33] * 6 + [2]
+    walks = np.concatenate(batches)
+    assert sorted(walks[:, 0].tolist()) == sorted(list(range(50)) * 4)
+    for walk in walks:
+        for here, there in zip(walk[:-1], walk[1:]):
+            assert there in graph.indices[graph.indptr[here]:graph.indptr[here + 1]]
+
+
+@pytest.mark.parametrize("draw", [np.nextafter(np.float32(1), np.float32(0)), np.float32(1)])
+def test_offset_is_clamped_to_the_last_neighbour(monkeypatch, draw):
+    # Node 0's edges are slots 0..2; slot 3 is node 1's edge to 4, which 0 must never reach
+    graph = _graph([(0, 1), (0, 2), (0, 3), (1, 4), (2, 0), (3, 0), (4, 0)], n_nodes=5)
+    default_rng = np.random.default_rng
+
+    class TopDraws:
+        """Real permutations, but every step draws the largest value (float32 rounding up to 1.0 included)."""
+
+        def __init__(self, seed):
+            self._rng = default_rng(seed)
+
+        def permutation(self, x):
+            return self._rng.permutation(x)
+
+        def random(self, size, dtype):
+            return np.full(size, draw, dtype=dtype)
+
+    monkeypatch.setattr(walk_engine.np.random, "default_rng", TopDraws)
+
+    walks = random_walks(graph, walk_length=3, walks_per_node=1, start_nodes=np.array([0]))
+
+    assert walks.tolist() == [[0, 3, 0]]
+
+
+def test_corpus_writes_names_up_to_the_dead_end():
+    graph = _graph([(0, 1), (1, 2)], n_nodes=3)
+    out = io.StringIO()
+
+    n_walks = WalkCorpus(graph, walk_length=4, walks_per_node=2).write(out)
+
+    assert n_walks == 4
+    assert sorted(out.getvalue().splitlines()) == ["u0 u1 u2"] * 2 + ["u1 u2"] * 2
@@ -0,0 +1,160 @@
+"""Tests for the on-disk matrix store and row quantization (rec_system.index)."""
+
+import numpy as np
+import pytest
+
+from ml_service.rec_system.index.quantization import dequantize, mode_of, quantize
+from ml_service.rec_system.index.store import (
+    CURRENT_FILE,
+    current_version,
+    load_matrix,
+    save_matrix,
+)
+
+
+def _rows(n_rows=6, dim=4, seed=0):
+    rng = np.random.default_rng(seed)
+    names = [f"user{i}" for i in rng.permutation(n_rows)]
+    return names, rng.normal(size=(n_rows, dim)).astype(np.float32) * 3
+
+
+def test_save_load_round_trip(tmp_path):
+    names, matrix = _rows()
+
+    version_dir = save_matrix(tmp_path, names, matrix, extra_meta={"source": "test"})
+    artifact = load_matrix(tmp_path)
+
+    assert current_version(tmp_path) == version_dir.name
+    assert artifact.path == version_dir
+    assert artifact.meta["source"] == "test"
+    assert (artifact.meta["n_rows"], artifact.meta["dim"], artifact.meta["dtype"]) == (6, 4, "float32")
+    assert isinstance(artifact.unit_matrix, np.memmap)
+    assert list(artifact.vocab) == sorted(names)
+    np.testing.assert_allclose(np.linalg.norm(artifact.unit_matrix, axis=1), 1.0, rtol=1e-6)
+    for name, row in zip(names, matrix):
+        np.testing.assert_allclose(artifact.vector(artifact.vocab.index[name]), row, rtol=1e-5)
+
+
+def test_load_without_mmap_reads_into_memory(tmp_path):
+    names, matrix = _rows()
+    save_matrix(tmp_path, names, matrix)
+
+    artifact = load_matrix(tmp_path, mmap=False)
+
+    assert not isinstance(artifact.unit_matrix, np.memmap)
+    assert artifact.vocab[0] == "user0"
+
+
+def test_name_lookup_rejects_unknown_names(tmp_path):
+    names, matrix = _rows()
+    save_matrix(tmp_path, names, matrix)
+    index = load_matrix(tmp_path).vocab.index
+
+    assert "user3" in index
+    assert "user" not in index
+    assert "user33" not in index
+    assert "x" * 100 not in index
+
+
+def test_int8_round_trip_stores_scales(tmp_path):
+    names, matrix = _rows(dim=16)
+
+    version_dir = save_matrix(tmp_path, names, matrix, dtype=np.int8)
+    artifact = load_matrix(version_dir)
+
+    assert artifact.quantization == "int8"
+    assert artifact.scales is not None and artifact.scales.shape == (6,)
+    for name, row in zip(names, matrix):
+        vector = artifact.vector(artifact.vocab.index[name])
+        assert np.abs(vector - row).max() <= np.abs(row).max() / 127
+
+
+def test_int8_artifact_without_scales_is_rejected(tmp_path):
+    names, matrix = _rows()
+    version_dir = save_matrix(tmp_path, names, matrix, dtype=np.int8)
+    (version_dir / "scales.npy").unlink()
+
+    with pytest.raises(ValueError, match="scales"):
+        load_matrix(tmp_path)
+
+
+def test_old_versions_are_pruned(tmp_path):
+    names, matrix = _rows()
+
+    versions = [save_matrix(tmp_path, names, matrix * (i + 1), keep_versions=2).name for i in range(4)]
+
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == versions[-2:]
+    assert (tmp_path / CURRENT_FILE).read_text() == versions[-1]
+    np.testing.assert_allclose(load_matrix(tmp_path).norms, np.linalg.norm(matrix * 4, axis=1)[np.argsort(names)], rtol=1e-5)
+
+
+def test_invalid_input_and_missing_artifacts(tmp_path):
+    names, matrix = _rows()
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        save_matrix(tmp_path, ["a", "a"], matrix[:2])
+    with pytest.raises(ValueError, match="does not match"):
+        save_matrix(tmp_path, names[:2], matrix)
+    with pytest.raises(FileNotFoundError):
+        load_matrix(tmp_path)
+
+    save_matrix(tmp_path, names, matrix)
+    with pytest.raises(ValueError, match="Dimension mismatch"):
+        load_matrix(tmp_path, expected_dim=8)
+
+
+def _unit_rows(n_rows=50, dim=32, seed=1):
+    matrix = np.random.default_rng(seed).normal(size=(n_rows, dim)).astype(np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def test_int8_quantize_round_trip():
+    unit = _unit_rows()
+
+    codes, scales = quantize(unit, "int8")
+
+    assert codes.dtype == np.int8 and scales.dtype == np.float32
+    assert (np.abs(codes).max(axis=1) == 127).all()
+    error = np.abs(dequantize(codes, scales) - unit)
+    assert (error <= scales[:, None] / 2 + 1e-7).all()
+    # Cosine scores from the codes stay close to the float32 ones
+    np.testing.assert_allclose(dequantize(codes, scales) @ unit[0], unit @ unit[0], atol=2e-2)
+
+
+def test_int8_zero_row_keeps_unit_scale():
+    unit = np.vstack([_unit_rows(n_rows=1), np.zeros((1, 32), dtype=np.float32)])
+
+    codes, scales = quantize(unit, "int8")
+
+    assert scales[1] == 1.0 and not codes[1].any()
+    assert not dequantize(codes, scales)[1].any()
+
+
+def test_float16_and_none_round_trip():
+    unit = _unit_rows()
+
+    codes, scales = quantize(unit, "float16")
+    assert codes.dtype == np.float16 and scales is None
+    np.testing.assert_allclose(dequantize(codes), unit, atol=1e-3)
+
+    codes, scales = quantize(unit, "none")
+    assert codes.dtype == np.float32 and scales is None
+    np.testing.assert_array_equal(dequantize(codes), unit)
+
+
+def test_mode_of_and_unknown_modes():
+    assert [mode_of(dtype) for dtype in (np.float32, np.float16, np.int8)] == ["none", "float16", "int8"]
+    with pytest.raises(ValueError, match="Unknown quantization mode"):
+        quantize(_unit_rows(), "int4")
+
+
+def test_artifact_requantizes_in_memory(tmp_path):
+    names, matrix = _rows(dim=16)
+    save_matrix(tmp_path, names, matrix)
+    artifact = load_matrix(tmp_path)
+
+    quantized = artifact.quantized("int8")
+
+    assert artifact.quantized("none") is artifact
+    assert quantized.quantization == "int8" and quantized.meta["dtype"] == "int8"
+    np.testing.assert_allclose(quantized.dequantized(), artifact.dequantized(), atol=np.abs(artifact.unit_matrix).max() / 254 + 1e-7)